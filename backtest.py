@@ -0,0 +1,193 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from bar_store import get_bars_many
+from fx import eur_price_matrix
+from journal_store import derive_stats
+from screener_cli import load_universe
+
+# -------------------------------------
+# Backtest der Signale, die die Apps anzeigen
+# -------------------------------------
+# Die Regeln sind dieselben wie auf den Seiten:
+#   ema_trend  – long solange EMA9 > EMA20 ("Bullish"), sonst flat
+#   rsi_30_70  – Einstieg bei RSI(14) < 30 ("überverkauft"),
+#                Ausstieg bei RSI > 70 ("überkauft")
+# Alles läuft auf der Kursmatrix (Bars x Ticker) in EUR, ohne Schleife über
+# Bars: Positionen entstehen per ffill aus den Signalen, gehandelt wird zum
+# Schlusskurs der Signal-Bar. Jeder Positionswechsel kostet Gebühr plus
+# Slippage (in Basispunkten vom Einsatz). Ergebnis in den Begriffen der
+# Journal-Auswertung: Trades, Trefferquote, Ø Gewinn/Verlust, Gesamt-PnL,
+# maximaler Drawdown – plus Erwartungswert je Trade.
+#
+#   python backtest.py --db ticker_database.csv --period 5y --offline
+STAKE = 1000.0  # EUR je Trade
+FEE_BPS = 5.0
+SLIPPAGE_BPS = 5.0
+
+
+def ema_positions(close, fast=9, slow=20):
+    ema_fast = close.ewm(span=fast).mean()
+    ema_slow = close.ewm(span=slow).mean()
+    return (ema_fast > ema_slow).astype(float).to_numpy()
+
+
+def rsi(close, window=14):
+    delta = close.diff()
+    avg_gain = delta.clip(lower=0).rolling(window=window).mean()
+    avg_loss = (-delta.clip(upper=0)).rolling(window=window).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def hysteresis(enter, leave):
+    """Position 1 ab einer Bar mit ``enter``, zurück auf 0 ab einer Bar mit ``leave``."""
+    signal = np.where(enter, 1.0, np.where(leave, 0.0, np.nan))
+    return pd.DataFrame(signal).ffill().fillna(0.0).to_numpy()
+
+
+def rsi_positions(close, window=14, lower=30, upper=70):
+    value = rsi(close, window).to_numpy()
+    return hysteresis(value < lower, value > upper)
+
+
+STRATEGIES = {"ema_trend": ema_positions, "rsi_30_70": rsi_positions}
+
+
+def simulate(close, position, stake=STAKE, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS):
+    """PnL je Bar und Ticker (EUR) für eine Positionsmatrix aus 0/1.
+
+    ``position[t]`` ist die Position nach dem Schluss der Bar t; die Rendite
+    von t-1 nach t gehört also zu ``position[t-1]``.
+    """
+    prices = close.to_numpy(dtype=float) if isinstance(close, pd.DataFrame) else np.asarray(close, dtype=float)
+    returns = np.zeros_like(prices)
+    returns[1:] = prices[1:] / prices[:-1] - 1
+    returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+    position = np.where(np.isnan(prices), 0.0, position)
+
+    held = np.zeros_like(position)
+    held[1:] = position[:-1]
+    turnover = np.abs(position - held)
+    return stake * (held * returns - turnover * (fee_bps + slippage_bps) / 10_000), position, held
+
+
+def _trade_ids(position, held):
+    entries = (position == 1) & (held == 0)
+    in_trade = (position == 1) | (held == 1)  # Ausstiegs-Bar mit Kosten gehört noch zum Trade
+    trade_no = np.cumsum(entries, axis=0)
+    per_column = trade_no[-1] if len(trade_no) else np.zeros(position.shape[1], dtype=int)
+    offsets = np.concatenate([[0], np.cumsum(per_column)[:-1]])
+    return (trade_no - 1 + offsets)[in_trade], in_trade, per_column
+
+
+def trade_pnl(pnl, position, held):
+    """PnL je Trade als Array und der zugehörige Spaltenindex (Ticker)."""
+    trade_id, in_trade, per_column = _trade_ids(position, held)
+    pnls = np.bincount(trade_id, weights=pnl[in_trade], minlength=int(per_column.sum()))
+    return pnls, np.repeat(np.arange(pnl.shape[1]), per_column)
+
+
+def trade_spans(pnl, position, held):
+    """Wie ``trade_pnl``, zusätzlich Einstiegs- und Ausstiegs-Bar (Zeilenindex) je Trade."""
+    trade_id, in_trade, per_column = _trade_ids(position, held)
+    count = int(per_column.sum())
+    pnls = np.bincount(trade_id, weights=pnl[in_trade], minlength=count)
+    rows = np.nonzero(in_trade)[0]
+    entry, exit_bar = np.full(count, len(pnl), dtype=np.int64), np.zeros(count, dtype=np.int64)
+    np.minimum.at(entry, trade_id, rows)
+    np.maximum.at(exit_bar, trade_id, rows)
+    return pnls, np.repeat(np.arange(pnl.shape[1]), per_column), entry, exit_bar
+
+
+def drawdown(equity):
+    peak = np.maximum(np.maximum.accumulate(equity, axis=0), 0)
+    return (peak - equity).max(axis=0) if len(equity) else np.zeros(equity.shape[1:])
+
+
+def counters(close, position, **costs):
+    """Rohzähler je Ticker (Spalten wie die Journal-Statistik) und PnL-Summe aller Ticker je Bar."""
+    pnl, position, held = simulate(close, position, **costs)
+    trades, column = trade_pnl(pnl, position, held)
+    tickers = pnl.shape[1]
+
+    def counts(mask):
+        return np.bincount(column[mask], minlength=tickers), np.bincount(column[mask], weights=trades[mask],
+                                                                         minlength=tickers)
+
+    wins, win_sum = counts(trades > 0)
+    losses, loss_sum = counts(trades < 0)
+    equity = np.cumsum(pnl, axis=0)
+    per_ticker = {"trades": np.bincount(column, minlength=tickers), "wins": wins, "losses": losses,
+                  "win_sum": win_sum, "loss_sum": loss_sum, "pnl": equity[-1] if len(equity) else np.zeros(tickers),
+                  "max_drawdown": drawdown(equity)}
+    return per_ticker, pnl.sum(axis=1)
+
+
+def summarize(s):
+    """Journal-Kennzahlen plus Erwartungswert je Trade aus Rohzählern."""
+    s = {**s, **{key: int(s[key]) for key in ("trades", "wins", "losses")}}
+    stats = derive_stats(s)
+    stats["erwartungswert"] = round(s["pnl"] / s["trades"], 2) if s["trades"] else 0
+    return stats
+
+
+def evaluate(close, position, **costs):
+    """Kennzahlen gesamt (Dict) und je Ticker (DataFrame) wie ``journal_stats``.
+
+    Der Gesamt-Drawdown summiert die PnL je Zeile über alle Ticker; ``close``
+    muss dafür auf einer gemeinsamen Datumsachse liegen
+    (``eur_price_matrix(..., by_date=True)``).
+    """
+    per_ticker, portfolio = counters(close, position, **costs)
+    per_ticker = pd.DataFrame(per_ticker, index=close.columns)
+    # Gesamt: Drawdown auf der Summe aller Ticker je Bar
+    total = per_ticker.sum().to_dict()
+    total["max_drawdown"] = float(drawdown(np.cumsum(portfolio)[:, None])[0]) if len(portfolio) else 0.0
+    table = pd.DataFrame([{"Ticker": ticker, **summarize(row)} for ticker, row in per_ticker.iterrows()])
+    return summarize(total), table
+
+
+def run_backtest(close, fx=1.0, strategies=STRATEGIES, **costs):
+    """Alle Strategien auf der Kursmatrix; gibt ``(gesamt, je_ticker)`` als DataFrames zurück."""
+    close_eur = close * fx
+    totals, tables = [], []
+    for name, rule in strategies.items():
+        total, table = evaluate(close_eur, rule(close_eur), **costs)
+        totals.append({"Strategie": name, **total})
+        tables.append(table.assign(Strategie=name))
+    return pd.DataFrame(totals), pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest der EMA9/20- und RSI-30/70-Signale über eine Ticker-CSV.")
+    parser.add_argument("--db", default="ticker_database.csv", help="Ticker-CSV mit Spalte YahooTicker")
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--stake", type=float, default=STAKE, help="Einsatz je Trade in EUR")
+    parser.add_argument("--fee-bps", type=float, default=FEE_BPS)
+    parser.add_argument("--slippage-bps", type=float, default=SLIPPAGE_BPS)
+    parser.add_argument("--offline", action="store_true", help="Nur lokal gespeicherte Bars verwenden")
+    parser.add_argument("--out", default="backtest_result.csv", help="Ergebnis je Ticker und Strategie")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    symbols = load_universe(args.db)["YahooTicker"].tolist()
+    frames, errors = get_bars_many(symbols, period=args.period, interval=args.interval, offline=args.offline)
+    close, fx_matrix = eur_price_matrix(frames, offline=args.offline, by_date=True)
+    loaded = time.time()
+    totals, per_ticker = run_backtest(close, fx_matrix, stake=args.stake, fee_bps=args.fee_bps,
+                                      slippage_bps=args.slippage_bps)
+    per_ticker.to_csv(args.out, index=False)
+
+    print(totals.to_string(index=False))
+    print(f"{len(frames)} Ticker ({len(errors)} ohne Daten), {len(close)} Bars; Laden {loaded - started:.1f}s, "
+          f"Backtest {time.time() - loaded:.2f}s -> {args.out}")
+    return 0 if frames else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------
+# Kompakter Bar-Speicher im Arbeitsspeicher (Ringpuffer)
+# -------------------------------------
+# Je (Symbol, Intervall) ein NumPy-Structured-Array fester Kapazität statt
+# eines DataFrames mit angehängten Indikatorspalten. Jede Bar wird genau
+# einmal geschrieben, Anhängen ist O(1). Ist der Ring umgelaufen, liegen die
+# letzten n Bars in zwei Stücken: ``parts(n)`` gibt beide als Views, ``view(n)``
+# und ``column(field, n)`` kopieren dann nur dieses Fenster zusammen.
+#
+# 32 Byte je Bar: 500 Symbole x 512 Bars ≈ 8 MB.
+BAR_DTYPE = np.dtype([("ts", "<i8"), ("open", "<f4"), ("high", "<f4"), ("low", "<f4"),
+                      ("close", "<f8"), ("volume", "<f4")])
+DEFAULT_CAPACITY = 512
+CAPACITY = {"1m": 2048, "2m": 1024, "5m": 512, "15m": 512, "30m": 512, "1h": 512, "1d": 512}
+
+_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+
+
+def bars_from_frame(df):
+    """Wandelt einen OHLCV-DataFrame (Yahoo-Spalten) in ein Array mit BAR_DTYPE."""
+    rows = np.empty(len(df), dtype=BAR_DTYPE)
+    rows["ts"] = pd.DatetimeIndex(df.index).as_unit("s").asi8
+    for field, column in _COLUMNS.items():
+        rows[field] = np.asarray(df[column], dtype=float).ravel() if column in df else np.nan
+    return rows
+
+
+class BarBuffer:
+    def __init__(self, capacity=DEFAULT_CAPACITY, tz=None):
+        self.capacity = capacity
+        self.tz = tz
+        self.size = 0
+        self._head = 0  # nächste Schreibposition
+        self._data = np.zeros(capacity, dtype=BAR_DTYPE)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def append(self, bar):
+        """Hängt eine Bar an (Tupel in BAR_DTYPE-Reihenfolge oder Array-Element)."""
+        self._data[self._head] = bar
+        self._head = (self._head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def extend(self, bars):
+        bars = np.asarray(bars, dtype=BAR_DTYPE)[-self.capacity:]
+        if not len(bars):
+            return
+        positions = (self._head + np.arange(len(bars))) % self.capacity
+        self._data[positions] = bars
+        self._head = (self._head + len(bars)) % self.capacity
+        self.size = min(self.size + len(bars), self.capacity)
+
+    def replace_last(self, bar):
+        """Überschreibt die jüngste Bar (z. B. die noch offene Intraday-Bar)."""
+        if not self.size:
+            raise IndexError("BarBuffer ist leer")
+        self._data[(self._head - 1) % self.capacity] = bar
+
+    def parts(self, n=None):
+        """Die letzten ``n`` Bars (Standard: alle) als zwei Views ``(älterer Teil, jüngerer Teil)``.
+
+        Ohne Umlauf ist der ältere Teil leer; Kernel, die zwei Stücke
+        verarbeiten können, kommen so ganz ohne Kopie aus.
+        """
+        n = self.size if n is None else max(min(n, self.size), 0)
+        start = self._head - n
+        if start >= 0:
+            return self._data[:0], self._data[start:self._head]
+        return self._data[start:], self._data[:self._head]
+
+    def view(self, n=None):
+        """Die letzten ``n`` Bars als zusammenhängendes Array, älteste zuerst.
+
+        View, solange das Fenster nicht über das Ringende läuft, sonst eine
+        Kopie nur dieser ``n`` Bars.
+        """
+        older, newer = self.parts(n)
+        return np.concatenate([older, newer]) if len(older) else newer
+
+    def column(self, field, n=None):
+        older, newer = self.parts(n)
+        return np.concatenate([older[field], newer[field]]) if len(older) else newer[field]
+
+    @property
+    def last(self):
+        return self._data[(self._head - 1) % self.capacity] if self.size else None
+
+    @property
+    def last_ts(self):
+        return int(self.last["ts"]) if self.size else None
+
+    def timestamps(self, n=None):
+        index = pd.to_datetime(self.column("ts", n), unit="s", utc=True)
+        return index.tz_convert(self.tz) if self.tz else index
+
+    def frame(self, n=None):
+        """Kopie als DataFrame mit Yahoo-Spalten – nur für Anzeige und Charts."""
+        view = self.view(n)
+        return pd.DataFrame({column: view[field].astype(float) for field, column in _COLUMNS.items()},
+                            index=self.timestamps(n))
+
+
+class BarBook:
+    """Ringpuffer je (Symbol, Intervall) mit Kapazität je Intervall."""
+
+    def __init__(self, capacity=None):
+        self.capacity = {**CAPACITY, **(capacity or {})}
+        self.buffers = {}
+
+    def buffer(self, symbol, interval, tz=None):
+        key = (symbol, interval)
+        if key not in self.buffers:
+            self.buffers[key] = BarBuffer(self.capacity.get(interval, DEFAULT_CAPACITY), tz=tz)
+        return self.buffers[key]
+
+    def load(self, symbol, interval, df):
+        """Ersetzt den Puffer durch die Bars aus ``df``."""
+        tz = getattr(df.index, "tz", None)
+        self.buffers.pop((symbol, interval), None)
+        buffer = self.buffer(symbol, interval, tz=tz)
+        buffer.extend(bars_from_frame(df))
+        return buffer
+
+    def __contains__(self, key):
+        return key in self.buffers
+
+    def __getitem__(self, key):
+        return self.buffers[key]
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self.buffers.values())
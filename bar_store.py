@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from market_data import download_many
+
+# -------------------------------------
+# Lokaler Kursdaten-Speicher (SQLite)
+# -------------------------------------
+# Bars werden je (Symbol, Intervall) dauerhaft abgelegt. Bei einer Anfrage
+# werden nur die Bars ab dem letzten gespeicherten Zeitstempel nachgeladen
+# und eingemischt, neue Sessions und Neustarts starten damit "warm".
+DB_PATH = os.environ.get("STOCKINATOR_BAR_DB", "bar_cache.sqlite")
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Mindestabstand (Sekunden) zwischen zwei Nachlade-Versuchen je Intervall
+REFRESH_SECONDS = {"1m": 30, "2m": 60, "5m": 60, "15m": 120, "30m": 300, "1h": 300, "1d": 900}
+DEFAULT_REFRESH = 900
+
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1), "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1), "3mo": pd.DateOffset(months=3), "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2), "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+def _connect():
+    con = sqlite3.connect(DB_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("""CREATE TABLE IF NOT EXISTS bars (
+        symbol TEXT, interval TEXT, ts INTEGER,
+        open REAL, high REAL, low REAL, close REAL, volume REAL,
+        PRIMARY KEY (symbol, interval, ts)) WITHOUT ROWID""")
+    con.execute("""CREATE TABLE IF NOT EXISTS series (
+        symbol TEXT, interval TEXT, tz TEXT, first_ts INTEGER, last_ts INTEGER, checked_at REAL,
+        PRIMARY KEY (symbol, interval))""")
+    return con
+
+
+def _period_offset(period):
+    if period in PERIOD_OFFSETS:
+        return PERIOD_OFFSETS[period]
+    if period == "ytd":
+        now = pd.Timestamp.now(tz="UTC")
+        return now - now.normalize().replace(month=1, day=1)
+    if period.endswith("mo"):
+        return pd.DateOffset(months=int(period[:-2]))
+    if period.endswith("y"):
+        return pd.DateOffset(years=int(period[:-1]))
+    if period.endswith("d"):
+        return pd.DateOffset(days=int(period[:-1]))
+    if period != "max":
+        raise ValueError(f"Unbekannter Zeitraum: {period}")
+    return None
+
+
+def _to_epoch(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return index.tz_convert("UTC").as_unit("s").asi8.tolist()
+
+
+def _from_epoch(ts, tz):
+    index = pd.DatetimeIndex(pd.to_datetime(ts, unit="s", utc=True))
+    return index.tz_convert(tz) if tz else index.tz_localize(None)
+
+
+def _series_meta(con, symbol, interval):
+    return con.execute("SELECT tz, first_ts, last_ts, checked_at FROM series WHERE symbol=? AND interval=?",
+                       (symbol, interval)).fetchone()
+
+
+def _store(con, symbol, interval, data, checked_at):
+    data = data.dropna(subset=["Close"])
+    if data.empty:
+        return
+    tz = str(data.index.tz) if getattr(data.index, "tz", None) is not None else None
+    ts = _to_epoch(data.index)
+    rows = zip([symbol] * len(ts), [interval] * len(ts), ts,
+               *(data[c].astype(float).tolist() if c in data else [None] * len(ts) for c in COLUMNS))
+    with con:
+        con.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        con.execute("""INSERT INTO series VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, interval) DO UPDATE SET
+                tz=excluded.tz, first_ts=MIN(first_ts, excluded.first_ts),
+                last_ts=MAX(last_ts, excluded.last_ts), checked_at=excluded.checked_at""",
+                    (symbol, interval, tz, min(ts), max(ts), checked_at))
+
+
+def _load(con, symbol, interval, since_ts, tz):
+    rows = con.execute("SELECT ts, open, high, low, close, volume FROM bars "
+                       "WHERE symbol=? AND interval=? AND ts>=? ORDER BY ts",
+                       (symbol, interval, since_ts)).fetchall()
+    if not rows:
+        return pd.DataFrame(columns=COLUMNS)
+    frame = pd.DataFrame(rows, columns=["ts"] + COLUMNS)
+    frame.index = _from_epoch(frame.pop("ts"), tz)
+    frame.index.name = "Datetime" if tz else "Date"
+    return frame
+
+
+def get_bars_many(symbols, period="1mo", interval="1d", offline=False):
+    """Liefert Kursdaten aus dem lokalen Speicher und lädt nur fehlende Bars nach.
+
+    Gibt wie ``market_data.download_many`` ``(frames, errors)`` zurück. Mit
+    ``offline=True`` wird ausschließlich der lokale Bestand gelesen.
+    """
+    now = time.time()
+    offset = _period_offset(period)
+    since = pd.Timestamp.now(tz="UTC") - offset if offset is not None else None
+    since_ts = int(since.timestamp()) if since is not None else 0
+    refresh = REFRESH_SECONDS.get(interval, DEFAULT_REFRESH)
+
+    con = _connect()
+    try:
+        full, top_up = [], {}
+        for symbol in dict.fromkeys(symbols):
+            if offline:
+                break
+            meta = _series_meta(con, symbol, interval)
+            if meta is None or (offset is not None and meta[1] > since_ts + 7 * 86400):
+                full.append(symbol)
+            elif now - (meta[3] or 0) >= refresh:
+                # Letzte Bar erneut laden, sie kann beim letzten Abruf noch unvollständig gewesen sein
+                top_up.setdefault(meta[2], []).append(symbol)
+
+        errors = {}
+        batches = [(full, {"period": period})]
+        # ``start`` mit Zeitzone: ohne liest yfinance ihn als Börsenzeit und verschiebt den Beginn um Stunden
+        batches += [(group, {"period": None, "start": pd.Timestamp(last_ts, unit="s", tz="UTC")})
+                    for last_ts, group in top_up.items()]
+        for group, kwargs in batches:
+            if not group:
+                continue
+            fetched, failed = download_many(group, interval=interval, health="start" not in kwargs, **kwargs)
+            for symbol, data in fetched.items():
+                _store(con, symbol, interval, data, now)
+            if kwargs.get("start") is not None:
+                # Beim Nachladen ist "keine neuen Bars" kein Fehler, der Bestand bleibt gültig
+                for symbol in failed:
+                    con.execute("UPDATE series SET checked_at=? WHERE symbol=? AND interval=?",
+                                (now, symbol, interval))
+                con.commit()
+            else:
+                errors.update(failed)
+
+        frames = {}
+        for symbol in dict.fromkeys(symbols):
+            if symbol in errors:
+                continue
+            meta = _series_meta(con, symbol, interval)
+            frame = _load(con, symbol, interval, since_ts, meta[0]) if meta else pd.DataFrame()
+            if frame.empty:
+                errors[symbol] = "Keine Kursdaten"
+            else:
+                frames[symbol] = frame
+        return frames, errors
+    finally:
+        con.close()
+
+
+def get_bars(symbol, period="1mo", interval="1d", offline=False):
+    frames, _ = get_bars_many([symbol], period=period, interval=interval, offline=offline)
+    return frames.get(symbol, pd.DataFrame())
@@ -0,0 +1,205 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from indicators import USD_TO_EUR, IndicatorState, calculate_indicators, price_matrix, screen_indicators
+
+# -------------------------------------
+# Benchmark der Indikator-Pfade auf synthetischen OHLCV-Daten
+# -------------------------------------
+# Misst Laufzeit und Spitzen-Speicher je Pfad, prüft die numerische
+# Übereinstimmung gegen calculate_indicators und vergleicht mit einer
+# gespeicherten Baseline. Exit-Code 1 bei Abweichung oder Regression.
+#
+#   python benchmark_indicators.py --bars 1000,100000 --tickers 1,100,5000 --save-baseline
+#   python benchmark_indicators.py --bars 1000,100000 --tickers 1,100,5000
+
+NUMERIC_KEYS = ["price_eur", "rsi", "macd", "macd_signal", "bollinger_upper", "bollinger_lower",
+                "perf_1d", "perf_1w", "perf_1m", "volatility"]
+
+
+def synthetic_ohlcv(bars, tickers, seed=42, ragged=False):
+    """Deterministische OHLCV-Daten (geometrische Brownsche Bewegung) je Ticker.
+
+    Mit ``ragged=True`` enden die Reihen wie echte Daten nicht alle sauber:
+    jeder zweite Ticker steht zuletzt 20 Bars still (ausgesetzter Handel), die
+    übrigen haben eine leere letzte Bar.
+    """
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(10, 500, tickers)
+    returns = rng.normal(0.0002, 0.015, (bars, tickers)).astype(np.float64)
+    close = start * np.exp(np.cumsum(returns, axis=0))
+    spread = np.abs(rng.normal(0, 0.005, (bars, tickers)))
+    if ragged and bars > 40:
+        close[-20:, 0::2] = close[-21, 0::2]
+        spread[-20:, 0::2] = 0.0
+        close[-1, 1::2] = np.nan
+    index = pd.date_range("2000-01-03", periods=bars, freq="min")
+    frames = {}
+    for i in range(tickers):
+        frames[f"SYN{i:05d}"] = pd.DataFrame({
+            "Open": close[:, i] * (1 - spread[:, i] / 2),
+            "High": close[:, i] * (1 + spread[:, i]),
+            "Low": close[:, i] * (1 - spread[:, i]),
+            "Close": close[:, i],
+            "Volume": np.where(np.isnan(close[:, i]), np.nan, rng.integers(1_000, 1_000_000, bars)),
+        }, index=index)
+    return frames
+
+
+# --- Varianten aus den Seiten-Skripten (zum Vergleich nachgebaut) ---
+
+def rsi_from_rs_last(close):
+    # streamlit_app2.py: RSI aus rs.iloc[-1]
+    delta = (close * USD_TO_EUR).diff()
+    rs = delta.clip(lower=0).rolling(window=14).mean() / (-delta.clip(upper=0)).rolling(window=14).mean()
+    rs_val = rs.iloc[-1] if rs.notna().any() else None
+    return 100 - (100 / (1 + rs_val)) if rs_val else None
+
+
+def rsi_multi_page(close):
+    # Multi-Ticker-Seiten: 100 - (100 / (1 + rs)).iloc[-1]
+    delta = (close * USD_TO_EUR).diff()
+    rs = delta.clip(lower=0).rolling(window=14).mean() / (-delta.clip(upper=0)).rolling(window=14).mean()
+    return 100 - (100 / (1 + rs)).iloc[-1]
+
+
+def path_single(frames):
+    return {symbol: calculate_indicators(df) for symbol, df in frames.items()}
+
+
+def path_matrix(frames):
+    screen = screen_indicators(price_matrix(frames))
+    return {symbol: row.to_dict() for symbol, row in screen.iterrows()}
+
+
+def path_streaming(frames):
+    return {symbol: IndicatorState.from_history(df).snapshot() for symbol, df in frames.items()}
+
+
+def path_rsi_variants(frames):
+    return {symbol: {"rsi": rsi_from_rs_last(df["Close"]), "rsi_multi": rsi_multi_page(df["Close"])}
+            for symbol, df in frames.items()}
+
+
+PATHS = {
+    "calculate_indicators": (path_single, None),
+    "screen_indicators": (path_matrix, None),
+    "IndicatorState": (path_streaming, 2_000_000),  # Python-Schleife je Bar: nur bis zu so vielen Bars gesamt
+}
+# Die Seiten-Varianten laufen auf Reihen mit Stillstand bzw. leerer letzter Bar: dort
+# liefert ``rs.iloc[-1]`` NaN, calculate_indicators (``last_valid``) den letzten gültigen RSI
+# (Abweichung "inf" = NaN statt Wert)
+RAGGED_PATHS = {
+    "rsi_varianten": (path_rsi_variants, None),
+}
+
+
+def measure(func, frames, repeat):
+    # Zeit: bester von ``repeat`` Läufen ohne Tracing; Speicher: ein separater Lauf mit tracemalloc
+    seconds = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(frames)
+        seconds = min(seconds, time.perf_counter() - started)
+    tracemalloc.start()
+    func(frames)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def max_deviation(reference, result):
+    worst = 0.0
+    for symbol, ref in reference.items():
+        for key in NUMERIC_KEYS:
+            if key not in result[symbol]:
+                continue
+            a, b = ref.get(key), result[symbol].get(key)
+            a = np.nan if a is None else float(a)
+            b = np.nan if b is None else float(b)
+            if np.isnan(a) and np.isnan(b):
+                continue
+            if np.isnan(a) != np.isnan(b):
+                return float("inf")
+            # Relativ, bei Werten nahe 0 (MACD, Performance) absolut
+            worst = max(worst, abs(a - b) / max(abs(a), 1.0))
+    return worst
+
+
+def run(bars_list, tickers_list, max_cells, seed, repeat=3):
+    rows = []
+    for bars in bars_list:
+        for tickers in tickers_list:
+            if bars * tickers > max_cells:
+                print(f"übersprungen: {bars} Bars x {tickers} Ticker (> --max-cells)")
+                continue
+            for paths, ragged in ((PATHS, False), (RAGGED_PATHS, True)):
+                frames = synthetic_ohlcv(bars, tickers, seed, ragged=ragged)
+                reference = path_single(frames) if ragged else None
+                for name, (func, limit) in paths.items():
+                    if limit and bars * tickers > limit:
+                        continue
+                    result, seconds, peak = measure(func, frames, repeat)
+                    if name == "calculate_indicators":
+                        reference = result
+                    deviation = max_deviation(reference, result) if reference else float("nan")
+                    rows.append({"pfad": name, "bars": bars, "ticker": tickers, "sekunden": seconds,
+                                 "peak_mb": peak / 2**20, "max_rel_abweichung": deviation})
+                    print(f"{name:22s} {bars:>9d} x {tickers:<5d} {seconds:9.4f}s "
+                          f"{peak / 2**20:9.1f} MB  Abw. {deviation:.2e}")
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark der Indikator-Pfade auf synthetischen OHLCV-Daten.")
+    parser.add_argument("--bars", default="1000,10000,100000", help="Komma-Liste, z. B. 1000,100000,10000000")
+    parser.add_argument("--tickers", default="1,100,1000", help="Komma-Liste, z. B. 1,100,5000")
+    parser.add_argument("--max-cells", type=int, default=20_000_000, help="Größere Kombinationen überspringen")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3, help="Zeitmessungen je Pfad (Minimum zählt)")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="Max. relative Abweichung zu calculate_indicators")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Erlaubte Verlangsamung ggü. Baseline (0.5 = 50 %%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run([int(x) for x in args.bars.split(",")], [int(x) for x in args.tickers.split(",")],
+                  args.max_cells, args.seed, args.repeat)
+    failures = []
+
+    # Die Seiten-Varianten werden bewusst nicht gegen die Toleranz geprüft, sondern nur berichtet
+    checked = results[~results["pfad"].isin(list(RAGGED_PATHS))]
+    for _, row in checked[checked["max_rel_abweichung"] > args.tolerance].iterrows():
+        failures.append(f"Abweichung {row['pfad']} {row['bars']}x{row['ticker']}: {row['max_rel_abweichung']:.2e}")
+
+    if args.save_baseline:
+        results.to_json(args.baseline, orient="records", indent=2)
+        print(f"Baseline gespeichert: {args.baseline}")
+    else:
+        try:
+            with open(args.baseline) as fh:
+                baseline = pd.DataFrame(json.load(fh))
+        except FileNotFoundError:
+            baseline = pd.DataFrame()
+        if not baseline.empty:
+            merged = results.merge(baseline, on=["pfad", "bars", "ticker"], suffixes=("", "_baseline"))
+            # Mindestens 5 ms Unterschied, damit Messrauschen bei kleinen Größen nicht anschlägt
+            slow = merged[(merged["sekunden"] > merged["sekunden_baseline"] * (1 + args.threshold))
+                          & (merged["sekunden"] - merged["sekunden_baseline"] > 0.005)]
+            for _, row in slow.iterrows():
+                failures.append(f"Regression {row['pfad']} {row['bars']}x{row['ticker']}: "
+                                f"{row['sekunden']:.4f}s statt {row['sekunden_baseline']:.4f}s")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
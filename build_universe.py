@@ -0,0 +1,110 @@
+import argparse
+import glob
+import re
+import sys
+import time
+
+import pandas as pd
+
+from ticker_search import COLUMNS, UNIVERSE_PATH, TickerIndex, fold
+
+# -------------------------------------
+# Ticker-Universum bauen
+# -------------------------------------
+# Führt alle Varianten der Ticker-CSV zusammen (Spalten werden über den
+# Kopf zugeordnet, die Reihenfolge ist egal), entfernt Dubletten je
+# YahooTicker und normalisiert die Synonyme: kleingeschrieben, getrimmt,
+# ohne Leer- und Doppeleinträge. Weitere Namen desselben Tickers werden zu
+# Synonymen. Begriffe, die bei mehr als MAX_SHARED Tickern stehen (z. B.
+# "dax" oder "nasdaq" als Index-Zugehörigkeit), sind keine Synonyme und
+# fallen weg. Ergebnis ist das per Memory-Mapping ladbare Verzeichnis für
+# ticker_search.load_index().
+#
+# Die Quellen haben eine Rangfolge: die zuerst genannte gewinnt. Eine Zeile
+# einer späteren Quelle, deren Name schon einem anderen Ticker gehört, fällt
+# ganz weg, ebenso einzelne Synonyme, die eine frühere Quelle einem anderen
+# Ticker zuordnet. Die bekannt falschen Varianten (ticker_database_wrong.csv
+# mit vertauschten Spalten, ticker_database_old.csv mit verrutschten Tickern)
+# gehören nicht zu den Standardquellen.
+#
+#   python build_universe.py                       # Standardquellen
+#   python build_universe.py ticker_database.csv eigene_liste.csv --out ticker_universe
+MAX_SHARED = 5
+DEFAULT_SOURCES = ["ticker_database.csv", "ticker_database_cleaned.csv", "ticker_database_short.csv",
+                   "ticker_database_short", "ticker_database_x.csv", "ticker_database_user.csv"]
+
+
+def _clean(value):
+    return "" if pd.isna(value) else re.sub(r"\s+", " ", str(value)).strip()
+
+
+def _synonyms(value):
+    return [s for s in (_clean(part).lower().strip(" .;") for part in _clean(value).split(",")) if s]
+
+
+def read_source(path):
+    df = pd.read_csv(path, dtype=str)
+    missing = {"Name", "YahooTicker"} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path}: Spalten fehlen: {', '.join(sorted(missing))}")
+    if "Synonyme" not in df:
+        df["Synonyme"] = None
+    return df[COLUMNS]
+
+
+def merge_sources(frames):
+    """Ein Eintrag je YahooTicker; die zuerst genannte Quelle bestimmt Namen und Zuordnung."""
+    merged = {}
+    owners = {}  # gefalteter Name/Synonym -> Ticker aus früheren Quellen
+    for df in frames:
+        claimed = {}
+        for name, synonyms, ticker in zip(df["Name"], df["Synonyme"], df["YahooTicker"]):
+            ticker = _clean(ticker).upper()
+            name = _clean(name)
+            if not ticker or not name or owners.get(fold(name), ticker) != ticker:
+                continue
+            terms = [s for s in _synonyms(synonyms) if owners.get(fold(s), ticker) == ticker]
+            entry = merged.setdefault(ticker, {"Name": name, "Synonyme": []})
+            if name.lower() != entry["Name"].lower():
+                entry["Synonyme"].append(name.lower())
+            entry["Synonyme"].extend(terms)
+            for term in [name, *terms]:
+                claimed.setdefault(fold(term), ticker)
+        for term, ticker in claimed.items():
+            owners.setdefault(term, ticker)
+
+    shared = pd.Series([s for entry in merged.values() for s in dict.fromkeys(entry["Synonyme"])]).value_counts()
+    labels = set(shared[shared > MAX_SHARED].index)
+    rows = []
+    for ticker, entry in merged.items():
+        redundant = labels | {ticker.lower(), entry["Name"].lower()}
+        synonyms = [s for s in dict.fromkeys(entry["Synonyme"]) if s not in redundant]
+        rows.append({"Name": entry["Name"], "Synonyme": ", ".join(synonyms) or None, "YahooTicker": ticker})
+    return pd.DataFrame(rows, columns=COLUMNS), sorted(labels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Baut das Ticker-Universum für die Suche aus allen Ticker-CSVs.")
+    parser.add_argument("sources", nargs="*", help="CSV-Dateien in Rangfolge (Standard: DEFAULT_SOURCES)")
+    parser.add_argument("--out", default=UNIVERSE_PATH, help="Zielverzeichnis")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    patterns = args.sources or DEFAULT_SOURCES
+    sources = list(dict.fromkeys(path for pattern in patterns for path in sorted(glob.glob(pattern))))
+    if not sources:
+        print("Keine Quelldateien gefunden", file=sys.stderr)
+        return 1
+    frames = [read_source(path) for path in sources]
+    universe, labels = merge_sources(frames)
+    TickerIndex(universe).save(args.out, sources=sources, dropped_labels=labels)
+
+    print(f"{sum(len(df) for df in frames)} Zeilen aus {len(sources)} Dateien -> {len(universe)} Ticker "
+          f"in {time.time() - started:.1f}s -> {args.out}")
+    if labels:
+        print(f"Nicht als Synonym übernommen (bei > {MAX_SHARED} Tickern): {', '.join(labels)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
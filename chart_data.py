@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+# -------------------------------------
+# Chart-Aufbereitung für lange Historien
+# -------------------------------------
+# Statt jede Bar an den Browser zu schicken, wird serverseitig auf höchstens
+# MAX_POINTS Punkte je Linie reduziert: Kurs und Indikatorlinien per LTTB
+# (Largest-Triangle-Three-Buckets, erhält Spitzen und Form), Volumen per
+# Min/Max je Bucket. Ab WEBGL_THRESHOLD Punkten je Linie wird mit WebGL
+# (Scattergl) gezeichnet. Für Details wählt die Seite einen Zeitausschnitt,
+# der dann wieder in voller Auflösung (bis MAX_POINTS) aufbereitet wird.
+MAX_POINTS = 2000
+WEBGL_THRESHOLD = 1000
+
+PRICE_TRACES = [
+    ("Close_EUR", "Kurs", dict(color="blue")),
+    ("UpperBB", "Upper BB", dict(color="lightgray")),
+    ("LowerBB", "Lower BB", dict(color="lightgray")),
+    ("EMA9", "EMA 9", dict(color="green", dash="dot")),
+    ("EMA20", "EMA 20", dict(color="red", dash="dot")),
+]
+
+
+def _x_values(index):
+    if isinstance(index, pd.DatetimeIndex):
+        values = index.asi8.astype(float)
+    else:
+        values = np.arange(len(index), dtype=float)
+    return values - values[0] if len(values) else values
+
+
+def lttb(x, y, n):
+    """Positionen der per LTTB ausgewählten ``n`` Punkte (inkl. erstem und letztem)."""
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)  # n-2 Buckets zwischen erstem und letztem Punkt
+    picked = np.empty(n, dtype=int)
+    picked[0], picked[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else size
+        upcoming = y[hi:next_hi]
+        cx = x[hi:next_hi].mean()
+        cy = np.nanmean(upcoming) if np.isfinite(upcoming).any() else y[a]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        if np.isnan(area).all():
+            a = lo
+        else:
+            a = lo + int(np.nanargmax(area))
+        picked[i + 1] = a
+    return picked
+
+
+def minmax(y, n):
+    """Positionen von Minimum und Maximum je Bucket (höchstens ``n`` Punkte)."""
+    size = len(y)
+    if n >= size or n < 2:
+        return np.arange(size)
+    buckets = np.arange(size) * (n // 2) // size
+    values = pd.Series(np.asarray(y, dtype=float)).fillna(-np.inf)
+    groups = values.groupby(buckets)
+    return np.unique(np.concatenate([groups.idxmin().to_numpy(), groups.idxmax().to_numpy()]))
+
+
+def downsample(frame, column, max_points=MAX_POINTS, method="lttb"):
+    """Reduziert ``frame`` auf höchstens ``max_points`` Zeilen, ausgewählt anhand ``column``."""
+    if len(frame) <= max_points:
+        return frame
+    y = frame[column].to_numpy(dtype=float)
+    if method == "minmax":
+        positions = minmax(y, max_points)
+    else:
+        positions = lttb(_x_values(frame.index), y, max_points)
+    return frame.iloc[positions]
+
+
+def select_window(frame, start=None, end=None):
+    """Zeitausschnitt; ``start``/``end`` dürfen ohne Zeitzone angegeben werden."""
+    index = frame.index
+    if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+        index = index.tz_localize(None)
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= index >= pd.Timestamp(start)
+    if end is not None:
+        mask &= index <= pd.Timestamp(end)
+    return frame[mask]
+
+
+def _scatter(frame, column, name, line, webgl):
+    trace = go.Scattergl if webgl else go.Scatter
+    return trace(x=frame.index, y=frame[column], name=name, line=line, mode="lines")
+
+
+def price_figure(frame, traces=PRICE_TRACES, max_points=MAX_POINTS, webgl_threshold=WEBGL_THRESHOLD, height=500):
+    """Kurschart mit Indikatorlinien; alle Linien teilen sich die LTTB-Auswahl des Kurses."""
+    shown = downsample(frame, traces[0][0], max_points)
+    webgl = len(shown) > webgl_threshold
+    fig = go.Figure([_scatter(shown, column, name, line, webgl) for column, name, line in traces])
+    fig.update_layout(height=height)
+    return fig
+
+
+def volume_figure(frame, max_points=MAX_POINTS, height=200):
+    shown = downsample(frame, "Volume", max_points, method="minmax")
+    fig = go.Figure(go.Bar(x=shown.index, y=shown["Volume"], name="Volumen", marker_color="orange"))
+    fig.update_layout(height=height)
+    return fig
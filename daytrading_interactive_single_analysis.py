@@ -1,24 +1,21 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+import result_cache
+from fx import to_eur
+from ticker_search import load_index
 
 st.set_page_config(page_title="Daytrading – Interaktive Einzelanalyse", layout="wide")
 st.title("Daytrading Terminal – Interaktive Analyse bei Mehrdeutigkeit")
 
-@st.cache_data
-def load_ticker_db():
-    return pd.read_csv("ticker_database.csv")
+@st.cache_resource
+def load_ticker_index():
+    return load_index()
 
-ticker_db = load_ticker_db()
+ticker_index = load_ticker_index()
 
 def find_ticker_matches(q):
-    q = q.strip().lower()
-    return ticker_db[
-        ticker_db["Name"].str.lower().str.contains(q) |
-        ticker_db["Synonyme"].str.lower().str.contains(q) |
-        ticker_db["YahooTicker"].str.lower().str.contains(q)
-    ][["Name", "Synonyme", "YahooTicker"]]
+    return ticker_index.search(q)[["Name", "Synonyme", "YahooTicker"]]
 
 st.markdown("### Aktie eingeben (Name, WKN, Synonym oder Ticker)")
 query = st.text_input("Beispiel: deutsche, rhein, boeing", "deutsche")
@@ -38,12 +35,11 @@ else:
 if selected_symbol:
     st.markdown(f"### Analyse für: `{selected_symbol}`")
     try:
-        data = yf.download(selected_symbol, period="1mo", interval="1d", progress=False)
+        data = result_cache.cached_download(selected_symbol, period="1mo", interval="1d")
         if data.empty:
             st.error("Keine Kursdaten verfügbar.")
         else:
-            usd_to_eur = 0.92
-            data['Close_EUR'] = data['Close'] * usd_to_eur
+            data['Close_EUR'] = to_eur(data, selected_symbol)
             ema9 = data['Close_EUR'].ewm(span=9).mean().iloc[-1]
             ema20 = data['Close_EUR'].ewm(span=20).mean().iloc[-1]
             delta = data['Close_EUR'].diff()
@@ -1,7 +1,10 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+from ticker_search import load_index
+from market_data import download_many
+from indicators import describe, screen_indicators
+from fx import eur_price_matrix
 import plotly.graph_objs as go
 
 st.set_page_config(page_title="Daytrading Multi-Ticker Ultimate", layout="wide")
@@ -10,30 +13,23 @@ st.title("Daytrading Terminal – Ultimatives Ticker-Matching")
 # ---------------------------------------
 # Ticker-Datenbank laden
 # ---------------------------------------
-@st.cache_data
-def load_ticker_db():
-    return pd.read_csv("ticker_database.csv")
+@st.cache_resource
+def load_ticker_index():
+    return load_index()
 
-ticker_db = load_ticker_db()
+ticker_index = load_ticker_index()
 
 # ---------------------------------------
 # Matching-Funktion (alle Treffer + Favoritenwahl)
 # ---------------------------------------
 def find_ticker_matches(q):
-    q = q.strip().lower()
-    return ticker_db[
-        ticker_db["Name"].str.lower().str.contains(q) |
-        ticker_db["Synonyme"].str.lower().str.contains(q) |
-        ticker_db["YahooTicker"].str.lower().str.contains(q)
-    ][["Name", "Synonyme", "YahooTicker"]]
+    return ticker_index.search(q)[["Name", "Synonyme", "YahooTicker"]]
 
 # ---------------------------------------
 # Eingabe & Moduswahl
 # ---------------------------------------
 st.markdown("### Mehrere Ticker eingeben (z. B. 'rhein', 'deutsche', 'druck')")
-user_input = st.text_area("Ein Ticker pro Zeile", "rhein
-deutsche
-hellofresh")
+user_input = st.text_area("Ein Ticker pro Zeile", "rhein\ndeutsche\nhellofresh")
 
 show_all = st.checkbox("Alle passenden Treffer je Eingabe anzeigen (statt Auswahl)", value=False)
 
@@ -61,43 +57,18 @@ for line in input_lines:
 # ---------------------------------------
 # Analyse
 # ---------------------------------------
-usd_to_eur = 0.92
 results = []
 
-for symbol in final_symbols:
-    try:
-        data = yf.download(symbol, period="1mo", interval="1d", progress=False)
-        if data.empty:
-            results.append((symbol, None, "Keine Kursdaten"))
-            continue
-
-        data['Close_EUR'] = data['Close'] * usd_to_eur
-        ema9 = data['Close_EUR'].ewm(span=9).mean().iloc[-1]
-        ema20 = data['Close_EUR'].ewm(span=20).mean().iloc[-1]
-        delta = data['Close_EUR'].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.rolling(window=14).mean()
-        avg_loss = loss.rolling(window=14).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-
-        trend = "Seitwärts"
-        if ema9 > ema20:
-            trend = "Bullish"
-        elif ema9 < ema20:
-            trend = "Bearish"
+frames, errors = download_many(final_symbols, period="1mo", interval="1d")
+close, fx_matrix = eur_price_matrix(frames)
+screen = screen_indicators(close, fx=fx_matrix)
 
-        rsi_state = "neutral"
-        if rsi < 30:
-            rsi_state = "überverkauft"
-        elif rsi > 70:
-            rsi_state = "überkauft"
-
-        results.append((symbol, round(data['Close_EUR'].iloc[-1], 2), f"{trend}, RSI {int(rsi)} ({rsi_state})"))
-
-    except Exception as e:
-        results.append((symbol, None, f"Fehler: {e}"))
+for symbol in final_symbols:
+    if symbol in errors:
+        results.append((symbol, None, errors[symbol]))
+        continue
+    row = screen.loc[symbol]
+    results.append((symbol, round(row["price_eur"], 2), describe(row)))
 
 df_result = pd.DataFrame(results, columns=["Ticker", "Kurs (EUR)", "Analyse"])
 st.markdown("### Analyse-Ergebnisse")
@@ -1,7 +1,12 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
+from symbol_resolver import SymbolResolver, parse_watchlist
+from market_data import download_many
+from journal_store import equity_curve, import_csv, journal_stats
+from indicators import describe, screen_indicators
+from screen_query import apply, delete_screen, run_saved, save_screen, saved_screens
+from fx import eur_price_matrix
 import plotly.graph_objs as go
 import datetime
 
@@ -35,101 +40,107 @@ manual_map = {
     "novo nordisk": "NVO"
 }
 
-def resolve_symbol(query):
-    q = query.strip().lower()
-    if q in manual_map:
-        return manual_map[q]
-    try:
-        info = yf.utils.get_ticker_by_name(q)
-        if info:
-            return info[0]["symbol"]
-    except:
-        pass
-    return q.upper()
+@st.cache_resource
+def load_resolver():
+    return SymbolResolver(manual_map)
+
+resolver = load_resolver()
 
 # -------------------------------------
 # Mehrere Ticker eingeben
 # -------------------------------------
 st.markdown("### Tickerliste eingeben (Name, ISIN, WKN oder Symbol – zeilenweise)")
-user_input = st.text_area("Ein Ticker pro Zeile", "rheinmetall
-boeing
-allianz")
+user_input = st.text_area("Ein Ticker pro Zeile", "rheinmetall\nboeing\nallianz")
+
+queries = parse_watchlist(user_input)
+resolved = resolver.resolve_many(queries)
+unknown = [q for q in queries if resolved[q].source == "unbekannt"]
+tickers = list(dict.fromkeys(resolved[q].symbol for q in queries if q not in unknown))
+if unknown:
+    st.warning("Kein Ticker gefunden für: " + ", ".join(unknown))
 
-tickers = [resolve_symbol(x) for x in user_input.strip().splitlines() if x.strip()]
+with st.expander("Erkannte Ticker"):
+    st.dataframe(pd.DataFrame([(q, *resolved[q]) for q in queries],
+                              columns=["Eingabe", "Ticker", "Sicherheit", "Quelle"]))
 
 # -------------------------------------
 # Daten laden & analysieren
 # -------------------------------------
-usd_to_eur = 0.92
 results = []
 
+frames, errors = download_many(tickers, period="1mo", interval="1d")
+close, fx_matrix = eur_price_matrix(frames)
+screen = screen_indicators(close, fx=fx_matrix)
+
 for symbol in tickers:
-    try:
-        data = yf.download(symbol, period="1mo", interval="1d", progress=False)
-        if data.empty:
-            results.append((symbol, None, "Keine Daten"))
-            continue
-
-        data['Close_EUR'] = data['Close'] * usd_to_eur
-        ema9 = data['Close_EUR'].ewm(span=9).mean().iloc[-1]
-        ema20 = data['Close_EUR'].ewm(span=20).mean().iloc[-1]
-        delta = data['Close_EUR'].diff()
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
-        avg_gain = gain.rolling(window=14).mean()
-        avg_loss = loss.rolling(window=14).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs)).iloc[-1]
-
-        trend = "Seitwärts"
-        if ema9 > ema20:
-            trend = "Bullish"
-        elif ema9 < ema20:
-            trend = "Bearish"
-
-        rsi_state = "neutral"
-        if rsi < 30:
-            rsi_state = "überverkauft"
-        elif rsi > 70:
-            rsi_state = "überkauft"
-
-        results.append((symbol, round(data['Close_EUR'].iloc[-1], 2), f"{trend}, RSI {int(rsi)} ({rsi_state})"))
-
-    except Exception as e:
-        results.append((symbol, None, f"Fehler: {e}"))
+    if symbol in errors:
+        results.append((symbol, None, errors[symbol]))
+        continue
+    row = screen.loc[symbol]
+    results.append((symbol, round(row["price_eur"], 2), describe(row)))
 
 df_result = pd.DataFrame(results, columns=["Ticker", "Kurs (EUR)", "Analyse"])
 
 st.markdown("### Ergebnisse")
 st.dataframe(df_result)
 
+# -------------------------------------
+# Screener-Filter & gespeicherte Screens
+# -------------------------------------
+st.markdown("### Filter")
+query = st.text_input("Abfrage (Felder wie calculate_indicators)", "",
+                      placeholder="rsi < 30 and ema9 > ema20 and volatility < 2 and perf_1w > 0")
+if query:
+    try:
+        st.dataframe(apply(screen, query))
+        col1, col2 = st.columns([3, 1])
+        name = col1.text_input("Als Screen speichern unter")
+        if name and col2.button("Speichern"):
+            save_screen(name, query)
+    except ValueError as e:
+        st.error(str(e))
+
+screens = saved_screens()
+if screens:
+    hits = run_saved(screen)
+    st.markdown("#### Gespeicherte Screens")
+    st.dataframe(pd.DataFrame({"Screen": list(screens), "Abfrage": list(screens.values()),
+                               "Treffer": [", ".join(hits.index[hits[name]]) for name in screens]}))
+    col1, col2 = st.columns([3, 1])
+    remove = col1.selectbox("Screen entfernen", list(screens))
+    if col2.button("Entfernen"):
+        delete_screen(remove)
+        st.rerun()
+
 # -------------------------------------
 # Trefferquote aus Tradejournal
 # -------------------------------------
 st.markdown("---")
 st.markdown("### Tradejournal-Auswertung")
 
-try:
-    journal = pd.read_csv("tradejournal.csv")
-    pos_trades = journal[journal["Gewinn/Verlust (EUR)"] > 0]
-    neg_trades = journal[journal["Gewinn/Verlust (EUR)"] < 0]
-    trefferquote = round(len(pos_trades) / len(journal) * 100, 2) if len(journal) > 0 else 0
-    avg_win = round(pos_trades["Gewinn/Verlust (EUR)"].mean(), 2) if not pos_trades.empty else 0
-    avg_loss = round(neg_trades["Gewinn/Verlust (EUR)"].mean(), 2) if not neg_trades.empty else 0
-    total_pnl = round(journal["Gewinn/Verlust (EUR)"].sum(), 2)
-
-    col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Trefferquote", f"{trefferquote} %")
-    col2.metric("Ø Gewinn", f"{avg_win} €")
-    col3.metric("Ø Verlust", f"{avg_loss} €")
-    col4.metric("Gesamt-PnL", f"{total_pnl} €")
+import_csv("tradejournal.csv")
+stats, setup_stats, ticker_stats = journal_stats()
+
+if stats["trades"]:
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("Trefferquote", f"{stats['trefferquote']} %")
+    col2.metric("Ø Gewinn", f"{stats['avg_win']} €")
+    col3.metric("Ø Verlust", f"{stats['avg_loss']} €")
+    col4.metric("Gesamt-PnL", f"{stats['total_pnl']} €")
+    col5.metric("Max. Drawdown", f"{stats['max_drawdown']} €")
 
     st.markdown("#### Tradeverlauf")
+    curve = equity_curve()
     chart = go.Figure()
-    chart.add_trace(go.Scatter(x=journal["Datum"], y=journal["Gewinn/Verlust (EUR)"].cumsum(), name="Kumuliert"))
+    chart.add_trace(go.Scatter(x=curve["Datum"], y=curve["Equity"], name="Kumuliert"))
     chart.update_layout(height=300, xaxis_title="Datum", yaxis_title="Gesamtgewinn (€)")
     st.plotly_chart(chart, use_container_width=True)
 
-except FileNotFoundError:
+    col1, col2 = st.columns(2)
+    col1.markdown("#### Je Setup")
+    col1.dataframe(setup_stats)
+    col2.markdown("#### Je Ticker")
+    col2.dataframe(ticker_stats)
+else:
     st.warning("Kein Tradejournal gefunden. Bitte zuerst Trades eintragen.")
 
@@ -1,25 +1,22 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import feedparser
+import result_cache
+from fx import to_eur
+from ticker_search import load_index
+from news_feed import fetch_yahoo_news
 
 st.set_page_config(page_title="Daytrading – Analyse + News", layout="wide")
 st.title("Daytrading Terminal – Technische Analyse + Yahoo News")
 
-@st.cache_data
-def load_ticker_db():
-    return pd.read_csv("ticker_database.csv")
+@st.cache_resource
+def load_ticker_index():
+    return load_index()
 
-ticker_db = load_ticker_db()
+ticker_index = load_ticker_index()
 
 def find_ticker_matches(q):
-    q = q.strip().lower()
-    return ticker_db[
-        ticker_db["Name"].str.lower().str.contains(q) |
-        ticker_db["Synonyme"].str.lower().str.contains(q) |
-        ticker_db["YahooTicker"].str.lower().str.contains(q)
-    ][["Name", "Synonyme", "YahooTicker"]]
+    return ticker_index.search(q)[["Name", "Synonyme", "YahooTicker"]]
 
 def add_technical_indicators(data):
     result = {}
@@ -46,15 +43,6 @@ def add_technical_indicators(data):
         result['error'] = str(e)
     return result
 
-def fetch_yahoo_news(symbol):
-    try:
-        feed_url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-US"
-        feed = feedparser.parse(feed_url)
-        entries = feed.entries[:3]
-        return [(e.title, e.link) for e in entries]
-    except:
-        return []
-
 st.markdown("### Aktie eingeben (Name, WKN, Synonym oder Ticker)")
 query = st.text_input("Beispiel: deutsche, rhein, boeing", "deutsche")
 
@@ -73,12 +61,11 @@ else:
 if selected_symbol:
     st.markdown(f"### Analyse für: `{selected_symbol}`")
     try:
-        data = yf.download(selected_symbol, period="2mo", interval="1d", progress=False)
+        data = result_cache.cached_download(selected_symbol, period="2mo", interval="1d")
         if data.empty:
             st.error("Keine Kursdaten verfügbar.")
         else:
-            usd_to_eur = 0.92
-            data['Close_EUR'] = data['Close'] * usd_to_eur
+            data['Close_EUR'] = to_eur(data, selected_symbol)
             ema9 = data['Close_EUR'].ewm(span=9).mean().iloc[-1]
             ema20 = data['Close_EUR'].ewm(span=20).mean().iloc[-1]
             delta = data['Close_EUR'].diff()
@@ -1,8 +1,10 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import plotly.graph_objs as go
+import result_cache
+from fx import to_eur
+from journal_store import append_trade, import_csv, load_journal
+from chart_data import MAX_POINTS, price_figure, select_window, volume_figure
 import datetime
 
 # --------------------------------------
@@ -31,15 +33,14 @@ st.title("Daytrading Terminal – Analyse & Journal")
 input_query = st.text_input("Aktienname, WKN oder ISIN eingeben", value="Apple")
 resolved_ticker = find_ticker(input_query)
 st.write(f"**Erkannter Ticker:** `{resolved_ticker}`")
+period = st.selectbox("Zeitraum", ["1mo", "6mo", "1y", "2y"])
 
 # --------------------------------------
 # DATENANALYSE-MODUL
 # --------------------------------------
 try:
-    stock = yf.Ticker(resolved_ticker)
-    hist = stock.history(period="1mo", interval="1h")
-    usd_to_eur = 0.92
-    hist['Close_EUR'] = hist['Close'] * usd_to_eur
+    hist = result_cache.cached_bars(resolved_ticker, period=period, interval="1h")
+    hist['Close_EUR'] = to_eur(hist, resolved_ticker)
     hist['EMA9'] = hist['Close_EUR'].ewm(span=9).mean()
     hist['EMA20'] = hist['Close_EUR'].ewm(span=20).mean()
 
@@ -79,20 +80,18 @@ try:
         st.info(f"RSI: {rsi:.1f} (neutral)")
 
     st.markdown("### Kursverlauf inkl. Bollinger Bänder")
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['Close_EUR'], name='Kurs', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['UpperBB'], name='Upper BB', line=dict(color='lightgray')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['LowerBB'], name='Lower BB', line=dict(color='lightgray')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['EMA9'], name='EMA 9', line=dict(color='green', dash='dot')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['EMA20'], name='EMA 20', line=dict(color='red', dash='dot')))
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
+    chart = hist
+    if len(hist) > MAX_POINTS:
+        # Lange Historie: Chart ist reduziert, Details über einen Ausschnitt in voller Auflösung
+        dates = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        start, end = st.slider("Ausschnitt", min_value=dates[0].to_pydatetime(), max_value=dates[-1].to_pydatetime(),
+                               value=(dates[0].to_pydatetime(), dates[-1].to_pydatetime()), format="DD.MM.YY HH:mm")
+        chart = select_window(hist, start, end)
+        st.caption(f"{len(chart)} Bars im Ausschnitt, angezeigt höchstens {MAX_POINTS} Punkte je Linie")
+    st.plotly_chart(price_figure(chart), use_container_width=True)
 
     st.markdown("### Volumenprofil")
-    vol_fig = go.Figure()
-    vol_fig.add_trace(go.Bar(x=hist.index, y=hist['Volume'], name='Volumen', marker_color='orange'))
-    vol_fig.update_layout(height=200)
-    st.plotly_chart(vol_fig, use_container_width=True)
+    st.plotly_chart(volume_figure(chart), use_container_width=True)
 
 except Exception as e:
     st.error(f"Fehler bei Datenanalyse: {e}")
@@ -102,10 +101,7 @@ except Exception as e:
 # --------------------------------------
 st.markdown("### Tradejournal")
 csv_file = "tradejournal.csv"
-try:
-    journal_df = pd.read_csv(csv_file)
-except FileNotFoundError:
-    journal_df = pd.DataFrame(columns=["Datum", "Ticker", "Entry (EUR)", "Exit (EUR)", "Stückzahl", "Gewinn/Verlust (EUR)", "Setup", "Notizen"])
+import_csv(csv_file)
 
 with st.form("new_trade"):
     col1, col2 = st.columns(2)
@@ -129,9 +125,9 @@ with st.form("new_trade"):
             "Setup": setup,
             "Notizen": notes
         }
-        journal_df = pd.concat([journal_df, pd.DataFrame([new_entry])], ignore_index=True)
-        journal_df.to_csv(csv_file, index=False)
+        append_trade(new_entry)
         st.success("Trade gespeichert!")
 
+journal_df = load_journal(limit=500)
 if not journal_df.empty:
-    st.dataframe(journal_df.sort_values(by="Datum", ascending=False))
+    st.dataframe(journal_df)
@@ -1,8 +1,10 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import plotly.graph_objs as go
+from symbol_resolver import SymbolResolver
+import result_cache
+from fx import to_eur
+from chart_data import MAX_POINTS, price_figure, select_window, volume_figure
 import datetime
 
 st.set_page_config(page_title="Daytrading Terminal Robust+", layout="centered")
@@ -33,40 +35,43 @@ manual_map = {
     "novo nordisk": "NVO"
 }
 
-def resolve_symbol(query):
-    q = query.strip().lower()
-    if q in manual_map:
-        return manual_map[q]
-    try:
-        info = yf.utils.get_ticker_by_name(q)
-        if info:
-            return info[0]["symbol"]
-    except:
-        pass
-    return q.upper()
+@st.cache_resource
+def load_resolver():
+    return SymbolResolver(manual_map)
+
+resolver = load_resolver()
 
 query = st.text_input("Aktie, ISIN, WKN oder Firmennamen eingeben", "rheinmetall")
-symbol = resolve_symbol(query)
+resolution = resolver.resolve(query)
+if resolution.source == "unbekannt":
+    # Weder lokal noch bei Yahoo gefunden: kein Kursabruf für geratene Symbole
+    st.error(f"Kein Ticker zu „{query}“ gefunden.")
+    st.stop()
+symbol = resolution.symbol
 st.write(f"**Erkannter Ticker:** `{symbol}`")
+period = st.selectbox("Zeitraum", ["1mo", "6mo", "1y", "5y", "max"])
+
+# Stundenbars liefert Yahoo nur für die letzten 730 Tage
+INTRADAY_PERIODS = {"1mo", "6mo", "1y"}
 
-@st.cache_data
-def get_data(symbol):
-    for interval in ["1h", "1d"]:
-        try:
-            hist = yf.download(symbol, period="1mo", interval=interval, progress=False)
-            if not hist.empty:
-                return hist, interval
-        except:
-            continue
+def get_data(symbol, period):
+    intervals = ["1h", "1d"] if period in INTRADAY_PERIODS else ["1d"]
+    for interval in intervals:
+        hist = result_cache.cached_bars(symbol, period=period, interval=interval)
+        if not hist.empty:
+            return hist, interval
     return pd.DataFrame(), None
 
-hist, interval = get_data(symbol)
+hist, interval = get_data(symbol, period)
+if period not in INTRADAY_PERIODS:
+    st.info(f"Für {period} gibt es nur Tagesbars (Stundenbars liefert Yahoo höchstens für 730 Tage).")
+elif interval == "1d":
+    st.info("Keine Stundenbars verfügbar – Anzeige mit Tagesbars.")
 
 if hist.empty:
     st.error("Keine Kursdaten gefunden.")
 else:
-    usd_to_eur = 0.92
-    hist['Close_EUR'] = hist['Close'] * usd_to_eur
+    hist['Close_EUR'] = to_eur(hist, symbol)
     hist['EMA9'] = hist['Close_EUR'].ewm(span=9).mean()
     hist['EMA20'] = hist['Close_EUR'].ewm(span=20).mean()
 
@@ -106,17 +111,18 @@ else:
         st.info(f"RSI: {rsi:.1f} (neutral)")
 
     st.markdown("### Kursverlauf inkl. Bollinger Bänder")
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['Close_EUR'], name='Kurs', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['UpperBB'], name='Upper BB', line=dict(color='lightgray')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['LowerBB'], name='Lower BB', line=dict(color='lightgray')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['EMA9'], name='EMA 9', line=dict(color='green', dash='dot')))
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['EMA20'], name='EMA 20', line=dict(color='red', dash='dot')))
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
+    chart = hist
+    if len(hist) > MAX_POINTS:
+        # Lange Historie: Chart ist reduziert, Details über einen Ausschnitt in voller Auflösung
+        dates = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        start, end = st.slider("Ausschnitt", min_value=dates[0].to_pydatetime(), max_value=dates[-1].to_pydatetime(),
+                               value=(dates[0].to_pydatetime(), dates[-1].to_pydatetime()), format="DD.MM.YY HH:mm")
+        chart = select_window(hist, start, end)
+        st.caption(f"{len(chart)} Bars im Ausschnitt, angezeigt höchstens {MAX_POINTS} Punkte je Linie")
+    st.plotly_chart(price_figure(chart), use_container_width=True)
 
     st.markdown("### Volumenprofil")
-    vol_fig = go.Figure()
-    vol_fig.add_trace(go.Bar(x=hist.index, y=hist['Volume'], name='Volumen', marker_color='orange'))
-    vol_fig.update_layout(height=200)
-    st.plotly_chart(vol_fig, use_container_width=True)
+    st.plotly_chart(volume_figure(chart), use_container_width=True)
+
+st.sidebar.markdown("**Cache**")
+st.sidebar.json(result_cache.stats())
@@ -0,0 +1,154 @@
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+import upstream
+from bar_store import get_bars_many
+from indicators import USD_TO_EUR, date_matrix
+
+# -------------------------------------
+# Währungsumrechnung nach EUR
+# -------------------------------------
+# Die Notierungswährung eines Tickers wird einmal aus dem Börsenkürzel
+# abgeleitet (nur bei unbekanntem Kürzel einmalig über Yahoo nachgefragt)
+# und gecacht. Je benötigter Währung wird die Tagesreihe EUR<WÄHRUNG>=X
+# einmal pro Prozess über den lokalen Kursspeicher geladen; umgerechnet wird
+# mit dem zum Bar-Datum passenden Kurs, für ganze Matrizen in einem Schritt.
+# Untereinheiten (Pence, Agorot, Cent) teilen sich die Reihe der Hauptwährung
+# und werden durch SUBUNITS geteilt.
+SUFFIX_CURRENCY = {
+    # Euro-Börsen
+    "DE": "EUR", "F": "EUR", "BE": "EUR", "DU": "EUR", "HA": "EUR", "HM": "EUR", "MU": "EUR", "SG": "EUR",
+    "PA": "EUR", "AS": "EUR", "BR": "EUR", "MI": "EUR", "MC": "EUR", "VI": "EUR", "HE": "EUR", "IR": "EUR",
+    "AT": "EUR", "LS": "EUR",
+    # London notiert in Pence, Tel Aviv in Agorot
+    "L": "GBp", "IL": "USD", "TA": "ILA",
+    "SW": "CHF", "ST": "SEK", "CO": "DKK", "OL": "NOK", "PR": "CZK", "WA": "PLN",
+    "TO": "CAD", "V": "CAD", "AX": "AUD", "T": "JPY", "HK": "HKD", "SS": "CNY", "SZ": "CNY",
+    "NS": "INR", "BO": "INR", "KS": "KRW", "SA": "BRL", "MX": "MXN",
+}
+# Untereinheit -> (Hauptwährung, Teiler); Kürzel wie bei Yahoo
+SUBUNITS = {"GBp": ("GBP", 100), "GBX": ("GBP", 100), "ILA": ("ILS", 100), "ZAc": ("ZAR", 100)}
+FX_PERIOD = "max"
+FX_REFRESH = 3600
+
+_rates = {}  # Währung -> (EUR-Faktor je Datum, geladen um)
+_lock = threading.Lock()
+
+
+def _ticker_currency(symbol):
+    return yf.Ticker(symbol).fast_info["currency"]
+
+
+@lru_cache(maxsize=None)
+def quote_currency(symbol, offline=False):
+    suffix = symbol.rsplit(".", 1)[1].upper() if "." in symbol else ""
+    if not suffix:
+        return "USD"
+    if suffix in SUFFIX_CURRENCY:
+        return SUFFIX_CURRENCY[suffix]
+    if offline:
+        return "USD"
+    try:
+        return upstream.call("waehrung", _ticker_currency, symbol) or "USD"
+    except Exception:
+        return "USD"
+
+
+def _pair(currency):
+    base = SUBUNITS[currency][0] if currency in SUBUNITS else currency.upper()
+    return f"EUR{base}=X"
+
+
+def _load_factors(currencies, offline=False):
+    """EUR-Faktoren (Multiplikator Preis -> EUR) je Datum für die Währungen."""
+    now = time.time()
+    with _lock:
+        missing = [c for c in currencies
+                   if c != "EUR" and (c not in _rates or now - _rates[c][1] > FX_REFRESH)]
+    pairs = {c: _pair(c) for c in dict.fromkeys(missing)}  # GBp und GBP teilen sich EURGBP=X
+    if pairs:
+        frames, _ = get_bars_many(list(dict.fromkeys(pairs.values())), period=FX_PERIOD, interval="1d",
+                                  offline=offline)
+        with _lock:
+            for currency, pair in pairs.items():
+                if pair in frames:
+                    rate = frames[pair]["Close"]
+                    rate.index = pd.DatetimeIndex(rate.index).tz_localize(None).normalize()
+                    factor = 1 / rate[~rate.index.duplicated(keep="last")]
+                elif pair == "EURUSD=X":
+                    factor = pd.Series([USD_TO_EUR], index=pd.DatetimeIndex(["1970-01-01"]))
+                else:
+                    factor = pd.Series([np.nan], index=pd.DatetimeIndex(["1970-01-01"]))
+                if currency in SUBUNITS:
+                    factor = factor / SUBUNITS[currency][1]
+                _rates[currency] = (factor.sort_index(), now)
+    with _lock:
+        return {c: (_rates[c][0] if c != "EUR" else None) for c in currencies}
+
+
+def _bar_dates(index):
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def eur_factors(index, currencies, offline=False):
+    """Faktor-Matrix (len(index) x len(currencies)) passend zu den Bar-Zeitstempeln."""
+    dates = _bar_dates(index)
+    factors = _load_factors(list(dict.fromkeys(currencies)), offline=offline)
+    columns = {}
+    for currency, factor in factors.items():
+        if factor is None:
+            columns[currency] = np.ones(len(dates))
+        else:
+            columns[currency] = factor.reindex(dates, method="ffill").bfill().to_numpy()
+    table = pd.DataFrame(columns, index=index)
+    return table[list(currencies)].to_numpy()
+
+
+def eur_factor(index, symbol):
+    """EUR-Faktor je Bar für einen einzelnen Ticker (als Series auf ``index``)."""
+    return pd.Series(eur_factors(index, [quote_currency(symbol)])[:, 0], index=index)
+
+
+def to_eur(data, symbol):
+    """Rechnet eine Kursreihe (oder die Close-Spalte eines DataFrames) nach EUR um."""
+    close = data["Close"] if isinstance(data, pd.DataFrame) else data
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return close * eur_factor(close.index, symbol)
+
+
+def eur_price_matrix(frames, field="Close", offline=False, by_date=False):
+    """Rechtsbündige Kursmatrix und passende EUR-Faktor-Matrix für ``screen_indicators``.
+
+    Alle Ticker werden auf einen gemeinsamen Zeitindex gelegt, die Faktoren
+    je Währung einmal ausgerichtet und spaltenweise zugeordnet; danach werden
+    beide Matrizen wie in ``price_matrix`` rechtsbündig gemacht. Mit
+    ``by_date=True`` bleiben sie auf der gemeinsamen Datumsachse von
+    ``date_matrix`` (für Backtests: Portfolio-Summen je Tag, datierte Fenster).
+    """
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+    symbols = list(frames)
+    if by_date:
+        close = date_matrix(frames, field)
+        factors = eur_factors(close.index, [quote_currency(s, offline) for s in symbols], offline=offline)
+        return close, pd.DataFrame(np.where(close.notna(), factors, np.nan), index=close.index, columns=symbols)
+    aligned = pd.concat({s: pd.Series(np.asarray(df[field], dtype=float).ravel(), index=df.index)
+                         for s, df in frames.items()}, axis=1).sort_index()
+    values = aligned.to_numpy()
+    factors = eur_factors(aligned.index, [quote_currency(s, offline) for s in symbols], offline=offline)
+
+    valid = ~np.isnan(values)
+    order = np.argsort(valid, axis=0, kind="stable")  # NaN nach oben, eigene Bars in Reihenfolge nach unten
+    rows = max(int(valid.sum(axis=0).max()), 1)
+    close = np.take_along_axis(values, order, axis=0)[-rows:]
+    fx = np.take_along_axis(np.where(valid, factors, np.nan), order, axis=0)[-rows:]
+    return pd.DataFrame(close, columns=symbols), pd.DataFrame(fx, columns=symbols)
@@ -0,0 +1,355 @@
+import copy
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+USD_TO_EUR = 0.92
+
+
+def last_valid(series):
+    try:
+        return float(series.dropna().iloc[-1])
+    except:
+        return None
+
+
+def calculate_indicators(df, fx=USD_TO_EUR):
+    close = df["Close"]
+    indicators = {}
+    close_eur = close * fx
+    indicators["price_eur"] = last_valid(close_eur)
+
+    delta = close_eur.diff()
+    gain = delta.clip(lower=0)
+    loss = -delta.clip(upper=0)
+    avg_gain = gain.rolling(window=14).mean()
+    avg_loss = loss.rolling(window=14).mean()
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+    rsi_val = last_valid(rsi)
+    indicators["rsi"] = rsi_val
+    indicators["rsi_state"] = "neutral"
+    if rsi_val:
+        if rsi_val > 70:
+            indicators["rsi_state"] = "überkauft"
+        elif rsi_val < 30:
+            indicators["rsi_state"] = "überverkauft"
+
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    ema26 = close.ewm(span=26, adjust=False).mean()
+    macd = ema12 - ema26
+    signal = macd.ewm(span=9, adjust=False).mean()
+    indicators["macd"] = last_valid(macd)
+    indicators["macd_signal"] = last_valid(signal)
+    indicators["macd_trend"] = "neutral"
+    if indicators["macd"] and indicators["macd_signal"]:
+        if indicators["macd"] > indicators["macd_signal"]:
+            indicators["macd_trend"] = "bullish crossover"
+        elif indicators["macd"] < indicators["macd_signal"]:
+            indicators["macd_trend"] = "bearish crossover"
+
+    sma20 = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    indicators["bollinger_upper"] = last_valid(sma20 + 2 * std)
+    indicators["bollinger_lower"] = last_valid(sma20 - 2 * std)
+
+    ema9 = close_eur.ewm(span=9).mean()
+    ema20 = close_eur.ewm(span=20).mean()
+    if last_valid(ema9) and last_valid(ema20):
+        indicators["trend"] = "Bullish" if last_valid(ema9) > last_valid(ema20) else "Bearish"
+    else:
+        indicators["trend"] = "n/v"
+
+    # Neu: Performance und Volatilität
+    indicators["perf_1d"] = (close_eur.pct_change(periods=1) * 100).iloc[-1]
+    indicators["perf_1w"] = (close_eur.pct_change(periods=5) * 100).iloc[-1]
+    indicators["perf_1m"] = (close_eur.pct_change(periods=21) * 100).iloc[-1]
+    indicators["volatility"] = close_eur.pct_change().rolling(window=20).std().iloc[-1] * 100
+
+    return indicators
+
+
+# -------------------------------------
+# Querschnitts-Indikatoren für ganze Watchlists
+# -------------------------------------
+# Statt calculate_indicators je Symbol aufzurufen, rechnet screen_indicators
+# auf einer Kursmatrix (Bars x Ticker) – jede Kennzahl ist eine einzige
+# Operation über alle Spalten gleichzeitig.
+#
+# Gebraucht wird nur der jeweils letzte Wert, deshalb rechnet jede Kennzahl
+# nur auf den letzten Zeilen, die sie beeinflussen: die Fenster-Kennzahlen
+# auf WINDOW_HISTORY Bars, die EMAs auf EWM_HISTORY Bars – danach ist der
+# Einfluss des Startwerts kleiner als die Rechengenauigkeit. Lange Historien
+# erzeugen so keine Zwischenergebnisse in Größe der ganzen Matrix.
+WINDOW_HISTORY = 22  # längstes Fenster: perf_1m (21 Perioden) plus Vorwert
+
+
+def _warmup(span):
+    # Bars, bis das Gewicht (1 - alpha)^n des Startwerts unter die Maschinengenauigkeit fällt
+    return math.ceil(math.log(np.finfo(float).eps) / math.log(1 - 2 / (span + 1)))
+
+
+EWM_HISTORY = _warmup(26) + _warmup(9)  # MACD-Signal ist eine EMA über EMAs
+
+def price_matrix(frames, field="Close"):
+    """Baut aus ``{symbol: OHLCV-DataFrame}`` eine rechtsbündige Kursmatrix.
+
+    Jede Spalte enthält nur die eigenen Bars des Tickers, die letzte Bar
+    steht für alle Ticker in der letzten Zeile (unterschiedliche Feiertage
+    und Handelszeiten erzeugen so keine Lücken mitten in der Reihe).
+    """
+    if not frames:
+        return pd.DataFrame()
+    columns = {symbol: np.asarray(df[field], dtype=float).ravel() for symbol, df in frames.items()}
+    length = max(len(values) for values in columns.values())
+    matrix = np.full((length, len(columns)), np.nan)
+    for i, values in enumerate(columns.values()):
+        values = values[~np.isnan(values)]
+        if len(values):
+            matrix[length - len(values):, i] = values
+    return pd.DataFrame(matrix, columns=list(columns))
+
+
+def _bar_keys(index):
+    # Tagesbars: Börsendatum (ohne Zeitzone), damit Frankfurt und New York auf derselben Zeile landen;
+    # Intraday-Bars: UTC-Zeitpunkt
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        return index
+    local = index.tz_localize(None)
+    if (local == local.normalize()).all():
+        return local
+    return index.tz_convert("UTC").tz_localize(None)
+
+
+def date_matrix(frames, field="Close"):
+    """Kursmatrix auf gemeinsamer Zeitachse (Index = Datum bzw. Zeitpunkt) aus ``{symbol: OHLCV-DataFrame}``.
+
+    Anders als bei ``price_matrix`` steht jede Zeile für denselben Tag bei
+    allen Tickern – nötig für Portfolio-Summen je Bar und datierte Fenster.
+    Lücken zwischen erster und letzter Bar eines Tickers (Feiertage anderer
+    Börsen) werden mit dem letzten Kurs gefüllt, davor und danach bleibt NaN.
+    """
+    if not frames:
+        return pd.DataFrame()
+    columns = {}
+    for symbol, df in frames.items():
+        values = pd.Series(np.asarray(df[field], dtype=float).ravel(), index=_bar_keys(df.index))
+        columns[symbol] = values[~values.index.duplicated(keep="last")]
+    aligned = pd.concat(columns, axis=1).sort_index()
+    return aligned.ffill().where(aligned.bfill().notna())
+
+
+def _last_valid(frame):
+    return frame.ffill().iloc[-1] if len(frame) else pd.Series(np.nan, index=frame.columns)
+
+
+def screen_indicators(close, fx=USD_TO_EUR):
+    """Berechnet die Kennzahlen von ``calculate_indicators`` für alle Spalten von ``close``.
+
+    ``close`` ist eine rechtsbündige Kursmatrix wie von ``price_matrix``;
+    ``fx`` ist ein Umrechnungsfaktor (Skalar oder Matrix gleicher Form).
+    Ergebnis ist ein DataFrame mit einer Zeile je Ticker.
+    """
+    if np.ndim(fx) == 2:
+        fx = fx.iloc[-EWM_HISTORY:] if isinstance(fx, pd.DataFrame) else np.asarray(fx)[-EWM_HISTORY:]
+    close = close.iloc[-EWM_HISTORY:]
+    close_eur = close * fx
+    window, window_eur = close.iloc[-WINDOW_HISTORY:], close_eur.iloc[-WINDOW_HISTORY:]
+    result = pd.DataFrame(index=close.columns)
+    result["price_eur"] = _last_valid(window_eur)
+
+    delta = window_eur.diff()
+    avg_gain = delta.clip(lower=0).rolling(window=14).mean()
+    avg_loss = (-delta.clip(upper=0)).rolling(window=14).mean()
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    result["rsi"] = _last_valid(rsi)
+    result["rsi_state"] = np.select([result["rsi"] > 70, result["rsi"] < 30],
+                                    ["überkauft", "überverkauft"], "neutral")
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    result["macd"] = _last_valid(macd)
+    result["macd_signal"] = _last_valid(signal)
+    result["macd_trend"] = np.select([result["macd"] > result["macd_signal"], result["macd"] < result["macd_signal"]],
+                                     ["bullish crossover", "bearish crossover"], "neutral")
+
+    sma20 = window.rolling(window=20).mean()
+    std = window.rolling(window=20).std()
+    result["bollinger_upper"] = _last_valid(sma20 + 2 * std)
+    result["bollinger_lower"] = _last_valid(sma20 - 2 * std)
+
+    result["ema9"] = _last_valid(close_eur.ewm(span=9).mean())
+    result["ema20"] = _last_valid(close_eur.ewm(span=20).mean())
+    # Wie calculate_indicators: gleich hohe EMAs zählen als Bearish
+    result["trend"] = np.select([result["ema9"].isna() | result["ema20"].isna(), result["ema9"] > result["ema20"]],
+                                ["n/v", "Bullish"], "Bearish")
+
+    returns = window_eur.pct_change()
+    result["perf_1d"] = (window_eur.pct_change(periods=1) * 100).iloc[-1]
+    result["perf_1w"] = (window_eur.pct_change(periods=5) * 100).iloc[-1]
+    result["perf_1m"] = (window_eur.pct_change(periods=21) * 100).iloc[-1]
+    result["volatility"] = returns.rolling(window=20).std().iloc[-1] * 100
+    return result
+
+
+def describe(row):
+    """Kurztext "Trend, RSI n (Zustand)" wie auf den Multi-Ticker-Seiten."""
+    rsi = f"{int(row['rsi'])}" if pd.notna(row["rsi"]) else "n/v"
+    return f"{row['trend']}, RSI {rsi} ({row['rsi_state']})"
+
+
+# -------------------------------------
+# Inkrementeller Indikator-Zustand für Live-Updates
+# -------------------------------------
+# Hält EMA-Rekursionen, gleitende Fenster (RSI-Mittelwerte, Bollinger,
+# Volatilität) und die letzten Kurse so vor, dass jede neue Bar in
+# konstanter Zeit eingearbeitet wird. snapshot() liefert dieselben Werte
+# wie calculate_indicators auf der kompletten Historie.
+
+class _Ema:
+    def __init__(self, span, adjust=True):
+        self.alpha = 2 / (span + 1)
+        self.adjust = adjust
+        self.num = self.den = 0.0
+        self.value = None
+
+    def update(self, x):
+        decay = 1 - self.alpha
+        if self.adjust:
+            # Entspricht pandas ewm(adjust=True): gewichtete Summe / Summe der Gewichte
+            self.num = x + decay * self.num
+            self.den = 1 + decay * self.den
+            self.value = self.num / self.den
+        elif self.value is None:
+            self.value = x
+        else:
+            self.value = decay * self.value + self.alpha * x
+        return self.value
+
+
+class _Window:
+    """Gleitender Mittelwert/Varianz (Welford mit Entfernen) über ``size`` Werte."""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        self.values.append(x)
+        n = len(self.values)
+        d = x - self.mean
+        self.mean += d / n
+        self.m2 += d * (x - self.mean)
+        if n > self.size:
+            y = self.values.popleft()
+            n -= 1
+            d = y - self.mean
+            self.mean -= d / n
+            self.m2 -= d * (y - self.mean)
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def std(self):
+        return math.sqrt(max(self.m2, 0.0) / (self.size - 1)) if self.full else None
+
+
+class IndicatorState:
+    def __init__(self, fx=USD_TO_EUR):
+        self.fx = fx
+        self.ema9, self.ema20 = _Ema(9), _Ema(20)
+        self.ema12, self.ema26 = _Ema(12, adjust=False), _Ema(26, adjust=False)
+        self.signal = _Ema(9, adjust=False)
+        self.gain, self.loss = _Window(14), _Window(14)
+        self.bollinger = _Window(20)
+        self.returns = _Window(20)
+        self.recent = deque(maxlen=22)  # Close (EUR) der letzten 22 Bars für perf_1d/1w/1m
+        self.macd = None
+
+    @classmethod
+    def from_history(cls, df, fx=USD_TO_EUR):
+        state = cls(fx=fx)
+        for close in df["Close"].dropna():
+            state.update(float(close))
+        return state
+
+    def update(self, close):
+        close_eur = close * self.fx
+        if self.recent:
+            prev = self.recent[-1]
+            delta = close_eur - prev
+            self.gain.update(max(delta, 0.0))
+            self.loss.update(max(-delta, 0.0))
+            self.returns.update(close_eur / prev - 1 if prev else math.nan)
+        self.recent.append(close_eur)
+
+        self.ema9.update(close_eur)
+        self.ema20.update(close_eur)
+        self.macd = self.ema12.update(close) - self.ema26.update(close)
+        self.signal.update(self.macd)
+        self.bollinger.update(close)
+
+    def peek(self, close):
+        """Kennzahlen inkl. einer noch offenen Bar, ohne den Zustand zu verändern."""
+        state = copy.deepcopy(self)
+        state.update(close)
+        return state.snapshot()
+
+    def _perf(self, periods):
+        if len(self.recent) <= periods:
+            return math.nan
+        return (self.recent[-1] / self.recent[-1 - periods] - 1) * 100
+
+    def _rsi(self):
+        if not self.gain.full:
+            return None
+        avg_gain, avg_loss = self.gain.mean, self.loss.mean
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else None
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def snapshot(self):
+        """Aktuelle Kennzahlen im Format von ``calculate_indicators``."""
+        indicators = {"price_eur": self.recent[-1] if self.recent else None}
+
+        rsi_val = self._rsi()
+        indicators["rsi"] = rsi_val
+        indicators["rsi_state"] = "neutral"
+        if rsi_val:
+            if rsi_val > 70:
+                indicators["rsi_state"] = "überkauft"
+            elif rsi_val < 30:
+                indicators["rsi_state"] = "überverkauft"
+
+        indicators["macd"] = self.macd
+        indicators["macd_signal"] = self.signal.value
+        indicators["macd_trend"] = "neutral"
+        if indicators["macd"] and indicators["macd_signal"]:
+            if indicators["macd"] > indicators["macd_signal"]:
+                indicators["macd_trend"] = "bullish crossover"
+            elif indicators["macd"] < indicators["macd_signal"]:
+                indicators["macd_trend"] = "bearish crossover"
+
+        std = self.bollinger.std()
+        indicators["bollinger_upper"] = self.bollinger.mean + 2 * std if std is not None else None
+        indicators["bollinger_lower"] = self.bollinger.mean - 2 * std if std is not None else None
+
+        ema9, ema20 = self.ema9.value, self.ema20.value
+        indicators["ema9"], indicators["ema20"] = ema9, ema20
+        if ema9 and ema20:
+            indicators["trend"] = "Bullish" if ema9 > ema20 else "Bearish"
+        else:
+            indicators["trend"] = "n/v"
+
+        indicators["perf_1d"] = self._perf(1)
+        indicators["perf_1w"] = self._perf(5)
+        indicators["perf_1m"] = self._perf(21)
+        vol = self.returns.std()
+        indicators["volatility"] = vol * 100 if vol is not None else math.nan
+        return indicators
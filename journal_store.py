@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+import pandas as pd
+
+# -------------------------------------
+# Tradejournal-Speicher (SQLite, WAL)
+# -------------------------------------
+# Jeder gespeicherte Trade ist ein einzelnes INSERT in einer eigenen
+# Transaktion – kein Neuschreiben der ganzen Datei mehr. WAL-Modus und
+# Busy-Timeout erlauben mehrere gleichzeitig speichernde Sessions, ohne dass
+# Trades verloren gehen. Ein bestehendes tradejournal.csv wird beim ersten
+# Öffnen einmalig übernommen.
+#
+# Mit jedem Trade werden in derselben Transaktion laufende Kennzahlen
+# fortgeschrieben (gesamt, je Setup, je Ticker): Anzahl, Gewinner/Verlierer,
+# Summen, kumulierte Equity, Hochpunkt und maximaler Drawdown. Die
+# Auswertung liest nur noch diese Zeilen statt das ganze Journal.
+# Journale, die noch ohne diese Kennzahlen angelegt wurden, bekommen beim
+# ersten Öffnen die Spalte equity, die Kennzahlen werden einmal nachgerechnet.
+DB_PATH = os.environ.get("STOCKINATOR_JOURNAL_DB", "tradejournal.sqlite")
+CSV_PATH = "tradejournal.csv"
+
+JOURNAL_COLUMNS = ["Datum", "Ticker", "Entry (EUR)", "Exit (EUR)", "Stückzahl",
+                   "Gewinn/Verlust (EUR)", "Setup", "Notizen"]
+_DB_COLUMNS = ["datum", "ticker", "entry", "exit", "stueckzahl", "pnl", "setup", "notizen"]
+_STAT_FIELDS = ["trades", "wins", "losses", "win_sum", "loss_sum", "pnl", "peak", "max_drawdown"]
+
+
+def connect(path=None):
+    con = sqlite3.connect(path or DB_PATH, timeout=30, isolation_level=None)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=FULL")
+    con.execute("""CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        datum TEXT, ticker TEXT, entry REAL, exit REAL, stueckzahl INTEGER,
+        pnl REAL, setup TEXT, notizen TEXT, equity REAL)""")
+    con.execute("CREATE INDEX IF NOT EXISTS trades_datum ON trades (datum)")
+    con.execute("CREATE INDEX IF NOT EXISTS trades_ticker ON trades (ticker)")
+    con.execute("CREATE INDEX IF NOT EXISTS trades_setup ON trades (setup)")
+    con.execute("CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, rows INTEGER)")
+    con.execute("""CREATE TABLE IF NOT EXISTS stats (
+        scope TEXT, key TEXT, trades INTEGER, wins INTEGER, losses INTEGER,
+        win_sum REAL, loss_sum REAL, pnl REAL, peak REAL, max_drawdown REAL,
+        PRIMARY KEY (scope, key))""")
+    if not _has_equity(con):
+        _migrate_equity(con)
+    return con
+
+
+@contextmanager
+def _transaction(con):
+    # IMMEDIATE sperrt sofort für Schreiber, damit parallele Sessions die
+    # laufenden Kennzahlen nicht auf Basis eines veralteten Stands fortschreiben
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        yield con
+    except BaseException:
+        con.execute("ROLLBACK")
+        raise
+    con.execute("COMMIT")
+
+
+def _row(record):
+    return tuple(record.get(col) for col in JOURNAL_COLUMNS)
+
+
+def _accumulate(con, records):
+    """Schreibt die Kennzahlen für ``records`` fort; gibt ``(equity je Trade, geänderte Kennzahlen)`` zurück."""
+    stats = {}
+
+    def stat(scope, key):
+        if (scope, key) not in stats:
+            row = con.execute(f"SELECT {', '.join(_STAT_FIELDS)} FROM stats WHERE scope=? AND key=?",
+                              (scope, key)).fetchone()
+            stats[(scope, key)] = dict(zip(_STAT_FIELDS, row or (0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0)))
+        return stats[(scope, key)]
+
+    equity = []
+    for record in records:
+        pnl = record.get("Gewinn/Verlust (EUR)")
+        pnl = 0.0 if pnl is None or pd.isna(pnl) else float(pnl)
+        for scope, key in (("gesamt", ""), ("setup", record.get("Setup") or ""),
+                           ("ticker", record.get("Ticker") or "")):
+            s = stat(scope, str(key))
+            s["trades"] += 1
+            if pnl > 0:
+                s["wins"] += 1
+                s["win_sum"] += pnl
+            elif pnl < 0:
+                s["losses"] += 1
+                s["loss_sum"] += pnl
+            s["pnl"] += pnl
+            s["peak"] = max(s["peak"], s["pnl"])
+            s["max_drawdown"] = max(s["max_drawdown"], s["peak"] - s["pnl"])
+        equity.append(stat("gesamt", "")["pnl"])
+    return equity, stats
+
+
+def _write_stats(con, stats):
+    con.executemany(f"INSERT OR REPLACE INTO stats VALUES (?, ?, {', '.join('?' * len(_STAT_FIELDS))})",
+                    [(scope, key, *(s[f] for f in _STAT_FIELDS)) for (scope, key), s in stats.items()])
+
+
+def _insert(con, records):
+    equity, stats = _accumulate(con, records)
+    con.executemany(f"INSERT INTO trades ({', '.join(_DB_COLUMNS)}, equity) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [_row(record) + (value,) for record, value in zip(records, equity)])
+    _write_stats(con, stats)
+
+
+def _has_equity(con):
+    return "equity" in {row[1] for row in con.execute("PRAGMA table_info(trades)")}
+
+
+def _migrate_equity(con):
+    """Journale aus der Zeit vor den laufenden Kennzahlen: Spalte equity ergänzen, Kennzahlen einmal nachrechnen."""
+    with _transaction(con):
+        if _has_equity(con):  # andere Session war schneller
+            return
+        con.execute("ALTER TABLE trades ADD COLUMN equity REAL")
+        con.execute("DELETE FROM stats")
+        rows = con.execute("SELECT id, ticker, pnl, setup FROM trades ORDER BY id").fetchall()
+        equity, stats = _accumulate(con, [{"Ticker": ticker, "Gewinn/Verlust (EUR)": pnl, "Setup": setup}
+                                          for _, ticker, pnl, setup in rows])
+        con.executemany("UPDATE trades SET equity=? WHERE id=?", zip(equity, (row[0] for row in rows)))
+        _write_stats(con, stats)
+
+
+def append_trade(record, path=None):
+    """Speichert einen Trade (Dict mit den Journal-Spalten) dauerhaft."""
+    con = connect(path)
+    try:
+        with _transaction(con):
+            _insert(con, [record])
+    finally:
+        con.close()
+
+
+def import_csv(csv_path=CSV_PATH, path=None):
+    """Übernimmt ein bestehendes Journal-CSV einmalig; gibt die Anzahl neuer Trades zurück."""
+    if not os.path.exists(csv_path):
+        return 0
+    con = connect(path)
+    try:
+        key = os.path.abspath(csv_path)
+        if con.execute("SELECT 1 FROM imports WHERE path=?", (key,)).fetchone():
+            return 0
+        df = pd.read_csv(csv_path)
+        df = df.astype(object).where(df.notna(), None)
+        with _transaction(con):
+            # Erneut unter der Schreibsperre prüfen: zwei Sessions beim ersten Start importieren sonst doppelt
+            if con.execute("SELECT 1 FROM imports WHERE path=?", (key,)).fetchone():
+                return 0
+            _insert(con, df.to_dict("records"))
+            con.execute("INSERT INTO imports VALUES (?, ?)", (key, len(df)))
+        return len(df)
+    finally:
+        con.close()
+
+
+def load_journal(limit=None, path=None):
+    """Journal als DataFrame mit den gewohnten Spaltennamen, neueste Trades zuerst."""
+    con = connect(path)
+    try:
+        sql = f"SELECT {', '.join(_DB_COLUMNS)} FROM trades ORDER BY datum DESC, id DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = con.execute(sql).fetchall()
+    finally:
+        con.close()
+    return pd.DataFrame(rows, columns=JOURNAL_COLUMNS)
+
+
+def trade_results(path=None):
+    """Nur Setup und Gewinn/Verlust je Trade (Reihenfolge der Erfassung), z. B. für die Risiko-Simulation."""
+    con = connect(path)
+    try:
+        rows = con.execute("SELECT COALESCE(setup, ''), pnl FROM trades WHERE pnl IS NOT NULL ORDER BY id").fetchall()
+    finally:
+        con.close()
+    return pd.DataFrame(rows, columns=["Setup", "Gewinn/Verlust (EUR)"])
+
+
+def derive_stats(s):
+    """Kennzahlen aus Zählern/Summen (trades, wins, losses, win_sum, loss_sum, pnl, max_drawdown)."""
+    return {
+        "trades": s["trades"],
+        "trefferquote": round(s["wins"] / s["trades"] * 100, 2) if s["trades"] else 0,
+        "avg_win": round(s["win_sum"] / s["wins"], 2) if s["wins"] else 0,
+        "avg_loss": round(s["loss_sum"] / s["losses"], 2) if s["losses"] else 0,
+        "total_pnl": round(s["pnl"], 2),
+        "max_drawdown": round(s["max_drawdown"], 2),
+    }
+
+
+def journal_stats(path=None):
+    """Laufende Kennzahlen: ``(gesamt, je_setup, je_ticker)``.
+
+    ``gesamt`` ist ein Dict (trades, trefferquote, avg_win, avg_loss,
+    total_pnl, max_drawdown), die Aufschlüsselungen sind DataFrames mit
+    denselben Spalten.
+    """
+    con = connect(path)
+    try:
+        rows = con.execute(f"SELECT scope, key, {', '.join(_STAT_FIELDS)} FROM stats").fetchall()
+    finally:
+        con.close()
+    total = derive_stats(dict.fromkeys(_STAT_FIELDS, 0))
+    breakdowns = {"setup": [], "ticker": []}
+    for scope, key, *values in rows:
+        derived = derive_stats(dict(zip(_STAT_FIELDS, values)))
+        if scope == "gesamt":
+            total = derived
+        else:
+            breakdowns[scope].append({scope.capitalize(): key, **derived})
+    return (total, pd.DataFrame(breakdowns["setup"]), pd.DataFrame(breakdowns["ticker"]))
+
+
+def equity_curve(path=None):
+    """Kumulierte PnL je Trade (Reihenfolge der Erfassung)."""
+    con = connect(path)
+    try:
+        rows = con.execute("SELECT datum, equity FROM trades ORDER BY id").fetchall()
+    finally:
+        con.close()
+    return pd.DataFrame(rows, columns=["Datum", "Equity"])
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH
+    print(f"{import_csv(source)} Trades aus {source} übernommen")
@@ -0,0 +1,95 @@
+import pandas as pd
+
+from bar_buffer import BarBook, bars_from_frame
+from indicators import IndicatorState
+from market_data import download_many
+
+# -------------------------------------
+# Live-Modus: Bars im Speicher halten und nur Neues nachladen
+# -------------------------------------
+# LiveWatch lädt die Historie einmal, danach fragt poll() für alle Symbole
+# gebündelt nur die Bars ab dem letzten bekannten Zeitstempel ab. Die letzte
+# Bar ist während des Handels noch offen: abgeschlossene Bars gehen in den
+# IndicatorState, die offene wird nur "angesehen" (peek). Die Bars liegen
+# in Ringpuffern fester Größe (bar_buffer), nicht in DataFrames.
+
+
+class _Series:
+    def __init__(self, buffer, fx):
+        self.buffer = buffer
+        self.state = IndicatorState(fx=fx)
+        self.pv = self.volume = 0.0  # laufende Summen für den VWAP (nur abgeschlossene Bars)
+        for bar in buffer.view()[:-1]:
+            self._close_bar(bar)
+
+    def _close_bar(self, bar):
+        self.state.update(float(bar["close"]))
+        self.pv += (bar["high"] + bar["low"] + bar["close"]) / 3 * bar["volume"]
+        self.volume += bar["volume"]
+
+    def merge(self, new_bars):
+        """Mischt neue Bars ein; gibt True zurück, wenn sich etwas geändert hat."""
+        last = self.buffer.last_ts
+        rows = bars_from_frame(new_bars.dropna(subset=["Close"]))
+        rows = rows[rows["ts"] >= last]
+        if not len(rows):
+            return False
+        if rows["ts"][0] == last:
+            self.buffer.replace_last(rows[0])
+            rows = rows[1:]
+        if len(rows):
+            # Die bisher offene Bar ist jetzt abgeschlossen (ggf. mit finalen Werten)
+            self._close_bar(self.buffer.last)
+            for bar in rows[:-1]:
+                self._close_bar(bar)
+            self.buffer.extend(rows)
+        return True
+
+    def snapshot(self):
+        bar = self.buffer.last
+        indicators = self.state.peek(float(bar["close"]))
+        volume = self.volume + bar["volume"]
+        pv = self.pv + (bar["high"] + bar["low"] + bar["close"]) / 3 * bar["volume"]
+        indicators["close"] = float(bar["close"])
+        indicators["vwap"] = float(pv / volume) if volume else None
+        return indicators
+
+
+class LiveWatch:
+    def __init__(self, symbols, interval="5m", period="5d", fx=1.0):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.interval = interval
+        self.period = period
+        self.fx = fx
+        self.book = BarBook()
+        self.series = {}
+        self.errors = {}
+        self.polls = 0
+
+    def load(self):
+        frames, self.errors = download_many(self.symbols, period=self.period, interval=self.interval)
+        self.series = {symbol: _Series(self.book.load(symbol, self.interval, frames[symbol]), self.fx)
+                       for symbol in self.symbols if symbol in frames and not frames[symbol].empty}
+        return self
+
+    def poll(self):
+        """Lädt nur Bars ab dem letzten bekannten Zeitstempel; gibt die geänderten Symbole zurück."""
+        groups = {}
+        for symbol, series in self.series.items():
+            groups.setdefault(series.buffer.last_ts, []).append(symbol)
+        changed = set()
+        for last, symbols in groups.items():
+            frames, _ = download_many(symbols, period=None, start=pd.Timestamp(last, unit="s", tz="UTC"),
+                                      interval=self.interval, health=False)
+            for symbol, frame in frames.items():
+                if self.series[symbol].merge(frame):
+                    changed.add(symbol)
+        self.polls += 1
+        return changed
+
+    def bars(self, symbol, n=None):
+        """Die letzten ``n`` Bars als DataFrame (Kopie, für Anzeige und Charts)."""
+        return self.series[symbol].buffer.frame(n)
+
+    def snapshot(self, symbol):
+        return self.series[symbol].snapshot()
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+import symbol_health
+import upstream
+
+# -------------------------------------
+# Gebündelter Kursabruf für mehrere Ticker
+# -------------------------------------
+# Statt pro Symbol ein eigenes yf.download werden alle Symbole in Blöcken
+# (max. CHUNK_SIZE) als ein gruppierter Request geladen, die Blöcke laufen
+# parallel mit höchstens MAX_WORKERS gleichzeitigen Abrufen. Alle Requests
+# laufen über das gemeinsame Rate-Limit in upstream. Symbole, die zuletzt
+# keine Daten lieferten, werden laut symbol_health eine Zeit lang übersprungen.
+#
+# yfinance fängt Fehler je Ticker (Rate-Limit, Netzwerk) selbst ab und
+# liefert dann nur leere Frames. Ist ein ganzer Block leer, zählt das deshalb
+# als Fehler des Abrufs, nicht der Symbole; als tot gilt ein Symbol nur, wenn
+# andere Symbole desselben Requests Daten geliefert haben. Bei ganz leeren
+# Requests (typisch: ein einzelnes Symbol) entscheidet ein Kontrollabruf eines
+# bekannt guten Symbols (PROBE_SYMBOL): liefert es Daten, waren die Symbole
+# tot, sonst war Yahoo gestört. Das Ergebnis gilt PROBE_TTL Sekunden je
+# Intervall.
+CHUNK_SIZE = 50
+MAX_WORKERS = 4
+REQUEST_ERROR = "Fehler beim Abruf"  # ganzer Block gescheitert, sagt nichts über das Symbol
+EMPTY_REQUEST = f"{REQUEST_ERROR}: keine Daten für den ganzen Request"
+NO_DATA = "Keine Kursdaten"
+PROBE_SYMBOL = os.environ.get("STOCKINATOR_PROBE_SYMBOL", "SPY")
+PROBE_TTL = 300
+
+_probes = {}  # Intervall -> (Zeitpunkt, Yahoo liefert Daten)
+_probe_lock = threading.Lock()
+
+
+def _unique(symbols):
+    seen = set()
+    result = []
+    for symbol in symbols:
+        if symbol and symbol not in seen:
+            seen.add(symbol)
+            result.append(symbol)
+    return result
+
+
+def _download_chunk(symbols, period, interval, **kwargs):
+    frames, errors = {}, {}
+    try:
+        raw = upstream.download(symbols, period=period, interval=interval, group_by="ticker",
+                                threads=True, progress=False, **kwargs)
+    except Exception as e:
+        return frames, {symbol: f"{REQUEST_ERROR}: {e}" for symbol in symbols}
+
+    for symbol in symbols:
+        if raw is None or raw.empty:
+            data = pd.DataFrame()
+        elif isinstance(raw.columns, pd.MultiIndex):
+            data = raw[symbol] if symbol in raw.columns.get_level_values(0) else pd.DataFrame()
+        else:
+            data = raw
+        data = data.dropna(how="all")
+        if data.empty:
+            errors[symbol] = NO_DATA
+        else:
+            frames[symbol] = data.copy()
+    if not frames:
+        errors = dict.fromkeys(symbols, EMPTY_REQUEST)
+    return frames, errors
+
+
+def upstream_alive(interval):
+    """Liefert Yahoo für ``PROBE_SYMBOL`` gerade Daten? (gecacht für PROBE_TTL)"""
+    with _probe_lock:
+        checked = _probes.get(interval)
+        if checked and time.monotonic() - checked[0] < PROBE_TTL:
+            return checked[1]
+        try:
+            raw = upstream.download(PROBE_SYMBOL, period="5d", interval=interval, progress=False)
+            alive = raw is not None and not raw.dropna(how="all").empty
+        except Exception:
+            alive = False
+        _probes[interval] = (time.monotonic(), alive)
+        return alive
+
+
+def download_many(symbols, period="1mo", interval="1d", chunk_size=CHUNK_SIZE, max_workers=MAX_WORKERS,
+                  health=True, **kwargs):
+    """Lädt Kursdaten für alle Symbole gebündelt.
+
+    Gibt ``(frames, errors)`` zurück: ``frames`` ordnet jedem erfolgreichen
+    Symbol seinen OHLCV-DataFrame zu, ``errors`` jedem fehlgeschlagenen Symbol
+    eine Fehlermeldung. Ein fehlerhaftes Symbol bricht den Rest nicht ab.
+
+    Mit ``health=True`` werden Symbole im Backoff übersprungen und Erfolge
+    bzw. leere Antworten im Gesundheitsregister vermerkt. Beim Nachladen ab
+    einem Zeitpunkt (``start``) ist "keine neuen Bars" kein Fehler, dort
+    ``health=False`` übergeben.
+    """
+    symbols = _unique(symbols)
+    frames, errors = {}, {}
+    if health:
+        symbols, errors = symbol_health.filter_healthy(symbols, interval)
+    if not symbols:
+        return frames, errors
+
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+    failed = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        for chunk_frames, chunk_errors in pool.map(
+                lambda chunk: _download_chunk(chunk, period, interval, **kwargs), chunks):
+            frames.update(chunk_frames)
+            failed.update(chunk_errors)
+    empty = [symbol for symbol, reason in failed.items() if reason == EMPTY_REQUEST]
+    if health and empty and upstream_alive(interval):
+        # Ganzer Request leer, das Kontrollsymbol liefert aber: die Symbole sind tot
+        failed.update(dict.fromkeys(empty, NO_DATA))
+    if health:
+        symbol_health.record(list(frames), {s: reason for s, reason in failed.items()
+                                            if not reason.startswith(REQUEST_ERROR)}, interval)
+    errors.update(failed)
+    return frames, errors
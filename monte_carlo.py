@@ -0,0 +1,111 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------
+# Monte-Carlo-Risiko aus dem Tradejournal
+# -------------------------------------
+# Zieht die Trade-Ergebnisse (Gewinn/Verlust in EUR) mit Zurücklegen und
+# baut daraus viele mögliche Equity-Verläufe (Bootstrap). Je Pfad werden
+# End-PnL, maximaler Drawdown und tiefster Stand gegenüber dem Startkapital
+# bestimmt; daraus Perzentile und die Ruin-Wahrscheinlichkeit je Schwelle.
+#
+# Gerechnet wird Trade für Trade über alle Pfade eines Blocks gleichzeitig
+# (laufende Equity, Hochpunkt, Drawdown, Tiefpunkt als Vektoren), die
+# Zufallsindizes werden in Zeilenblöcken gezogen. So bleibt der Speicher bei
+# O(Pfade) statt Pfade x Trades. Die Pfad-Blöcke können optional auf einen
+# Prozesspool verteilt werden; jeder Block hat einen eigenen Seed aus einer
+# SeedSequence, das Ergebnis hängt also nicht von der Anzahl Prozesse ab.
+#
+# Simuliert wird standardmäßig ein fester Horizont von HORIZON Trades (etwa
+# ein Jahr aktiven Handels) statt so vieler Trades wie im Journal: Laufzeit
+# und Aussage wachsen dann nicht mit jedem erfassten Trade.
+PATHS = 100_000
+HORIZON = 250
+PATH_BLOCK = 25_000
+DRAW_CELLS = 1_000_000  # Zufallsindizes je Ziehung (Trades x Pfade)
+PERCENTILES = [5, 25, 50, 75, 95, 99]
+RUIN_LEVELS = [0.1, 0.2, 0.3, 0.5, 0.75, 1.0]  # Verlust in Anteilen des Startkapitals
+
+
+def _simulate_block(pnl, paths, trades, seed):
+    rng = np.random.default_rng(seed)
+    dtype = np.uint16 if len(pnl) <= np.iinfo(np.uint16).max else np.int64
+    equity, peak, drawdown, lowest, gap = (np.zeros(paths) for _ in range(5))
+    rows = max(1, DRAW_CELLS // paths)
+    for start in range(0, trades, rows):
+        for step in pnl[rng.integers(0, len(pnl), (min(rows, trades - start), paths), dtype=dtype)]:
+            equity += step
+            np.maximum(peak, equity, out=peak)
+            np.subtract(peak, equity, out=gap)
+            np.maximum(drawdown, gap, out=drawdown)
+            np.minimum(lowest, equity, out=lowest)
+    return equity, drawdown, lowest
+
+
+def simulate(pnl, paths=PATHS, trades=HORIZON, seed=None, workers=None):
+    """Bootstrap der Equity-Pfade: ``(end_pnl, max_drawdown, tiefster_stand)`` je Pfad (Arrays).
+
+    ``trades`` ist die Anzahl Trades je Pfad (``None``: so viele wie im
+    Journal), ``workers > 1`` verteilt die Blöcke auf einen Prozesspool.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    pnl = pnl[~np.isnan(pnl)]
+    if not len(pnl):
+        raise ValueError("Keine Trade-Ergebnisse für die Simulation")
+    trades = trades or len(pnl)
+    sizes = [min(PATH_BLOCK, paths - start) for start in range(0, paths, PATH_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = ([pnl] * len(sizes), sizes, [trades] * len(sizes), seeds)
+    if workers and workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_block, *args))
+    else:
+        parts = list(map(_simulate_block, *args))
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def risk_report(pnl, capital, paths=PATHS, trades=HORIZON, seed=None, workers=None):
+    """Perzentile (DataFrame) und Ruin-Wahrscheinlichkeiten (DataFrame) für ein Startkapital in EUR."""
+    end_pnl, drawdown, lowest = simulate(pnl, paths, trades, seed, workers)
+    percentiles = pd.DataFrame({
+        "Perzentil": [f"{p} %" for p in PERCENTILES],
+        "End-PnL (EUR)": np.percentile(end_pnl, PERCENTILES).round(2),
+        "Max. Drawdown (EUR)": np.percentile(drawdown, PERCENTILES).round(2),
+        "Max. Drawdown (%)": (np.percentile(drawdown, PERCENTILES) / capital * 100).round(2),
+    })
+    ruin = pd.DataFrame({
+        "Verlust ab Start (%)": [int(level * 100) for level in RUIN_LEVELS],
+        "Wahrscheinlichkeit (%)": [round(float((lowest <= -level * capital).mean()) * 100, 2)
+                                   for level in RUIN_LEVELS],
+    })
+    return percentiles, ruin
+
+
+def risk_by_setup(journal, capital, paths=PATHS, trades=HORIZON, seed=None, workers=None, min_trades=5):
+    """Ruin-Wahrscheinlichkeit und Drawdown-Median je Setup (Setups mit mindestens ``min_trades``)."""
+    rows = []
+    for setup, group in journal.groupby(journal["Setup"].fillna(""), sort=True):
+        pnl = pd.to_numeric(group["Gewinn/Verlust (EUR)"], errors="coerce").dropna()
+        if len(pnl) < min_trades:
+            continue
+        end_pnl, drawdown, lowest = simulate(pnl, paths, trades, seed=seed, workers=workers)
+        rows.append({"Setup": setup, "Trades": len(pnl),
+                     "End-PnL Median": round(float(np.median(end_pnl)), 2),
+                     "End-PnL 5 %": round(float(np.percentile(end_pnl, 5)), 2),
+                     "Drawdown Median": round(float(np.median(drawdown)), 2),
+                     "Drawdown 95 %": round(float(np.percentile(drawdown, 95)), 2),
+                     "Ruin 50 % (%)": round(float((lowest <= -0.5 * capital).mean()) * 100, 2)})
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from journal_store import trade_results
+
+    capital = float(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    percentiles, ruin = risk_report(trade_results()["Gewinn/Verlust (EUR)"], capital)
+    print(percentiles.to_string(index=False))
+    print()
+    print(ruin.to_string(index=False))
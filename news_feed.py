@@ -0,0 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import upstream
+
+# -------------------------------------
+# Yahoo-News: parallel, gecacht, mit Conditional GET
+# -------------------------------------
+# Jeder Feed wird je Symbol höchstens alle NEWS_TTL Sekunden abgefragt. Danach
+# wird mit ETag/Last-Modified nachgefragt, ein unveränderter Feed kostet nur
+# eine 304-Antwort. Fehler werden je Feed gemeldet statt verschluckt.
+FEED_URL = "https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-US"
+NEWS_TTL = 300
+MAX_WORKERS = 8
+
+_cache = {}  # symbol -> {"fetched_at", "etag", "modified", "items"}
+_lock = threading.Lock()
+
+
+def _fetch(symbol, limit, ttl, url_template):
+    with _lock:
+        entry = _cache.get(symbol)
+    if entry and time.time() - entry["fetched_at"] < ttl:
+        return entry["items"][:limit], None
+
+    try:
+        feed = upstream.parse_feed(url_template.format(symbol=symbol),
+                                   etag=entry["etag"] if entry else None,
+                                   modified=entry["modified"] if entry else None)
+    except Exception as e:
+        return (entry["items"][:limit] if entry else []), f"Fehler: {e}"
+
+    status = getattr(feed, "status", None)
+    if status == 304 and entry:
+        items = entry["items"]
+    elif status is not None and status >= 400:
+        return (entry["items"][:limit] if entry else []), f"HTTP {status}"
+    elif feed.bozo and not feed.entries:
+        return (entry["items"][:limit] if entry else []), f"Fehler: {feed.get('bozo_exception', 'Feed ungültig')}"
+    else:
+        items = [(e.get("title", ""), e.get("link", "")) for e in feed.entries]
+
+    with _lock:
+        _cache[symbol] = {
+            "fetched_at": time.time(),
+            "etag": feed.get("etag") or (entry["etag"] if entry else None),
+            "modified": feed.get("modified") or (entry["modified"] if entry else None),
+            "items": items,
+        }
+    return items[:limit], None
+
+
+def fetch_news_many(symbols, limit=3, ttl=NEWS_TTL, max_workers=MAX_WORKERS, url_template=FEED_URL):
+    """Lädt die Schlagzeilen mehrerer Symbole parallel.
+
+    Gibt ``(news, errors)`` zurück: ``news`` ordnet jedem Symbol eine Liste
+    ``(titel, link)`` zu (bei Fehlern ggf. den letzten bekannten Stand),
+    ``errors`` enthält die Fehlermeldung je fehlgeschlagenem Feed.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    news, errors = {}, {}
+    if not symbols:
+        return news, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+        results = pool.map(lambda s: _fetch(s, limit, ttl, url_template), symbols)
+        for symbol, (items, error) in zip(symbols, results):
+            news[symbol] = items
+            if error:
+                errors[symbol] = error
+    return news, errors
+
+
+def fetch_news(symbol, limit=3):
+    news, errors = fetch_news_many([symbol], limit=limit)
+    return news[symbol], errors.get(symbol)
+
+
+def fetch_yahoo_news(symbol):
+    return fetch_news(symbol)[0]
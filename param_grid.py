@@ -0,0 +1,252 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest import FEE_BPS, SLIPPAGE_BPS, STAKE, drawdown, counters, hysteresis, summarize
+
+# -------------------------------------
+# Parameter-Suche über die Indikator-Einstellungen
+# -------------------------------------
+# Bewertet alle Kombinationen je Regel-Familie (EMA-Kreuz, RSI-Schwellen,
+# MACD-Kreuz, Bollinger-Bänder) mit der Backtest-Logik aus backtest.py.
+# Die Kursmatrix liegt einmal in Shared Memory, die Prozesse des Pools
+# hängen sich nur an (kein Pickeln der Bars je Aufgabe). Eine Aufgabe ist
+# (Familie, Block von Tickern); innerhalb einer Aufgabe wird jede EMA-Spanne,
+# jedes RSI-Fenster und jedes Bollinger-Mittel/-Sigma nur einmal berechnet
+# und von allen Kombinationen geteilt.
+#
+#   python param_grid.py --db ticker_database.csv --period 5y --offline --ema-fast 5:20 --ema-slow 20:60:5
+
+DEFAULT_GRID = {
+    "ema": {"fast": range(5, 16), "slow": range(15, 55, 5)},
+    "rsi": {"window": [7, 10, 14, 21], "lower": [20, 25, 30, 35], "upper": [65, 70, 75, 80]},
+    "macd": {"fast": [8, 12, 16], "slow": [21, 26, 34], "signal": [5, 9, 12]},
+    "bollinger": {"window": [10, 15, 20, 30], "k": [1.5, 2.0, 2.5, 3.0]},
+}
+MIN_TRADES = 30  # Kombinationen mit weniger Trades kommen nicht in die Rangliste
+METRICS = ["trades", "trefferquote", "avg_win", "avg_loss", "total_pnl", "max_drawdown", "erwartungswert"]
+_COUNTERS = ["trades", "wins", "losses", "win_sum", "loss_sum", "pnl", "max_drawdown"]
+
+
+def combinations(grid):
+    """Alle gültigen Parameter-Kombinationen je Familie als Liste von Dicts."""
+    result = {}
+    for family, axes in grid.items():
+        names = list(axes)
+        combos = [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+        if family in ("ema", "macd"):
+            combos = [c for c in combos if c["fast"] < c["slow"]]
+        if family == "rsi":
+            combos = [c for c in combos if c["lower"] < c["upper"]]
+        result[family] = combos
+    return result
+
+
+class IndicatorCache:
+    """Rechnet jede Zwischenreihe eines Ticker-Blocks nur einmal."""
+
+    def __init__(self, close):
+        self.close = pd.DataFrame(close)
+        self._memo = {}
+
+    def _get(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def ema(self, span, adjust=True):
+        return self._get(("ema", span, adjust), lambda: self.close.ewm(span=span, adjust=adjust).mean().to_numpy())
+
+    def rsi(self, window):
+        def compute():
+            delta = self.close.diff()
+            avg_gain = delta.clip(lower=0).rolling(window=window).mean()
+            avg_loss = (-delta.clip(upper=0)).rolling(window=window).mean()
+            return (100 - (100 / (1 + avg_gain / avg_loss))).to_numpy()
+        return self._get(("rsi", window), compute)
+
+    def macd(self, fast, slow):
+        return self._get(("macd", fast, slow), lambda: self.ema(fast, adjust=False) - self.ema(slow, adjust=False))
+
+    def band(self, window):
+        rolling = self.close.rolling(window=window)
+        return self._get(("band", window), lambda: (rolling.mean().to_numpy(), rolling.std().to_numpy()))
+
+
+def positions(family, params, cache):
+    if family == "ema":
+        return (cache.ema(params["fast"]) > cache.ema(params["slow"])).astype(float)
+    if family == "rsi":
+        value = cache.rsi(params["window"])
+        return hysteresis(value < params["lower"], value > params["upper"])
+    if family == "macd":
+        macd = cache.macd(params["fast"], params["slow"])
+        signal = pd.DataFrame(macd).ewm(span=params["signal"], adjust=False).mean().to_numpy()
+        return (macd > signal).astype(float)
+    if family == "bollinger":
+        mean, std = cache.band(params["window"])
+        close = cache.close.to_numpy()
+        return hysteresis(close < mean - params["k"] * std, close > mean + params["k"] * std)
+    raise ValueError(f"Unbekannte Familie: {family}")
+
+
+# --- Prozesspool: Kursmatrix aus Shared Memory ---
+
+_shared = {}
+
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)
+    _shared["shm"] = shm  # Referenz halten, sonst wird der Puffer freigegeben
+    _shared["close"] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def shared_close():
+    """Kursmatrix in einem Prozess von ``shared_pool``."""
+    return _shared["close"]
+
+
+@contextmanager
+def shared_pool(values, workers):
+    """Prozesspool, dessen Prozesse die float64-Matrix ``values`` über ``shared_close()`` sehen."""
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shm.name, values.shape)) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _run_task(family, combos, start, stop, costs):
+    close = shared_close()[:, start:stop]
+    cache = IndicatorCache(close)
+    results = []
+    for params in combos:
+        per_ticker, portfolio = counters(close, positions(family, params, cache), **costs)
+        results.append((np.vstack([per_ticker[c] for c in _COUNTERS]), portfolio))
+    return family, start, results
+
+
+def grid_search(close, grid=DEFAULT_GRID, workers=None, block=None, per_ticker=False, min_trades=MIN_TRADES,
+                stake=STAKE, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS):
+    """Bewertet alle Kombinationen; gibt ``(rangliste, je_ticker)`` zurück.
+
+    ``close`` ist die Kursmatrix in EUR (Bars x Ticker). Die Rangliste hat
+    eine Zeile je Familie und Kombination mit den Parametern als Spalten
+    (heatmap-fähig, siehe ``heatmap``); ``je_ticker`` nur mit ``per_ticker=True``.
+    Kombinationen mit weniger als ``min_trades`` Trades (über alle Ticker)
+    fehlen in beiden – ihr Erwartungswert ist Zufall.
+    """
+    values = np.ascontiguousarray(close.to_numpy(dtype=np.float64))
+    tickers = list(close.columns)
+    workers = workers or os.cpu_count() or 1
+    block = block or max(1, -(-len(tickers) // (2 * workers)))
+    combos = combinations(grid)
+    costs = {"stake": stake, "fee_bps": fee_bps, "slippage_bps": slippage_bps}
+
+    totals = {family: np.zeros((len(c), len(_COUNTERS), len(tickers))) for family, c in combos.items()}
+    portfolio = {family: np.zeros((len(c), len(values))) for family, c in combos.items()}
+
+    with shared_pool(values, workers) as pool:
+        jobs = [pool.submit(_run_task, family, family_combos, start, min(start + block, len(tickers)), costs)
+                for family, family_combos in combos.items() if family_combos
+                for start in range(0, len(tickers), block)]
+        for job in jobs:
+            family, start, results = job.result()
+            for i, (stats, bar_pnl) in enumerate(results):
+                totals[family][i, :, start:start + stats.shape[1]] = stats
+                portfolio[family][i] += bar_pnl
+
+    rows, ticker_rows = [], []
+    for family, family_combos in combos.items():
+        for i, params in enumerate(family_combos):
+            stats = dict(zip(_COUNTERS, totals[family][i].sum(axis=1)))
+            if stats["trades"] < min_trades:
+                continue
+            stats["max_drawdown"] = float(drawdown(np.cumsum(portfolio[family][i])[:, None])[0])
+            rows.append({"Familie": family, **params, **summarize(stats)})
+            if per_ticker:
+                for j, ticker in enumerate(tickers):
+                    ticker_stats = dict(zip(_COUNTERS, totals[family][i][:, j]))
+                    ticker_rows.append({"Familie": family, **params, "Ticker": ticker, **summarize(ticker_stats)})
+    # Spalten: Familie, alle Parameter-Achsen, Kennzahlen
+    axes = list(dict.fromkeys(axis for family in combos for axis in grid[family]))
+    ranking = pd.DataFrame(rows, columns=["Familie", *axes, *METRICS])
+    ranking = ranking.sort_values("erwartungswert", ascending=False, ignore_index=True)
+    return ranking, pd.DataFrame(ticker_rows, columns=["Familie", *axes, "Ticker", *METRICS])
+
+
+def heatmap(ranking, family, x, y, value="total_pnl"):
+    """Pivot einer Familie für eine Heatmap (z. B. ``heatmap(r, "ema", "fast", "slow")``)."""
+    return ranking[ranking["Familie"] == family].pivot_table(index=y, columns=x, values=value, aggfunc="max")
+
+
+def parse_axis(text, cast=float):
+    """``"5:20"`` (Schritt 1), ``"20:60:5"`` (Ende inklusive) oder ``"1.5,2,2.5"``."""
+    if ":" in text:
+        start, stop, *step = (float(v) for v in text.split(":"))
+        step = step[0] if step else 1
+        return [cast(v) for v in np.arange(start, stop + step / 2, step)]
+    return [cast(v) for v in text.split(",")]
+
+
+def main(argv=None):
+    from bar_store import get_bars_many
+    from fx import eur_price_matrix
+    from screener_cli import load_universe
+
+    parser = argparse.ArgumentParser(description="Parameter-Suche für EMA-, RSI-, MACD- und Bollinger-Regeln.")
+    parser.add_argument("--db", default="ticker_database.csv", help="Ticker-CSV mit Spalte YahooTicker")
+    parser.add_argument("--period", default="5y")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--offline", action="store_true", help="Nur lokal gespeicherte Bars verwenden")
+    parser.add_argument("--families", default=",".join(DEFAULT_GRID), help="Komma-Liste der Familien")
+    for family, axes in DEFAULT_GRID.items():
+        for axis, values in axes.items():
+            parser.add_argument(f"--{family}-{axis}", help=f"Standard: {','.join(str(v) for v in values)}")
+    parser.add_argument("--min-trades", type=int, default=MIN_TRADES,
+                        help="Mindestzahl Trades für die Rangliste (0 = alle)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--fee-bps", type=float, default=FEE_BPS)
+    parser.add_argument("--slippage-bps", type=float, default=SLIPPAGE_BPS)
+    parser.add_argument("--out", default="param_grid.csv", help="Rangliste (eine Zeile je Kombination)")
+    parser.add_argument("--per-ticker-out", help="Optional: Ergebnis je Kombination und Ticker")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for family in args.families.split(","):
+        grid[family] = {}
+        for axis, values in DEFAULT_GRID[family].items():
+            text = getattr(args, f"{family}_{axis}")
+            grid[family][axis] = parse_axis(text, float if axis == "k" else int) if text else list(values)
+
+    started = time.time()
+    symbols = load_universe(args.db)["YahooTicker"].tolist()
+    frames, errors = get_bars_many(symbols, period=args.period, interval=args.interval, offline=args.offline)
+    close, fx_matrix = eur_price_matrix(frames, offline=args.offline, by_date=True)
+    loaded = time.time()
+    ranking, per_ticker = grid_search(close * fx_matrix, grid, workers=args.workers,
+                                      per_ticker=bool(args.per_ticker_out), min_trades=args.min_trades,
+                                      fee_bps=args.fee_bps, slippage_bps=args.slippage_bps)
+    ranking.to_csv(args.out, index=False)
+    if args.per_ticker_out:
+        per_ticker.to_csv(args.per_ticker_out, index=False)
+
+    print(ranking.head(20).to_string(index=False))
+    print(f"{len(ranking)} Kombinationen (ab {args.min_trades} Trades) x {len(frames)} Ticker ({len(errors)} ohne Daten), {len(close)} Bars; "
+          f"Laden {loaded - started:.1f}s, Suche {time.time() - loaded:.1f}s -> {args.out}")
+    return 0 if frames else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import datetime
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+import upstream
+from bar_store import get_bars
+from news_feed import fetch_news
+
+# -------------------------------------
+# Gemeinsamer Ergebnis-Cache für alle Streamlit-Sessions
+# -------------------------------------
+# Ein Cache pro Prozess (also für alle Sessions) für Kurs- und News-Ergebnisse.
+# Jeder Eintrag hat eine TTL passend zum Intervall; ist er abgelaufen, wird
+# sofort der alte Stand geliefert und im Hintergrund neu geladen
+# (stale-while-revalidate). Über dem Speicherbudget fliegen die am längsten
+# nicht genutzten Einträge raus (LRU). Zähler: stats().
+BUDGET_BYTES = int(os.environ.get("STOCKINATOR_CACHE_MB", "256")) * 2**20
+MAX_STALE = 24 * 3600  # älter als TTL + MAX_STALE: synchron neu laden
+
+BAR_TTL = {"1m": 30, "2m": 60, "5m": 120, "15m": 300, "30m": 600, "60m": 900, "90m": 900, "1h": 900}
+NEWS_TTL = 300
+MARKET_CLOSE = (ZoneInfo("America/New_York"), datetime.time(16, 0))
+
+
+def seconds_to_next_close(now=None):
+    """Sekunden bis zum nächsten US-Börsenschluss (Wochenenden übersprungen)."""
+    tz, close_time = MARKET_CLOSE
+    now = now or datetime.datetime.now(tz)
+    close = datetime.datetime.combine(now.date(), close_time, tzinfo=tz)
+    if now >= close:
+        close += datetime.timedelta(days=1)
+    while close.weekday() >= 5:
+        close += datetime.timedelta(days=1)
+    return (close - now).total_seconds()
+
+
+def bar_ttl(interval):
+    if interval in BAR_TTL:
+        return BAR_TTL[interval]
+    # Tages- und längere Bars ändern sich erst mit dem nächsten Schluss
+    return max(seconds_to_next_close(), 60)
+
+
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _own_copy(value):
+    # Seiten hängen Spalten an die Kursdaten an, der Cache-Eintrag bleibt unverändert
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class ResultCache:
+    def __init__(self, budget_bytes=BUDGET_BYTES, max_stale=MAX_STALE):
+        self.budget_bytes = budget_bytes
+        self.max_stale = max_stale
+        self._entries = OrderedDict()  # Schlüssel -> (Wert, Bytes, gültig bis)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.counters = dict.fromkeys(["treffer", "veraltet", "fehlend", "aktualisiert",
+                                       "aktualisierung_fehler", "verdraengt"], 0)
+
+    def get(self, key, loader, ttl):
+        """Wert zu ``key``; lädt über ``loader()`` nach, wenn er fehlt oder abgelaufen ist."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                value, _, expires = entry
+                if now < expires:
+                    self.counters["treffer"] += 1
+                    return _own_copy(value)
+                if now - expires < self.max_stale:
+                    self.counters["veraltet"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(target=self._refresh, args=(key, loader, ttl), daemon=True).start()
+                    return _own_copy(value)
+            self.counters["fehlend"] += 1
+        value = loader()
+        self._store(key, value, ttl)
+        return _own_copy(value)
+
+    def _refresh(self, key, loader, ttl):
+        try:
+            self._store(key, loader(), ttl)
+            with self._lock:
+                self.counters["aktualisiert"] += 1
+        except Exception:
+            # Alter Stand bleibt stehen, der nächste Zugriff versucht es erneut
+            with self._lock:
+                self.counters["aktualisierung_fehler"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, value, ttl):
+        size = _sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            if size > self.budget_bytes:
+                return
+            self._entries[key] = (value, size, time.time() + ttl)
+            self.bytes += size
+            while self.bytes > self.budget_bytes:
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.counters["verdraengt"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {**self.counters, "eintraege": len(self._entries), "mb": round(self.bytes / 2**20, 2)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+cache = ResultCache()
+
+
+def cached_bars(symbol, period="1mo", interval="1d"):
+    """Bars über den lokalen Kursspeicher (bar_store), zwischengespeichert mit Intervall-TTL."""
+    return cache.get(("bars", symbol, period, interval),
+                     lambda: get_bars(symbol, period=period, interval=interval), bar_ttl(interval))
+
+
+def cached_download(symbol, period="1mo", interval="1d"):
+    """Direkter Yahoo-Download (ohne Kursspeicher), zwischengespeichert mit Intervall-TTL."""
+    return cache.get(("download", symbol, period, interval),
+                     lambda: upstream.download(symbol, period=period, interval=interval), bar_ttl(interval))
+
+
+class _NewsError(Exception):
+    def __init__(self, items, error):
+        super().__init__(error)
+        self.items = items
+
+
+def cached_news(symbol, limit=3):
+    """Schlagzeilen als ``(items, error)``; Fehlerantworten werden nicht gespeichert."""
+    def load():
+        items, error = fetch_news(symbol, limit=limit)
+        if error:
+            raise _NewsError(items, error)
+        return items
+
+    try:
+        return cache.get(("news", symbol, limit), load, NEWS_TTL), None
+    except _NewsError as e:
+        return e.items, str(e)
+
+
+def stats():
+    return cache.stats()
@@ -0,0 +1,236 @@
+import ast
+import operator
+import os
+import sqlite3
+import time
+from functools import lru_cache, reduce
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------
+# Screener-Abfragen über die Indikator-Tabelle
+# -------------------------------------
+# Filter wie ``rsi < 30 and ema9 > ema20 and volatility < 2 and perf_1w > 0``
+# werden einmal mit ``ast`` geparst, gegen eine Positivliste geprüft und in
+# verschachtelte Funktionen übersetzt, die je Knoten eine NumPy-Operation auf
+# den ganzen Spalten von ``screen_indicators`` ausführen. Ergebnis ist eine
+# Bool-Maske je Ticker; fehlende Werte (NaN) erfüllen keinen Vergleich, auch
+# nicht unter ``not``. Typen werden beim Kompilieren geprüft: Textfelder nur
+# mit ==, != und ``in`` gegen Texte, Zahlenfelder nur gegen Zahlen.
+#
+# Erlaubt sind Feldnamen, Zahlen, Texte (z. B. ``trend == "Bullish"``),
+# + - * / und Klammern, Vergleiche (auch verkettet: ``30 < rsi < 70``),
+# ``in`` mit einer Liste von Texten/Zahlen sowie and/or/not.
+#
+# Gespeicherte Screens (Name -> Abfrage) liegen in SQLite und werden von den
+# Seiten und screener_cli.py bei jedem Lauf auf die frischen Kennzahlen
+# angewandt.
+DB_PATH = os.environ.get("STOCKINATOR_SCREENS_DB", "screens.sqlite")
+FIELDS = ["price_eur", "rsi", "rsi_state", "macd", "macd_signal", "macd_trend", "bollinger_upper",
+          "bollinger_lower", "ema9", "ema20", "trend", "perf_1d", "perf_1w", "perf_1m", "volatility"]
+
+TEXT_FIELDS = {"rsi_state", "macd_trend", "trend"}
+
+_COMPARE = {ast.Lt: operator.lt, ast.LtE: operator.le, ast.Gt: operator.gt, ast.GtE: operator.ge,
+            ast.Eq: operator.eq, ast.NotEq: operator.ne}
+_ARITHMETIC = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv}
+
+
+def _is_condition(node):
+    if isinstance(node, ast.BoolOp):
+        return all(_is_condition(value) for value in node.values)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return _is_condition(node.operand)
+    return isinstance(node, ast.Compare)
+
+
+def _condition(node, fields):
+    if not _is_condition(node):
+        raise ValueError(f"Keine Bedingung (Vergleich fehlt?): {ast.unparse(node)}")
+    return _compile(node, fields)[0]
+
+
+def _valid(values):
+    # Gültige Werte: bei Zahlen nicht NaN, Texte sind immer gesetzt
+    return pd.notna(values) if isinstance(values, np.ndarray) else not pd.isna(values)
+
+
+def _compile(node, fields):
+    """Übersetzt einen AST-Knoten in ``(f(spalten) -> Array/Skalar, Typ)`` mit Typ "zahl", "text" oder "bool"."""
+    if isinstance(node, ast.BoolOp):
+        parts = [_condition(value, fields) for value in node.values]
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return lambda cols: reduce(combine, [_mask(part(cols)) for part in parts]), "bool"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner_fields = set()
+        inner = _condition(node.operand, inner_fields)
+        fields |= inner_fields
+        # "not rsi < 30" soll Ticker ohne RSI nicht einschließen
+        numeric = [field for field in inner_fields if field not in TEXT_FIELDS]
+        return lambda cols: reduce(np.logical_and, [_valid(cols[f]) for f in numeric], ~_mask(inner(cols))), "bool"
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        inner = _number(node.operand, fields)
+        sign = -1 if isinstance(node.op, ast.USub) else 1
+        return lambda cols: sign * inner(cols), "zahl"
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        left, right, op = _number(node.left, fields), _number(node.right, fields), _ARITHMETIC[type(node.op)]
+        return lambda cols: op(left(cols), right(cols)), "zahl"
+    if isinstance(node, ast.Compare):
+        return _compare(node, fields), "bool"
+    if isinstance(node, ast.Name):
+        if node.id not in FIELDS:
+            raise ValueError(f"Unbekanntes Feld: {node.id} (erlaubt: {', '.join(FIELDS)})")
+        fields.add(node.id)
+        return lambda cols: cols[node.id], "text" if node.id in TEXT_FIELDS else "zahl"
+    value = _literal(node)
+    return lambda cols: value, "text" if isinstance(value, str) else "zahl"
+
+
+def _number(node, fields):
+    func, kind = _compile(node, fields)
+    if kind != "zahl":
+        raise ValueError(f"Rechnen nur mit Zahlen: {ast.unparse(node)}")
+    return func
+
+
+def _compare(node, fields):
+    left, left_kind = _compile(node.left, fields)
+    steps = []
+    for op, comparator in zip(node.ops, node.comparators):
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(comparator, (ast.List, ast.Tuple, ast.Set)):
+                raise ValueError(f"Nach in/not in wird eine Liste erwartet: {ast.unparse(node)}")
+            values = [_literal(element) for element in comparator.elts]
+            if any(("text" if isinstance(v, str) else "zahl") != left_kind for v in values):
+                raise ValueError(f"Liste passt nicht zum Typ von {ast.unparse(node.left)}: {ast.unparse(node)}")
+            negate = isinstance(op, ast.NotIn)
+            right, right_kind = (lambda cols: None), left_kind
+            compare = lambda a, b, values=values, negate=negate: np.isin(a, values) != negate
+        elif type(op) in _COMPARE:
+            right, right_kind = _compile(comparator, fields)
+            if "bool" in (left_kind, right_kind):
+                raise ValueError(f"Vergleich von Bedingungen nicht erlaubt: {ast.unparse(node)}")
+            if left_kind != right_kind:
+                raise ValueError(f"Text und Zahl nicht vergleichbar: {ast.unparse(node)}")
+            if left_kind == "text" and not isinstance(op, (ast.Eq, ast.NotEq)):
+                raise ValueError(f"Textfelder nur mit ==, != oder in vergleichen: {ast.unparse(node)}")
+            compare = _COMPARE[type(op)]
+        else:
+            raise ValueError(f"Vergleich nicht erlaubt: {ast.unparse(node)}")
+        steps.append((compare, left, right, left_kind == "zahl"))
+        left, left_kind = right, right_kind
+
+    def evaluate(cols):
+        masks = []
+        for compare, left, right, numeric in steps:
+            a, b = left(cols), right(cols)
+            mask = _mask(compare(a, b))
+            if numeric:  # NaN erfüllt auch != und not in nicht
+                mask = mask & _valid(a) & (_valid(b) if b is not None else True)
+            masks.append(mask)
+        return reduce(np.logical_and, masks)
+    return evaluate
+
+
+def _literal(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) \
+            and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) and isinstance(node.operand, ast.Constant):
+        return -_literal(node.operand)
+    raise ValueError(f"Ausdruck nicht erlaubt: {ast.unparse(node)}")
+
+
+def _mask(value):
+    mask = np.asarray(value)
+    if mask.dtype != bool:
+        raise ValueError("Teilausdruck ist keine Bedingung (Vergleich fehlt?)")
+    return mask
+
+
+class Query:
+    """Kompilierte Abfrage; ``mask(tabelle)`` liefert ein Bool-Array je Zeile."""
+
+    def __init__(self, text):
+        self.text = text.strip()
+        try:
+            tree = ast.parse(self.text, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Syntaxfehler in Abfrage: {e.msg}") from None
+        self.fields = set()
+        self._func = _condition(tree.body, self.fields)
+
+    def mask(self, table):
+        columns = {field: table[field].to_numpy() for field in self.fields}
+        mask = np.broadcast_to(_mask(self._func(columns)), len(table))
+        return np.asarray(mask, dtype=bool)
+
+    def filter(self, table):
+        return table[self.mask(table)]
+
+
+@lru_cache(maxsize=256)
+def compile_query(text):
+    """Kompiliert ``text`` einmal (gecacht); wirft ``ValueError`` bei unzulässigen Ausdrücken."""
+    return Query(text)
+
+
+def apply(table, text):
+    """Zeilen von ``table`` (``screen_indicators``-Ergebnis), die die Abfrage erfüllen."""
+    return compile_query(text).filter(table)
+
+
+# -------------------------------------
+# Gespeicherte Screens
+# -------------------------------------
+def _connect():
+    con = sqlite3.connect(DB_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE IF NOT EXISTS screens (name TEXT PRIMARY KEY, query TEXT, saved_at REAL)")
+    return con
+
+
+def save_screen(name, text):
+    """Prüft und speichert eine Abfrage unter ``name`` (überschreibt gleichnamige)."""
+    compile_query(text)
+    con = _connect()
+    try:
+        with con:
+            con.execute("INSERT OR REPLACE INTO screens VALUES (?, ?, ?)", (name.strip(), text.strip(), time.time()))
+    finally:
+        con.close()
+
+
+def delete_screen(name):
+    con = _connect()
+    try:
+        with con:
+            con.execute("DELETE FROM screens WHERE name=?", (name,))
+    finally:
+        con.close()
+
+
+def saved_screens():
+    """Gespeicherte Screens als Dict ``name -> abfrage`` (nach Name sortiert)."""
+    con = _connect()
+    try:
+        return dict(con.execute("SELECT name, query FROM screens ORDER BY name").fetchall())
+    finally:
+        con.close()
+
+
+def run_saved(table, screens=None):
+    """Wendet alle gespeicherten Screens an: DataFrame ``Ticker x Screen`` mit Bool-Werten.
+
+    Ungültig gewordene Abfragen (z. B. nach Umbenennung eines Feldes) ergeben
+    eine Spalte mit lauter ``False`` statt eines Fehlers für alle Screens.
+    """
+    screens = saved_screens() if screens is None else screens
+    hits = {}
+    for name, text in screens.items():
+        try:
+            hits[name] = compile_query(text).mask(table)
+        except (ValueError, KeyError, TypeError):
+            hits[name] = np.zeros(len(table), dtype=bool)
+    return pd.DataFrame(hits, index=table.index, dtype=bool)
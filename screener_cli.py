@@ -0,0 +1,110 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+import upstream
+from bar_store import get_bars_many
+from fx import eur_price_matrix
+from indicators import describe, screen_indicators
+from screen_query import apply, compile_query, run_saved
+
+# -------------------------------------
+# Headless-Screener für das ganze Ticker-Universum
+# -------------------------------------
+# Lädt eine Ticker-CSV, holt die Bars aller YahooTicker blockweise über den
+# lokalen Kursspeicher und berechnet Trend/RSI/MACD/Bollinger wie die Apps.
+# Das Laden der Blöcke läuft in Threads, die Indikatorberechnung in einem
+# Prozesspool – während ein Block gerechnet wird, lädt schon der nächste.
+# Gespeicherte Screens (screen_query.py) kommen als Spalte screen_<Name>
+# dazu, ``--query`` behält nur die passenden Ticker.
+#
+# Beispiel (cron, nächtlicher Scan):
+#   python screener_cli.py --db ticker_database.csv --out scans/screen.csv
+#   python screener_cli.py --query "rsi < 30 and ema9 > ema20 and perf_1w > 0"
+
+
+def load_universe(path):
+    df = pd.read_csv(path)
+    df = df.dropna(subset=["YahooTicker"])
+    df["YahooTicker"] = df["YahooTicker"].astype(str).str.strip()
+    return df.drop_duplicates(subset=["YahooTicker"]).reset_index(drop=True)
+
+
+def _screen_chunk(close, fx_matrix):
+    screen = screen_indicators(close, fx=fx_matrix)
+    screen["analyse"] = [describe(row) for _, row in screen.iterrows()]
+    return screen
+
+
+def run_screen(symbols, period="2mo", interval="1d", chunk_size=200, workers=None, io_workers=2, offline=False):
+    """Berechnet die Kennzahlen für alle Symbole; gibt ``(screen, errors)`` zurück."""
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+    screens, errors = [], {}
+    with ThreadPoolExecutor(max_workers=io_workers) as io_pool, ProcessPoolExecutor(max_workers=workers) as cpu_pool:
+        fetches = [io_pool.submit(get_bars_many, chunk, period, interval, offline) for chunk in chunks]
+        jobs = []
+        for fetch in as_completed(fetches):
+            frames, chunk_errors = fetch.result()
+            errors.update(chunk_errors)
+            if frames:
+                # Wechselkurse im Hauptprozess ausrichten (I/O), nur die Matrizen gehen an den Pool
+                close, fx_matrix = eur_price_matrix(frames, offline=offline)
+                jobs.append(cpu_pool.submit(_screen_chunk, close, fx_matrix))
+        for job in jobs:
+            screens.append(job.result())
+    screen = pd.concat(screens) if screens else pd.DataFrame()
+    return screen, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screent alle Ticker einer Ticker-CSV (Trend, RSI, MACD, Bollinger).")
+    parser.add_argument("--db", default="ticker_database.csv", help="Ticker-CSV mit Spalte YahooTicker")
+    parser.add_argument("--out", default="screen_result.csv", help="Ergebnisdatei (.csv oder .parquet)")
+    parser.add_argument("--period", default="2mo")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Ticker je Download-/Rechenblock")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Prozesse für die Indikatorberechnung")
+    parser.add_argument("--offline", action="store_true", help="Nur lokal gespeicherte Bars verwenden")
+    parser.add_argument("--query", help='Filter, z. B. "rsi < 30 and ema9 > ema20"')
+    args = parser.parse_args(argv)
+    if args.query:
+        try:
+            compile_query(args.query)
+        except ValueError as e:
+            parser.error(str(e))
+
+    started = time.time()
+    universe = load_universe(args.db)
+    screen, errors = run_screen(universe["YahooTicker"].tolist(), period=args.period, interval=args.interval,
+                                chunk_size=args.chunk_size, workers=args.workers, offline=args.offline)
+    analysed = len(screen)
+    if analysed:
+        screen = screen.join(run_saved(screen).add_prefix("screen_"))
+        if args.query:
+            screen = apply(screen, args.query)
+
+    result = universe.set_index("YahooTicker").join(screen, how="inner" if args.query else "left")
+    result["fehler"] = pd.Series(errors, dtype=object)
+    result.index.name = "YahooTicker"
+    result = result.reset_index()
+
+    if args.out.endswith(".parquet"):
+        result.to_parquet(args.out, index=False)
+    else:
+        result.to_csv(args.out, index=False)
+
+    matched = f", {len(screen)} Treffer" if args.query else ""
+    print(f"{len(universe)} Ticker, {analysed} analysiert{matched}, {len(errors)} ohne Daten "
+          f"in {time.time() - started:.1f}s -> {args.out}")
+    requests = upstream.stats()
+    if not requests.empty:
+        print(requests.to_string())
+    return 0 if analysed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
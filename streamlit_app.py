@@ -1,96 +1,21 @@
 import streamlit as st
-import pandas as pd
-import yfinance as yf
-import feedparser
+from ticker_search import load_index
+import result_cache
+from indicators import calculate_indicators
+from fx import eur_factor
 import numpy as np
 
 st.set_page_config(page_title="Daytrader Pro", layout="wide")
 st.title("Daytrader Pro – Technische Analyse + News")
 
-@st.cache_data
-def load_ticker_db():
-    df = pd.read_csv("ticker_database.csv")
-    df.dropna(subset=["YahooTicker"], inplace=True)
-    return df
+@st.cache_resource
+def load_ticker_index():
+    return load_index()
 
-ticker_db = load_ticker_db()
+ticker_index = load_ticker_index()
 
 def find_ticker_matches(q):
-    q = q.strip().lower()
-    return ticker_db[
-        ticker_db["Name"].astype(str).str.lower().str.contains(q) |
-        ticker_db["Synonyme"].astype(str).str.lower().str.contains(q) |
-        ticker_db["YahooTicker"].astype(str).str.lower().str.contains(q)
-    ][["Name", "YahooTicker"]]
-
-def last_valid(series):
-    try:
-        return float(series.dropna().iloc[-1])
-    except:
-        return None
-
-def fetch_yahoo_news(symbol):
-    try:
-        url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-EN"
-        feed = feedparser.parse(url)
-        return [(e.title, e.link) for e in feed.entries[:3]]
-    except:
-        return []
-
-def calculate_indicators(df):
-    close = df["Close"]
-    indicators = {}
-    close_eur = close * 0.92
-    indicators["price_eur"] = last_valid(close_eur)
-
-    delta = close_eur.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=14).mean()
-    avg_loss = loss.rolling(window=14).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    rsi_val = last_valid(rsi)
-    indicators["rsi"] = rsi_val
-    indicators["rsi_state"] = "neutral"
-    if rsi_val:
-        if rsi_val > 70:
-            indicators["rsi_state"] = "überkauft"
-        elif rsi_val < 30:
-            indicators["rsi_state"] = "überverkauft"
-
-    ema12 = close.ewm(span=12, adjust=False).mean()
-    ema26 = close.ewm(span=26, adjust=False).mean()
-    macd = ema12 - ema26
-    signal = macd.ewm(span=9, adjust=False).mean()
-    indicators["macd"] = last_valid(macd)
-    indicators["macd_signal"] = last_valid(signal)
-    indicators["macd_trend"] = "neutral"
-    if indicators["macd"] and indicators["macd_signal"]:
-        if indicators["macd"] > indicators["macd_signal"]:
-            indicators["macd_trend"] = "bullish crossover"
-        elif indicators["macd"] < indicators["macd_signal"]:
-            indicators["macd_trend"] = "bearish crossover"
-
-    sma20 = close.rolling(window=20).mean()
-    std = close.rolling(window=20).std()
-    indicators["bollinger_upper"] = last_valid(sma20 + 2 * std)
-    indicators["bollinger_lower"] = last_valid(sma20 - 2 * std)
-
-    ema9 = close_eur.ewm(span=9).mean()
-    ema20 = close_eur.ewm(span=20).mean()
-    if last_valid(ema9) and last_valid(ema20):
-        indicators["trend"] = "Bullish" if last_valid(ema9) > last_valid(ema20) else "Bearish"
-    else:
-        indicators["trend"] = "n/v"
-
-    # Neu: Performance und Volatilität
-    indicators["perf_1d"] = (close_eur.pct_change(periods=1) * 100).iloc[-1]
-    indicators["perf_1w"] = (close_eur.pct_change(periods=5) * 100).iloc[-1]
-    indicators["perf_1m"] = (close_eur.pct_change(periods=21) * 100).iloc[-1]
-    indicators["volatility"] = close_eur.pct_change().rolling(window=20).std().iloc[-1] * 100
-
-    return indicators
+    return ticker_index.search(q)[["Name", "YahooTicker"]]
 
 st.markdown("### Aktie eingeben (Name, WKN, ISIN, Ticker oder Synonym)")
 query = st.text_input("Beispiel: Rhein, Airbus, DAI", "SAP")
@@ -110,11 +35,11 @@ else:
 if selected_symbol:
     st.markdown(f"### Analyse für: `{selected_symbol}`")
     try:
-        df = yf.download(selected_symbol, period="2mo", interval="1d", progress=False)
+        df = result_cache.cached_bars(selected_symbol, period="2mo", interval="1d")
         if df.empty:
             st.error("Keine Kursdaten gefunden.")
         else:
-            ind = calculate_indicators(df)
+            ind = calculate_indicators(df, fx=eur_factor(df.index, selected_symbol))
 
             def fmt(val, digits=2):
                 if isinstance(val, (float, int, np.floating)):
@@ -136,7 +61,9 @@ if selected_symbol:
             col8.metric("Bollinger unten", fmt(ind.get("bollinger_lower")))
 
             st.markdown("### Aktuelle Schlagzeilen (Yahoo Finance)")
-            news = fetch_yahoo_news(selected_symbol)
+            news, news_error = result_cache.cached_news(selected_symbol)
+            if news_error:
+                st.warning(f"Schlagzeilen konnten nicht geladen werden: {news_error}")
             if news:
                 for title, link in news:
                     st.markdown(f"- [{title}]({link})")
@@ -144,3 +71,6 @@ if selected_symbol:
                 st.info("Keine aktuellen Schlagzeilen gefunden.")
     except Exception as e:
         st.error(f"Fehler bei der Analyse: {e}")
+
+st.sidebar.markdown("**Cache**")
+st.sidebar.json(result_cache.stats())
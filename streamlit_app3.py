@@ -1,26 +1,23 @@
 
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import feedparser
+import result_cache
+from fx import to_eur
+from ticker_search import load_index
+from news_feed import fetch_yahoo_news
 import numpy as np
 
 st.set_page_config(page_title="Einfaches Daytrading Tool", layout="wide")
 st.title("Einfaches Daytrading Terminal – Stabil & Klar")
 
-@st.cache_data
-def load_ticker_db():
-    return pd.read_csv("ticker_database.csv")
+@st.cache_resource
+def load_ticker_index():
+    return load_index()
 
-ticker_db = load_ticker_db()
+ticker_index = load_ticker_index()
 
 def find_ticker_matches(q):
-    q = q.strip().lower()
-    return ticker_db[
-        ticker_db["Name"].str.lower().str.contains(q) |
-        ticker_db["Synonyme"].str.lower().str.contains(q) |
-        ticker_db["YahooTicker"].str.lower().str.contains(q)
-    ][["Name", "Synonyme", "YahooTicker"]]
+    return ticker_index.search(q)[["Name", "Synonyme", "YahooTicker"]]
 
 def get_last_valid(series):
     try:
@@ -28,14 +25,6 @@ def get_last_valid(series):
     except:
         return None
 
-def fetch_yahoo_news(symbol):
-    try:
-        feed_url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-US"
-        feed = feedparser.parse(feed_url)
-        return [(entry.title, entry.link) for entry in feed.entries[:3]]
-    except:
-        return []
-
 st.markdown("### Aktie eingeben")
 query = st.text_input("Beispiel: boeing, deutsche, renk", "boeing")
 
@@ -54,11 +43,11 @@ else:
 if selected_symbol:
     st.markdown(f"### Analyse für `{selected_symbol}`")
     try:
-        df = yf.download(selected_symbol, period="2mo", interval="1d", progress=False)
+        df = result_cache.cached_download(selected_symbol, period="2mo", interval="1d")
         if df.empty:
             st.error("Keine Kursdaten gefunden.")
         else:
-            df['Close_EUR'] = df['Close'] * 0.92
+            df['Close_EUR'] = to_eur(df, selected_symbol)
             price = get_last_valid(df['Close_EUR'])
             trend = "unbekannt"
             rsi = None
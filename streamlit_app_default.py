@@ -1,56 +1,79 @@
 import streamlit as st
-import yfinance as yf
-import pandas as pd
+
+from live_feed import LiveWatch
 
 st.set_page_config(page_title="Daytrading Analyse Tool", layout="centered")
 
 st.title("Daytrading Live-Analyse")
 
-# Eingabefeld für den Ticker
-ticker = st.text_input("Gib ein Ticker-Symbol ein (z. B. AAPL, MSFT, TSLA)", value="AAPL")
+# Eingabefeld für den Ticker (mehrere mit Komma getrennt)
+tickers = st.text_input("Gib ein Ticker-Symbol ein (z. B. AAPL, MSFT, TSLA)", value="AAPL")
+live = st.checkbox("Live-Modus (automatisch aktualisieren)")
+refresh = st.number_input("Aktualisierung alle (Sekunden)", min_value=5, max_value=600, value=30, step=5)
+
+symbols = [t.strip().upper() for t in tickers.split(",") if t.strip()]
 
-if ticker:
+# -------------------------------------
+# Geladene Bars bleiben in der Session, danach wird nur nachgeladen
+# -------------------------------------
+watch = st.session_state.get("live_watch")
+loaded = False
+if symbols and (watch is None or watch.symbols != symbols):
     try:
-        # Daten abrufen
-        stock = yf.Ticker(ticker)
-        data = stock.history(period="5d", interval="5m")
-        latest = data.iloc[-1]
-
-        # Berechnungen für EMA und RSI
-        close_prices = data['Close']
-        ema9 = close_prices.ewm(span=9).mean().iloc[-1]
-
-        delta = close_prices.diff()
-        up = delta.clip(lower=0)
-        down = -delta.clip(upper=0)
-        roll_up = up.rolling(14).mean()
-        roll_down = down.rolling(14).mean()
-        rs = roll_up / roll_down
-        rsi = 100.0 - (100.0 / (1.0 + rs)).iloc[-1]
-
-        # VWAP
-        typical_price = (data['High'] + data['Low'] + data['Close']) / 3
-        vwap = (typical_price * data['Volume']).cumsum() / data['Volume'].cumsum()
-        vwap_latest = vwap.iloc[-1]
+        # Anzeige wie bisher in USD, daher ohne Umrechnung
+        watch = LiveWatch(symbols, interval="5m", period="5d", fx=1.0).load()
+        loaded = True
+    except Exception as e:
+        st.error(f"Fehler bei der Datenabfrage oder Analyse: {e}")
+        watch = None
+    st.session_state["live_watch"] = watch
+
+
+def show_analysis(watch, poll):
+    if poll:
+        try:
+            watch.poll()
+        except Exception as e:
+            st.warning(f"Aktualisierung fehlgeschlagen, zeige letzten Stand: {e}")
+
+    for ticker in watch.symbols:
+        if ticker not in watch.series:
+            st.error(f"Fehler bei der Datenabfrage für {ticker}: {watch.errors.get(ticker, 'Keine Kursdaten')}")
+            continue
+        indicators = watch.snapshot(ticker)
+        rsi = indicators["rsi"]
 
         # Ausgabe
-        st.subheader(f"Analyse für {ticker.upper()}")
-        st.metric("Aktueller Kurs", f"{latest['Close']:.2f} USD")
-        st.metric("VWAP", f"{vwap_latest:.2f} USD")
-        st.metric("EMA 9", f"{ema9:.2f} USD")
-        st.metric("RSI (14)", f"{rsi:.0f}")
+        st.subheader(f"Analyse für {ticker}")
+        st.caption(f"Letzte Bar: {watch.bars(ticker, 1).index[-1]}")
+        st.metric("Aktueller Kurs", f"{indicators['close']:.2f} USD")
+        st.metric("VWAP", f"{indicators['vwap']:.2f} USD" if indicators["vwap"] else "n/v")
+        st.metric("EMA 9", f"{indicators['ema9']:.2f} USD")
+        st.metric("RSI (14)", f"{rsi:.0f}" if rsi is not None else "n/v")
 
-        if rsi < 30:
+        if rsi is None:
+            st.info("Signal: Zu wenige Daten für den RSI.")
+        elif rsi < 30:
             st.success("Signal: Überverkauft – mögliche Rebound-Chance.")
         elif rsi > 70:
             st.warning("Signal: Überkauft – Einstieg mit Vorsicht.")
         else:
             st.info("Signal: Neutral – Momentum prüfen.")
 
-        st.markdown("**Hinweis:** Breakouts bei steigendem Volumen bieten häufig gute Chancen für kurzfristige Gewinne.")
-
         # Chart
-        st.line_chart(close_prices[-50:])
+        st.line_chart(watch.bars(ticker, 50)["Close"])
 
-    except Exception as e:
-        st.error(f"Fehler bei der Datenabfrage oder Analyse: {e}")
+    st.markdown("**Hinweis:** Breakouts bei steigendem Volumen bieten häufig gute Chancen für kurzfristige Gewinne.")
+
+
+if watch is not None:
+    if live:
+        # Nur dieses Fragment wird im Takt neu ausgeführt, nicht die ganze Seite
+        @st.fragment(run_every=refresh)
+        def live_analysis():
+            show_analysis(watch, poll=True)
+
+        live_analysis()
+    else:
+        # Ohne Live-Modus holt jeder Seitenaufruf ebenfalls nur die neuen Bars
+        show_analysis(watch, poll=not loaded)
@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+# -------------------------------------
+# Gesundheitsregister je Symbol (SQLite)
+# -------------------------------------
+# Merkt sich je (Symbol, Intervall) letzten Erfolg, letzten Fehlschlag, Anzahl
+# Fehlschläge in Folge und bis wann nicht mehr nachgefragt wird. Liefert ein
+# Symbol keine Daten, wartet es BASE_BACKOFF, danach jeweils doppelt so lange
+# (bis MAX_BACKOFF). Tote oder unauflösbare Symbole kosten so nicht bei jedem
+# Seitenaufruf einen Request. Vorübergehende Fehler (Rate-Limit, Timeout)
+# zählen nicht.
+DB_PATH = os.environ.get("STOCKINATOR_HEALTH_DB", "symbol_health.sqlite")
+BASE_BACKOFF = 15 * 60
+MAX_BACKOFF = 7 * 86400
+TRANSIENT = ("rate", "too many requests", "timed out", "timeout", "connection", "temporarily")
+_BATCH = 500  # Symbole je SQL-Abfrage
+
+
+def _connect():
+    con = sqlite3.connect(DB_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("""CREATE TABLE IF NOT EXISTS symbol_health (
+        symbol TEXT, interval TEXT, last_success REAL, last_failure REAL,
+        failures INTEGER DEFAULT 0, retry_after REAL DEFAULT 0, reason TEXT,
+        PRIMARY KEY (symbol, interval))""")
+    return con
+
+
+def is_transient(reason):
+    reason = (reason or "").lower()
+    return any(word in reason for word in TRANSIENT)
+
+
+def backoff_seconds(failures):
+    return min(BASE_BACKOFF * 2 ** max(failures - 1, 0), MAX_BACKOFF)
+
+
+def filter_healthy(symbols, interval="1d", now=None):
+    """Teilt in ``(erlaubt, übersprungen)``; übersprungen ordnet Symbolen einen Hinweis zu."""
+    now = now or time.time()
+    symbols = list(dict.fromkeys(symbols))
+    blocked = {}
+    con = _connect()
+    try:
+        for i in range(0, len(symbols), _BATCH):
+            batch = symbols[i:i + _BATCH]
+            rows = con.execute(f"SELECT symbol, retry_after, failures, reason FROM symbol_health "
+                               f"WHERE interval=? AND retry_after>? AND symbol IN ({', '.join('?' * len(batch))})",
+                               (interval, now, *batch)).fetchall()
+            for symbol, retry_after, failures, reason in rows:
+                until = time.strftime("%d.%m. %H:%M", time.localtime(retry_after))
+                blocked[symbol] = f"Übersprungen bis {until} ({failures}x ohne Daten: {reason})"
+    finally:
+        con.close()
+    return [s for s in symbols if s not in blocked], blocked
+
+
+def record(successes, failures, interval="1d", now=None):
+    """Schreibt Erfolge (Liste) und Fehlschläge (Dict Symbol -> Grund) fort."""
+    now = now or time.time()
+    failures = {s: r for s, r in failures.items() if not is_transient(r)}
+    if not successes and not failures:
+        return
+    con = _connect()
+    try:
+        with con:
+            con.executemany("""INSERT INTO symbol_health (symbol, interval, last_success, failures, retry_after)
+                VALUES (?, ?, ?, 0, 0) ON CONFLICT(symbol, interval) DO UPDATE SET
+                    last_success=excluded.last_success, failures=0, retry_after=0""",
+                            [(s, interval, now) for s in successes])
+            for symbol, reason in failures.items():
+                row = con.execute("SELECT failures FROM symbol_health WHERE symbol=? AND interval=?",
+                                  (symbol, interval)).fetchone()
+                count = (row[0] if row else 0) + 1
+                con.execute("""INSERT INTO symbol_health (symbol, interval, last_failure, failures, retry_after, reason)
+                    VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(symbol, interval) DO UPDATE SET
+                        last_failure=excluded.last_failure, failures=excluded.failures,
+                        retry_after=excluded.retry_after, reason=excluded.reason""",
+                            (symbol, interval, now, count, now + backoff_seconds(count), reason))
+    finally:
+        con.close()
+
+
+def failure_counts(symbols, interval="1d"):
+    """Fehlschläge in Folge je Symbol (0 für unbekannte), z. B. zum Nachrangig-Sortieren."""
+    symbols = list(dict.fromkeys(symbols))
+    counts = dict.fromkeys(symbols, 0)
+    con = _connect()
+    try:
+        for i in range(0, len(symbols), _BATCH):
+            batch = symbols[i:i + _BATCH]
+            counts.update(con.execute(f"SELECT symbol, failures FROM symbol_health WHERE interval=? "
+                                      f"AND symbol IN ({', '.join('?' * len(batch))})",
+                                      (interval, *batch)).fetchall())
+    finally:
+        con.close()
+    return counts
+
+
+def health_table():
+    con = _connect()
+    try:
+        rows = con.execute("SELECT * FROM symbol_health ORDER BY failures DESC, symbol").fetchall()
+    finally:
+        con.close()
+    table = pd.DataFrame(rows, columns=["symbol", "interval", "last_success", "last_failure",
+                                        "failures", "retry_after", "reason"])
+    for column in ["last_success", "last_failure", "retry_after"]:
+        table[column] = pd.to_datetime(table[column].where(table[column] > 0), unit="s")
+    return table
+
+
+def reset(symbol=None):
+    """Vergisst alle Einträge (oder die eines Symbols), z. B. nach Korrektur einer Ticker-CSV."""
+    con = _connect()
+    try:
+        with con:
+            if symbol:
+                con.execute("DELETE FROM symbol_health WHERE symbol=?", (symbol,))
+            else:
+                con.execute("DELETE FROM symbol_health")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    print(health_table().to_string(index=False))
@@ -0,0 +1,155 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import upstream
+from ticker_search import COLUMNS, TickerIndex, fold, load_index, resolve
+
+# -------------------------------------
+# Namen -> Symbol auflösen, dauerhaft gemerkt
+# -------------------------------------
+# Reihenfolge: festes Mapping der Seite, gespeicherte Auflösung, lokale
+# (tippfehlertolerante) Suche in Overlay und Ticker-Datenbank, erst dann
+# Yahoo. Jede Auflösung wird mit Sicherheit, Quelle und Zeitpunkt in SQLite
+# gespeichert; was über Yahoo gefunden wurde, landet zusätzlich im
+# Nutzer-Overlay der Ticker-Datenbank (ticker_database_user.csv, wird von
+# build_universe.py mit übernommen). Ein Name kostet so höchstens einmal
+# einen Request. Nicht auflösbare Namen werden nach FALLBACK_TTL erneut
+# versucht.
+DB_PATH = os.environ.get("STOCKINATOR_RESOLVE_DB", "symbol_resolution.sqlite")
+OVERLAY_PATH = "ticker_database_user.csv"
+YAHOO_CONFIDENCE = 0.7
+FALLBACK_TTL = 7 * 86400
+MAX_WORKERS = 4
+
+Resolution = namedtuple("Resolution", ["symbol", "confidence", "source"])
+
+
+def parse_watchlist(text):
+    """Eingaben aus einem Textfeld: eine pro Zeile oder mit Komma/Semikolon getrennt."""
+    parts = text.replace(";", "\n").replace(",", "\n").splitlines()
+    return list(dict.fromkeys(p.strip() for p in parts if p.strip()))
+
+
+def _connect(path):
+    con = sqlite3.connect(path, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("""CREATE TABLE IF NOT EXISTS resolutions (
+        query TEXT PRIMARY KEY, symbol TEXT, confidence REAL, source TEXT, resolved_at REAL)""")
+    return con
+
+
+def _lookup_yahoo(query):
+    try:
+        info = upstream.ticker_by_name(query)
+    except Exception:
+        return None, False  # Netzfehler: nichts merken
+    if info:
+        return info[0]["symbol"], True
+    return None, True
+
+
+class SymbolResolver:
+    def __init__(self, manual_map=None, universe=None, db_path=None, overlay_path=OVERLAY_PATH):
+        self.db_path = db_path or DB_PATH
+        self.overlay_path = overlay_path
+        self._lock = threading.Lock()
+        manual_map = manual_map or {}
+        self.manual = {fold(name): symbol for name, symbol in manual_map.items()}
+        self.manual_index = TickerIndex(pd.DataFrame({"Name": list(manual_map),
+                                                      "YahooTicker": list(manual_map.values())}))
+        self.universe = universe if universe is not None else load_index()
+        self._load_overlay()
+
+    def _load_overlay(self):
+        overlay = pd.read_csv(self.overlay_path) if os.path.exists(self.overlay_path) else pd.DataFrame(columns=COLUMNS)
+        self.overlay_index = TickerIndex(overlay.dropna(subset=["YahooTicker"]))
+
+    def _learn(self, learned):
+        """Über Yahoo gefundene Namen ins Nutzer-Overlay übernehmen."""
+        rows = pd.DataFrame([{"Name": query, "Synonyme": None, "YahooTicker": symbol}
+                             for query, symbol in learned.items()], columns=COLUMNS)
+        with self._lock:
+            rows.to_csv(self.overlay_path, mode="a", index=False, header=not os.path.exists(self.overlay_path))
+            self._load_overlay()
+
+    def resolve_many(self, queries):
+        """Löst alle Eingaben auf; gibt Dict Eingabe -> Resolution zurück."""
+        queries = [q for q in dict.fromkeys(queries) if q and q.strip()]
+        result, open_queries = {}, {}
+        for query in queries:
+            key = fold(query)
+            if key in self.manual:
+                result[query] = Resolution(self.manual[key], 1.0, "manuell")
+            else:
+                open_queries.setdefault(key, []).append(query)
+
+        now = time.time()
+        con = _connect(self.db_path)
+        try:
+            keys = list(open_queries)
+            stored = {}
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                stored.update({row[0]: row[1:] for row in con.execute(
+                    f"SELECT query, symbol, confidence, source, resolved_at FROM resolutions "
+                    f"WHERE query IN ({', '.join('?' * len(batch))})", batch)})
+
+            found, ask = {}, []
+            for key in keys:
+                if key in stored:
+                    symbol, conf, source, resolved_at = stored[key]
+                    if source != "unbekannt" or now - resolved_at < FALLBACK_TTL:
+                        found[key] = Resolution(symbol, conf, source)
+                        continue
+                match = resolve(key, [self.manual_index, self.overlay_index, self.universe])
+                if match:
+                    found[key] = Resolution(match[0], match[1], "lokal")
+                else:
+                    ask.append(key)
+
+            learned = {}
+            if ask:
+                with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(ask))) as pool:
+                    # Yahoo bekommt die Eingabe wie getippt, nicht den gefalteten Schlüssel (ü -> ue)
+                    typed = [open_queries[key][0].strip() for key in ask]
+                    for key, query, (symbol, answered) in zip(ask, typed, pool.map(_lookup_yahoo, typed)):
+                        if symbol:
+                            found[key] = Resolution(symbol, YAHOO_CONFIDENCE, "yahoo")
+                            learned[query] = symbol
+                        elif answered:
+                            found[key] = Resolution(query.upper(), 0.0, "unbekannt")
+                        else:
+                            result.update({q: Resolution(query.upper(), 0.0, "fehler") for q in open_queries[key]})
+
+            new = [(key, *found[key], now) for key in found if key not in stored or stored[key][:3] != tuple(found[key])]
+            with con:
+                con.executemany("INSERT OR REPLACE INTO resolutions VALUES (?, ?, ?, ?, ?)", new)
+        finally:
+            con.close()
+
+        if learned:
+            self._learn(learned)
+        for key, resolution in found.items():
+            for query in open_queries[key]:
+                result[query] = resolution
+        return result
+
+    def resolve(self, query):
+        return self.resolve_many([query]).get(query, Resolution(query.strip().upper(), 0.0, "unbekannt"))
+
+    def table(self):
+        """Alle gespeicherten Auflösungen, neueste zuerst."""
+        con = _connect(self.db_path)
+        try:
+            rows = con.execute("SELECT * FROM resolutions ORDER BY resolved_at DESC").fetchall()
+        finally:
+            con.close()
+        table = pd.DataFrame(rows, columns=["Eingabe", "Symbol", "Sicherheit", "Quelle", "Aufgelöst"])
+        table["Aufgelöst"] = pd.to_datetime(table["Aufgelöst"], unit="s")
+        return table
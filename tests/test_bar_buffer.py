@@ -0,0 +1,26 @@
+import numpy as np
+
+from bar_buffer import BAR_DTYPE, BarBuffer
+
+
+def _bars(start, count):
+    bars = np.zeros(count, dtype=BAR_DTYPE)
+    bars["ts"] = np.arange(start, start + count)
+    bars["close"] = bars["ts"]
+    return bars
+
+
+def test_window_across_ring_end():
+    buffer = BarBuffer(capacity=8)
+    buffer.extend(_bars(0, 6))
+    older, newer = buffer.parts()
+    assert len(older) == 0 and np.shares_memory(newer, buffer._data)
+    buffer.extend(_bars(6, 5))
+    buffer.append(_bars(11, 1)[0])
+    assert buffer.column("close").tolist() == list(range(4, 12))
+    assert buffer.view(3)["ts"].tolist() == [9, 10, 11]
+    older, newer = buffer.parts(6)
+    assert older["ts"].tolist() == [6, 7] and newer["ts"].tolist() == [8, 9, 10, 11]
+    buffer.replace_last(_bars(99, 1)[0])
+    assert buffer.last_ts == 99
+    assert buffer.nbytes == 8 * BAR_DTYPE.itemsize
@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+import pytest
+
+import build_universe
+from ticker_search import TickerIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Namen aus dem manual_map der Seiten -> erwartetes Symbol
+MANUAL_MAP = {
+    "renk group": "RENK.DE", "rheinmetall": "RHM.DE", "boeing": "BA", "allianz": "ALV.DE",
+    "münchner rück": "MUV2.DE", "münchener rück": "MUV2.DE", "muenchener rueck": "MUV2.DE",
+    "hensoldt": "HAG.DE", "porsche": "P911.DE", "mercedes": "MBG.DE", "rolls royce": "RR.L",
+    "byd": "1211.HK", "e.on": "EOAN.DE", "deutsche bank": "DBK.DE", "deutsche börse": "DB1.DE",
+    "novo nordisk": "NVO",
+}
+
+
+@pytest.fixture(scope="module")
+def universe():
+    paths = [os.path.join(ROOT, path) for path in build_universe.DEFAULT_SOURCES]
+    frames = [build_universe.read_source(path) for path in paths if os.path.exists(path)]
+    return TickerIndex(build_universe.merge_sources(frames)[0])
+
+
+@pytest.mark.parametrize("name", sorted(MANUAL_MAP))
+def test_manual_map_names_resolve_to_one_symbol(universe, name):
+    ranked = universe.rank(name)
+    top = ranked[0][1][:3]  # Trefferart, Distanz, Feld
+    tied = [row for row, score in ranked if score[:3] == top]
+    assert set(universe.rows(tied)["YahooTicker"]) == {MANUAL_MAP[name]}
+
+
+def test_earlier_source_wins_name_and_synonym_conflicts():
+    primary = pd.DataFrame({"Name": ["Allianz"], "Synonyme": ["alv, allianz"], "YahooTicker": ["ALV.DE"]})
+    later = pd.DataFrame({"Name": ["ALLIANZ", "Daimler Truck"], "Synonyme": ["allianz insurance", "alv, dtg"],
+                          "YahooTicker": ["DTG.DE", "DTG.DE"]})
+    merged, _ = build_universe.merge_sources([primary, later])
+    merged = merged.set_index("YahooTicker")
+    assert merged.loc["DTG.DE", "Name"] == "Daimler Truck"
+    assert merged.loc["DTG.DE", "Synonyme"] == "dtg"
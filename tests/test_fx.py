@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import fx
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    """EURGBP=X = 0,8 und EURILS=X = 4,0; merkt sich die angefragten Paare."""
+    monkeypatch.setattr(fx, "_rates", {})
+    requested = []
+
+    def get_bars_many(symbols, **kwargs):
+        requested.append(list(symbols))
+        index = pd.date_range("2026-01-02", periods=3)
+        known = {"EURGBP=X": 0.8, "EURILS=X": 4.0}
+        return {s: pd.DataFrame({"Close": known[s]}, index=index) for s in symbols if s in known}, {}
+
+    monkeypatch.setattr(fx, "get_bars_many", get_bars_many)
+    return requested
+
+
+def test_subunits_share_the_main_currency_pair(rates):
+    index = pd.date_range("2026-01-02", periods=3)
+    factors = fx.eur_factors(index, ["GBP", "GBp", "ILA", "EUR"])
+    assert rates == [["EURGBP=X", "EURILS=X"]]
+    assert factors[0].tolist() == pytest.approx([1.25, 0.0125, 0.0025, 1.0])
+
+
+def test_tel_aviv_quotes_in_agorot():
+    assert fx.quote_currency("TEVA.TA") == "ILA"
+    assert fx.quote_currency("VOD.L") == "GBp"
+
+
+def test_by_date_matrix_aligns_holidays():
+    days = pd.date_range("2026-01-05", periods=4)
+    frames = {"SAP.DE": pd.DataFrame({"Close": [10.0, 11.0, 12.0, 13.0]}, index=days.tz_localize("Europe/Berlin")),
+              # erst ab dem 2. Tag notiert, Feiertag in New York am 3. Tag
+              "AAPL": pd.DataFrame({"Close": [20.0, 22.0]}, index=days[[1, 3]].tz_localize("America/New_York"))}
+    close, factors = fx.eur_price_matrix(frames, offline=True, by_date=True)
+    assert list(close.index) == list(days)
+    assert close["SAP.DE"].tolist() == [10.0, 11.0, 12.0, 13.0]
+    assert close["AAPL"].tolist()[1:] == [20.0, 20.0, 22.0]
+    assert factors["AAPL"].isna().tolist() == [True, False, False, False]
+    assert (factors["SAP.DE"] == 1.0).all()
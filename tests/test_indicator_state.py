@@ -0,0 +1,41 @@
+import math
+
+import pytest
+
+from benchmark_indicators import synthetic_ohlcv
+from indicators import IndicatorState, calculate_indicators
+
+HISTORY = synthetic_ohlcv(300, 1, seed=7)["SYN00000"]
+
+
+def _assert_same(streaming, batch):
+    for key, expected in batch.items():
+        actual = streaming[key]
+        if isinstance(expected, str):
+            assert actual == expected, key
+        elif expected is None or (isinstance(expected, float) and math.isnan(expected)):
+            assert actual is None or math.isnan(actual), key
+        else:
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), key
+
+
+@pytest.mark.parametrize("bars", [1, 2, 5, 14, 15, 20, 21, 22, 26, 35, 60, 300])
+def test_snapshot_matches_batch(bars):
+    history = HISTORY.iloc[:bars]
+    _assert_same(IndicatorState.from_history(history).snapshot(), calculate_indicators(history))
+
+
+def test_incremental_updates_match_batch_after_every_bar():
+    state = IndicatorState.from_history(HISTORY.iloc[:30])
+    for bars in range(31, 120):
+        state.update(float(HISTORY["Close"].iloc[bars - 1]))
+        _assert_same(state.snapshot(), calculate_indicators(HISTORY.iloc[:bars]))
+
+
+def test_peek_includes_open_bar_without_changing_state():
+    state = IndicatorState.from_history(HISTORY.iloc[:99])
+    before = state.snapshot()
+    peeked = state.peek(float(HISTORY["Close"].iloc[99]))
+
+    _assert_same(peeked, calculate_indicators(HISTORY.iloc[:100]))
+    assert state.snapshot() == before
@@ -0,0 +1,59 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+import journal_store
+
+
+def test_concurrent_first_import_runs_once(tmp_path):
+    csv_path = tmp_path / "tradejournal.csv"
+    db_path = str(tmp_path / "journal.sqlite")
+    pd.DataFrame({"Datum": ["2026-01-02", "2026-01-03"], "Ticker": ["AAPL", "SAP.DE"],
+                  "Gewinn/Verlust (EUR)": [50.0, -20.0], "Setup": ["Breakout", "Pullback"]}).to_csv(csv_path, index=False)
+    journal_store.connect(db_path).close()
+
+    results, errors = [], []
+    barrier = threading.Barrier(4)
+
+    def run():
+        barrier.wait()
+        try:
+            results.append(journal_store.import_csv(str(csv_path), path=db_path))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(results) == [0, 0, 0, 2]
+    assert len(journal_store.load_journal(path=db_path)) == 2
+    assert journal_store.journal_stats(path=db_path)[0]["trades"] == 2
+
+
+def test_journal_without_equity_column_is_migrated(tmp_path):
+    db_path = str(tmp_path / "alt.sqlite")
+    con = sqlite3.connect(db_path)
+    con.execute("""CREATE TABLE trades (id INTEGER PRIMARY KEY AUTOINCREMENT, datum TEXT, ticker TEXT, entry REAL,
+        exit REAL, stueckzahl INTEGER, pnl REAL, setup TEXT, notizen TEXT)""")
+    con.executemany("INSERT INTO trades (datum, ticker, pnl, setup) VALUES (?, ?, ?, ?)",
+                    [("2026-01-02", "AAPL", 100.0, "Breakout"), ("2026-01-03", "AAPL", -150.0, "Breakout"),
+                     ("2026-01-04", "SAP.DE", 30.0, "Pullback")])
+    con.commit()
+    con.close()
+
+    journal_store.append_trade({"Datum": "2026-01-05", "Ticker": "SAP.DE", "Gewinn/Verlust (EUR)": 20.0,
+                                "Setup": "Pullback"}, path=db_path)
+
+    total, per_setup, _ = journal_store.journal_stats(path=db_path)
+    assert total["trades"] == 4
+    assert total["total_pnl"] == 0.0
+    assert total["max_drawdown"] == 150.0
+    assert per_setup.set_index("Setup").loc["Pullback", "trades"] == 2
+    assert list(journal_store.equity_curve(path=db_path)["Equity"]) == [100.0, -50.0, -20.0, 0.0]
+    assert journal_store.trade_results(path=db_path).values.tolist() == [
+        ["Breakout", 100.0], ["Breakout", -150.0], ["Pullback", 30.0], ["Pullback", 20.0]]
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import market_data
+import symbol_health
+
+
+def _bars(symbols):
+    columns = pd.MultiIndex.from_product([symbols, ["Open", "High", "Low", "Close", "Volume"]])
+    return pd.DataFrame(1.0, index=pd.date_range("2026-01-02", periods=3), columns=columns)
+
+
+@pytest.fixture
+def yahoo(tmp_path, monkeypatch):
+    """Ersatz für upstream.download: liefert Daten nur für Symbole in ``live``."""
+    monkeypatch.setattr(symbol_health, "DB_PATH", str(tmp_path / "health.sqlite"))
+    monkeypatch.setattr(market_data, "_probes", {})
+    state = {"live": {market_data.PROBE_SYMBOL}, "calls": []}
+
+    def download(tickers, **kwargs):
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        state["calls"].append(symbols)
+        alive = [s for s in symbols if s in state["live"]]
+        return _bars(alive) if alive else pd.DataFrame()
+
+    monkeypatch.setattr(market_data.upstream, "download", download)
+    return state
+
+
+def test_dead_single_symbol_is_backed_off(yahoo):
+    frames, errors = market_data.download_many(["QQQQXYZ"])
+    assert frames == {}
+    assert errors["QQQQXYZ"] == market_data.NO_DATA
+    assert symbol_health.failure_counts(["QQQQXYZ"])["QQQQXYZ"] == 1
+
+    calls = len(yahoo["calls"])
+    frames, errors = market_data.download_many(["QQQQXYZ"])
+    assert errors["QQQQXYZ"].startswith("Übersprungen")
+    assert len(yahoo["calls"]) == calls
+
+
+def test_empty_request_during_outage_is_not_recorded(yahoo):
+    yahoo["live"] = set()
+    frames, errors = market_data.download_many(["SAP.DE"])
+    assert errors["SAP.DE"] == market_data.EMPTY_REQUEST
+    assert symbol_health.failure_counts(["SAP.DE"])["SAP.DE"] == 0
+
+
+def test_probe_result_is_cached(yahoo):
+    market_data.download_many(["TOT1"])
+    market_data.download_many(["TOT2"])
+    assert yahoo["calls"].count([market_data.PROBE_SYMBOL]) == 1
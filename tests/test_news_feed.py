@@ -0,0 +1,71 @@
+import pytest
+
+import news_feed
+import upstream
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{symbol}</title>
+<item><title>{symbol} Schlagzeile 1</title><link>https://example.com/{symbol}/1</link></item>
+<item><title>{symbol} Schlagzeile 2</title><link>https://example.com/{symbol}/2</link></item>
+</channel></rss>"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(upstream, "_bucket", upstream.TokenBucket(rate=1000, burst=1000))
+    monkeypatch.setattr(upstream, "BACKOFF", 0.01)
+    news_feed._cache.clear()
+    yield
+    news_feed._cache.clear()
+
+
+def _feed(symbol, etag, statuses=None):
+    def route(headers):
+        if headers.get("If-None-Match") == etag:
+            if statuses is not None:
+                statuses.append(304)
+            return 304, {"ETag": etag}, b""
+        if statuses is not None:
+            statuses.append(200)
+        return 200, {"ETag": etag, "Content-Type": "application/rss+xml"}, RSS.format(symbol=symbol).encode()
+    return route
+
+
+def test_etag_revalidation_returns_cached_items(local_server):
+    statuses = []
+    local_server.routes["/AAPL"] = _feed("AAPL", '"v1"', statuses)
+    template = local_server.url + "/{symbol}"
+
+    first, errors = news_feed.fetch_news_many(["AAPL"], ttl=0, url_template=template)
+    assert errors == {}
+    assert first["AAPL"][0] == ("AAPL Schlagzeile 1", "https://example.com/AAPL/1")
+
+    # TTL 0: erneute Anfrage mit If-None-Match, der Server antwortet 304
+    second, errors = news_feed.fetch_news_many(["AAPL"], ttl=0, url_template=template)
+    assert errors == {}
+    assert second == first
+    assert statuses == [200, 304]
+
+
+def test_http_error_is_reported_per_feed(local_server):
+    local_server.routes["/AAPL"] = _feed("AAPL", '"v1"')
+    local_server.routes["/BROKEN"] = lambda headers: (500, {}, b"")
+
+    news, errors = news_feed.fetch_news_many(["AAPL", "BROKEN"], ttl=0, url_template=local_server.url + "/{symbol}")
+
+    assert len(news["AAPL"]) == 2
+    assert news["BROKEN"] == []
+    assert set(errors) == {"BROKEN"}
+    assert "500" in errors["BROKEN"]
+
+
+def test_ttl_serves_from_cache_without_request(local_server):
+    local_server.routes["/SAP.DE"] = _feed("SAP.DE", '"v1"')
+    template = local_server.url + "/{symbol}"
+
+    first, _ = news_feed.fetch_news_many(["SAP.DE"], limit=1, ttl=300, url_template=template)
+    second, _ = news_feed.fetch_news_many(["SAP.DE"], limit=1, ttl=300, url_template=template)
+
+    assert first == second
+    assert len(second["SAP.DE"]) == 1
+    assert local_server.hits["/SAP.DE"] == 1
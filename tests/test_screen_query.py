@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screen_query import apply, compile_query
+
+TABLE = pd.DataFrame({
+    "rsi": [20.0, np.nan, 50.0, 80.0],
+    "ema9": [1.0, 2.0, np.nan, 4.0],
+    "ema20": [0.0, 3.0, 1.0, 1.0],
+    "trend": ["Bullish", "Bearish", "Bullish", "n/v"],
+}, index=["A", "B", "C", "D"])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("rsi < 30 and ema9 > ema20", ["A"]),
+    ("30 < rsi < 90", ["C", "D"]),
+    ('trend == "Bullish" or rsi > 70', ["A", "C", "D"]),
+    ('trend in ["Bearish", "n/v"]', ["B", "D"]),
+    ("rsi < ema9 * 30", ["A", "D"]),
+])
+def test_matches_pandas_filter(query, expected):
+    assert list(apply(TABLE, query).index) == expected
+
+
+@pytest.mark.parametrize("query", ["not rsi < 30", "rsi != 20", "rsi not in [20]"])
+def test_nan_never_matches(query):
+    assert "B" not in apply(TABLE, query).index
+
+
+@pytest.mark.parametrize("query", [
+    "trend < 30", "rsi < 'a'", 'trend == 1', "trend + 1 > 0", "rsi in ['a']",
+    "rsi", "rsi < 30 and ema9", "__import__('os')", "rsi.real > 1", "unbekannt > 1", "rsi >",
+])
+def test_invalid_queries_fail_at_compile_time(query):
+    with pytest.raises(ValueError):
+        compile_query(query)
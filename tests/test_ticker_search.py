@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+from ticker_search import EXACT, PREFIX, SUBSTRING, WORD_PREFIX, TickerIndex
+
+ROWS = [("Deutsche Bank", "bank, dbk, deutsche", "DBK.DE"),
+        ("Deutsche Börse", "db1, deutsche", "DB1.DE"),
+        ("Münchener Rück", "muv2, munich re", "MUV2.DE"),
+        ("Rheinmetall", "rheinmetall, rhm", "RHM.DE"),
+        ("Commerzbank", "cbk", "CBK.DE"),
+        ("Bank of America", "bofa", "BAC"),
+        ("Erste Group Bank", "erste", "EBS.VI")]
+
+
+@pytest.fixture(scope="module", params=["speicher", "mmap"])
+def index(request, tmp_path_factory):
+    index = TickerIndex(pd.DataFrame(ROWS, columns=["Name", "Synonyme", "YahooTicker"]))
+    if request.param == "mmap":
+        path = str(tmp_path_factory.mktemp("universe"))
+        index.save(path)
+        index = TickerIndex.open(path)
+    return index
+
+
+def _tickers(index, ranked):
+    return list(index.rows(row for row, _ in ranked)["YahooTicker"])
+
+
+def test_match_kinds_are_ranked(index):
+    ranked = index.rank("bank")
+    assert [score[0] for _, score in ranked] == [EXACT, PREFIX, WORD_PREFIX, SUBSTRING]
+    assert _tickers(index, ranked) == ["DBK.DE", "BAC", "EBS.VI", "CBK.DE"]
+
+
+def test_limit_returns_the_best_results(index):
+    for q in ["b", "de", "bank", "muenchener rueck", "rheinmetall ag"]:
+        full = index.rank(q)
+        for limit in (1, 2, 3):
+            assert index.rank(q, limit=limit) == full[:limit]
+    assert len(index.search("e", limit=2)) == 2
+
+
+def test_queries_longer_than_eight_bytes(index):
+    assert index.best("deutsche bank") == ("DBK.DE", 1.0)
+    assert index.best("deutsche b") == ("DBK.DE", 0.9)
+    assert index.best("Münchener Rück") == ("MUV2.DE", 1.0)
+    assert index.rank("deutsche bankhaus") == []
+
+
+def test_fuzzy_fallback(index):
+    assert index.best("Münchner Rueck")[0] == "MUV2.DE"
+    assert index.best("rheinmetal") == ("RHM.DE", 0.9)
+    assert index.best("rhienmetall")[0] == "RHM.DE"
+    assert index.rank("rhienmetall", fuzzy=False) == []
@@ -0,0 +1,112 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+import upstream
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode()
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstream(monkeypatch):
+    monkeypatch.setattr(upstream, "_bucket", upstream.TokenBucket(rate=1000, burst=1000))
+    monkeypatch.setattr(upstream, "BACKOFF", 0.01)
+    upstream.reset_stats()
+    yield
+    upstream.reset_stats()
+
+
+def test_identical_concurrent_calls_share_one_request(local_server):
+    def slow(headers):
+        time.sleep(0.3)
+        return 200, {}, b"kurse"
+
+    local_server.routes["/slow"] = slow
+    url = local_server.url + "/slow"
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(upstream.call("test", _get, url)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["kurse"] * 5
+    assert local_server.hits["/slow"] == 1
+    stats = upstream.stats().loc["test"]
+    assert stats["anfragen"] == 5
+    assert stats["upstream"] == 1
+    assert stats["zusammengelegt"] == 4
+
+
+def test_token_bucket_waits_when_empty(local_server, monkeypatch):
+    monkeypatch.setattr(upstream, "_bucket", upstream.TokenBucket(rate=10, burst=1))
+    local_server.routes["/a"] = local_server.routes["/b"] = local_server.routes["/c"] = lambda h: (200, {}, b"ok")
+
+    started = time.monotonic()
+    for path in ("/a", "/b", "/c"):
+        assert upstream.call("test", _get, local_server.url + path) == "ok"
+
+    # Erstes Token aus dem Burst, zwei weitere mit je 0,1 s Nachfüllzeit
+    assert time.monotonic() - started >= 0.18
+    assert upstream.stats().loc["test", "wartezeit_s"] >= 0.18
+
+
+def test_cost_charges_one_token_per_symbol():
+    bucket = upstream.TokenBucket(rate=20, burst=10)
+    assert bucket.acquire(10) == 0
+    started = time.monotonic()
+    bucket.acquire(5)
+    assert time.monotonic() - started >= 0.2
+
+
+def test_download_charges_per_symbol_and_retries_empty_result(monkeypatch):
+    charged = []
+    bucket = upstream.TokenBucket(rate=1000, burst=1000)
+    monkeypatch.setattr(bucket, "acquire", lambda tokens=1: charged.append(tokens) or 0.0)
+    monkeypatch.setattr(upstream, "_bucket", bucket)
+    answers = [pd.DataFrame(), pd.DataFrame({"Close": [1.0]})]
+    monkeypatch.setattr(upstream.yf, "download", lambda tickers, **kwargs: answers.pop(0))
+
+    result = upstream.download(["AAPL", "SAP.DE", "BA"], period="1d")
+
+    assert list(result["Close"]) == [1.0]
+    assert charged == [3, 3]
+    assert upstream.stats().loc["download", "wiederholt"] == 1
+
+
+def test_retries_with_backoff_until_success(local_server):
+    answers = [503, 503, 200]
+    local_server.routes["/flaky"] = lambda h: (answers.pop(0), {}, b"wieder da")
+
+    assert upstream.call("test", _get, local_server.url + "/flaky") == "wieder da"
+    assert local_server.hits["/flaky"] == 3
+    assert upstream.stats().loc["test", "wiederholt"] == 2
+
+
+def test_gives_up_after_retries(local_server):
+    local_server.routes["/down"] = lambda h: (500, {}, b"")
+
+    with pytest.raises(urllib.error.HTTPError):
+        upstream.call("test", _get, local_server.url + "/down", retries=2)
+    assert local_server.hits["/down"] == 3
+    assert upstream.stats().loc["test", "fehler"] == 1
+
+
+def test_programming_errors_are_not_retried():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise KeyError("symbol")
+
+    with pytest.raises(KeyError):
+        upstream.call("test", broken)
+    assert len(calls) == 1
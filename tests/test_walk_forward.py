@@ -0,0 +1,26 @@
+import numpy as np
+
+from walk_forward import ComboTrades, windows
+
+
+def test_window_excludes_trades_opened_before_start():
+    # Trade 0 läuft über die Fenstergrenze (Einstieg im Training), Trade 1 und 2 liegen im Testfenster
+    trades = ComboTrades(entry=np.array([90, 105, 120]), exit_bar=np.array([110, 115, 140]),
+                         pnl=np.array([500.0, 20.0, -10.0]))
+
+    stats = trades.window(100, 150)
+
+    assert stats["trades"] == 2
+    assert stats["pnl"] == 10.0
+    assert (stats["wins"], stats["losses"]) == (1, 1)
+    assert stats["max_drawdown"] == 10.0
+
+
+def test_window_excludes_trades_still_open_at_stop():
+    trades = ComboTrades(entry=np.array([10, 40]), exit_bar=np.array([20, 60]), pnl=np.array([5.0, 7.0]))
+
+    assert trades.window(0, 50)["trades"] == 1
+
+
+def test_windows_roll_by_test_length():
+    assert windows(1000, train=500, test=200) == [(0, 500, 700), (200, 700, 900), (400, 900, 1000)]
@@ -0,0 +1,372 @@
+import json
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------
+# Vorberechneter Suchindex für die Ticker-Datenbank
+# -------------------------------------
+# Name, YahooTicker und die einzelnen Synonyme werden einmal beim Laden
+# kleingeschrieben und in einen N-Gramm-Index (1- bis 3-Gramme) gelegt. Eine
+# Suche schneidet nur noch wenige Posting-Listen, statt bei jedem Rerun alle
+# Spalten per str.contains zu scannen.
+#
+# Alles liegt in flachen NumPy-Arrays (Texte als UTF-8-Block plus Offsets,
+# Postings als CSR). build_universe.py schreibt sie einmal als Verzeichnis
+# von .npy-Dateien, die Apps öffnen es per Memory-Mapping: kein CSV-Parsen
+# beim Start, und alle Prozesse teilen sich dieselben Seiten im Page-Cache.
+#
+# Texte und Anfragen werden gefaltet (ä -> ae, ß -> ss, Akzente weg), damit
+# "Münchner Rück" und "muenchner rueck" gleich sind. Findet die Suche nichts,
+# sucht sie tippfehlertolerant: Kandidaten sind Keys mit genügend gemeinsamen
+# Trigrammen (aus denselben Postings), geprüft wird mit einer begrenzten
+# Editierdistanz gegen den Anfang des Keys (vektorisiert über alle
+# Kandidaten) – ohne Netzwerk.
+#
+# Für Präfix- und Wortanfangs-Treffer gibt es zusätzlich eine sortierte
+# Liste aller Wortanfänge (die ersten 8 UTF-8-Bytes ab jedem Wortanfang als
+# uint64): eine Anfrage ist dort ein Bereich aus zwei Binärsuchen. Gerankt
+# wird vektorisiert über einen int64-Code (Trefferart, Feld, Länge, Zeile).
+# Da Teilstring-Treffer immer hinter allen Wortanfängen stehen, werden sie
+# nur gesucht, solange ``limit`` noch nicht voll ist – kurze Anfragen wie
+# "a" prüfen so nicht mehr die ganze Posting-Liste.
+
+GRAM = 3
+COLUMNS = ["Name", "Synonyme", "YahooTicker"]
+UNIVERSE_PATH = "ticker_universe"
+FORMAT_VERSION = 3
+SEARCH_LIMIT = 50  # Treffer je Suche, wenn nichts anderes angegeben
+
+FUZZY_MIN_LEN = 4  # kürzere Anfragen nicht fehlertolerant suchen
+FUZZY_CANDIDATES = 100  # so viele Keys mit den meisten gemeinsamen Trigrammen prüfen
+MIN_CONFIDENCE = 0.6  # ab hier gilt ein Treffer in resolve() als sicher
+
+# Rangfolge der Trefferarten (kleiner = besser)
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+CONFIDENCE = {EXACT: 1.0, PREFIX: 0.9, WORD_PREFIX: 0.8, SUBSTRING: 0.5}
+# Bei gleicher Trefferart: Ticker vor Name vor Synonym
+FIELDS = ["YahooTicker", "Name", "Synonyme"]
+FIELD_RANK = {field: rank for rank, field in enumerate(FIELDS)}
+
+_ARRAYS = ["name_blob", "name_off", "syn_blob", "syn_off", "ticker_blob", "ticker_off",
+           "key_blob", "key_off", "key_row", "key_field", "gram_code", "gram_off", "post_key",
+           "word_code", "word_key", "word_pos", "word_rank"]
+
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "æ": "ae", "ø": "oe", "œ": "oe"})
+
+
+def fold(text):
+    """Kleinschreibung, Umlaute umschreiben, Akzente entfernen, Leerraum vereinheitlichen."""
+    text = str(text).lower().translate(_UMLAUTS)
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def _text(value):
+    return "" if pd.isna(value) else fold(value)
+
+
+def _prefix_distances(q, texts, limit):
+    """Editierdistanz von ``q`` zum ähnlichsten Anfang jedes Textes (Array); > ``limit`` heißt kein Treffer."""
+    width = len(q) + limit
+    texts = [text[:width] for text in texts]
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    # Alle Texte auf ``width`` Zeichen aufgefüllt als ein UTF-32-Block (Zeichen = Codepoint)
+    padded = "".join(text.ljust(width, "\0") for text in texts)
+    chars = np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(texts), width)
+    steps = np.arange(width + 1)
+    previous = np.tile(steps, (len(texts), 1))
+    for i, char in enumerate(q, 1):
+        # Ersetzen/Löschen aus der Vorzeile, Einfügen als laufendes Minimum entlang der Zeile
+        best = np.empty_like(previous)
+        best[:, 0] = i
+        np.minimum(previous[:, :-1] + (chars != ord(char)), previous[:, 1:] + 1, out=best[:, 1:])
+        previous = np.minimum.accumulate(best - steps, axis=1) + steps
+    previous[steps > lengths[:, None]] = limit + 1
+    return previous.min(axis=1)
+
+
+def confidence(score):
+    """Sicherheit 0..1 eines Treffers aus seinem Rang-Tupel."""
+    kind, distance = score[0], score[1]
+    return round(0.8 * (1 - distance), 2) if kind == FUZZY else CONFIDENCE[kind]
+
+
+def _prefix_code(data):
+    # Die ersten 8 Bytes big-endian: uint64 sortiert wie die Bytes selbst
+    return int.from_bytes(data[:8].ljust(8, b"\0"), "big")
+
+
+def _order(kind, field, length, row):
+    """Rang als int64 (Trefferart, Feld, Länge in Bytes, Zeile) – kleiner = besser."""
+    return ((np.asarray(kind, dtype=np.int64) << 56) | (field.astype(np.int64) << 48)
+            | (np.minimum(length, 0xFFFF).astype(np.int64) << 32) | row.astype(np.int64))
+
+
+def _score(code):
+    return (code >> 56, 0, (code >> 48) & 0xFF, (code >> 32) & 0xFFFF, code & 0xFFFFFFFF)
+
+
+def _collect(codes, found, limit, accept=None):
+    """Übernimmt Rang-Codes aufsteigend in ``found`` (Zeile -> bester Code), bis ``limit`` Zeilen da sind.
+
+    ``accept(i)`` kann Kandidat ``i`` vorher verwerfen. Sortiert wird zuerst
+    nur ein Vorrat von 8 x ``limit`` Codes, erst wenn der nicht reicht alles.
+    """
+    head = len(codes) if limit is None else min(len(codes), 8 * limit)
+    passes = [lambda: np.argpartition(codes, head - 1)[:head]] if 0 < head < len(codes) else []
+    passes.append(lambda: np.arange(len(codes)))
+    for candidates in passes:
+        order = candidates()
+        for i in order[np.argsort(codes[order], kind="stable")].tolist():
+            code = int(codes[i])
+            row = code & 0xFFFFFFFF
+            if row in found or (accept is not None and not accept(i)):
+                continue
+            found[row] = code
+            if limit is not None and len(found) >= limit:
+                return found
+    return found
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _gram_code(gram):
+    # Bis zu drei Unicode-Zeichen (je 21 Bit) verlustfrei in einem int64
+    code = 0
+    for i, char in enumerate(gram):
+        code |= ord(char) << (21 * i)
+    return code
+
+
+def _pack(texts):
+    """Strings als (UTF-8-Block, Offsets) – das Layout einer Arrow-String-Spalte."""
+    encoded = [t.encode("utf-8") for t in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets
+
+
+def _unpack(blob, offsets, i):
+    return blob[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class TickerIndex:
+    def __init__(self, df=None, arrays=None):
+        if arrays is None:
+            arrays = self._build(df.reset_index(drop=True))
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @staticmethod
+    def _build(df):
+        synonym_col = df["Synonyme"] if "Synonyme" in df else [None] * len(df)
+        raw = [["" if pd.isna(v) else str(v) for v in column] for column in (df["Name"], synonym_col, df["YahooTicker"])]
+
+        keys, key_row, key_field = [], [], []
+        for row, (name, synonyms, ticker) in enumerate(zip(*raw)):
+            texts = [(_text(ticker), "YahooTicker"), (_text(name), "Name")]
+            texts += [(synonym.strip(), "Synonyme") for synonym in _text(synonyms).split(",")]
+            for text, field in texts:
+                if text:
+                    keys.append(text)
+                    key_row.append(row)
+                    key_field.append(FIELD_RANK[field])
+
+        codes, post = [], []
+        word_code, word_key, word_pos = [], [], []
+        for key_id, text in enumerate(keys):
+            for n in range(1, GRAM + 1):
+                for gram in _grams(text, n):
+                    codes.append(_gram_code(gram))
+                    post.append(key_id)
+            encoded = text.encode("utf-8")
+            for pos in range(len(text)):
+                if pos == 0 or not text[pos - 1].isalnum():
+                    offset = len(text[:pos].encode("utf-8"))
+                    word_code.append(_prefix_code(encoded[offset:]))
+                    word_key.append(key_id)
+                    word_pos.append(offset)
+        codes = np.asarray(codes, dtype=np.int64)
+        post = np.asarray(post, dtype=np.int32)
+        order = np.lexsort((post, codes))  # je Gramm aufsteigende Key-IDs
+        codes, post = codes[order], post[order]
+        gram_code, starts = np.unique(codes, return_index=True)
+
+        word_code = np.asarray(word_code, dtype=np.uint64)
+        word_key = np.asarray(word_key, dtype=np.int32)
+        word_pos = np.asarray(word_pos, dtype=np.int32)
+        order = np.lexsort((word_key, word_code))
+        key_row, key_field = np.asarray(key_row, dtype=np.int32), np.asarray(key_field, dtype=np.int8)
+        key_size = np.array([len(key.encode("utf-8")) for key in keys], dtype=np.int64)
+        # Rang je Wortanfang vorab; EXACT ergibt sich erst aus der Länge der Anfrage
+        word_rank = _order(np.where(word_pos > 0, WORD_PREFIX, PREFIX), key_field[word_key],
+                           key_size[word_key], key_row[word_key])
+        arrays = {"key_row": key_row, "key_field": key_field,
+                  "gram_code": gram_code, "gram_off": np.append(starts, len(codes)).astype(np.int64),
+                  "post_key": post, "word_code": word_code[order], "word_key": word_key[order],
+                  "word_pos": word_pos[order], "word_rank": word_rank[order]}
+        for prefix, texts in (("name", raw[0]), ("syn", raw[1]), ("ticker", raw[2]), ("key", keys)):
+            arrays[f"{prefix}_blob"], arrays[f"{prefix}_off"] = _pack(texts)
+        return arrays
+
+    def save(self, path=UNIVERSE_PATH, **meta):
+        os.makedirs(path, exist_ok=True)
+        for name in _ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump({"version": FORMAT_VERSION, "rows": len(self), "keys": len(self.key_row), **meta},
+                      fh, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def open(cls, path=UNIVERSE_PATH):
+        """Öffnet ein mit ``save`` geschriebenes Verzeichnis per Memory-Mapping."""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: Format {meta.get('version')} statt {FORMAT_VERSION}, bitte neu bauen")
+        return cls(arrays={name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS})
+
+    def __len__(self):
+        return len(self.name_off) - 1
+
+    def _key(self, key_id):
+        return _unpack(self.key_blob, self.key_off, key_id)
+
+    def _postings(self, gram):
+        i = np.searchsorted(self.gram_code, _gram_code(gram))
+        if i == len(self.gram_code) or self.gram_code[i] != _gram_code(gram):
+            return None
+        return self.post_key[self.gram_off[i]:self.gram_off[i + 1]]
+
+    def _candidates(self, q):
+        if len(q) <= GRAM:
+            found = self._postings(q)
+            return found if found is not None else np.zeros(0, dtype=np.int32)
+        lists = [self._postings(gram) for gram in _grams(q, GRAM)]
+        if any(found is None for found in lists):
+            return np.zeros(0, dtype=np.int32)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for found in lists[1:]:
+            # Postings sind aufsteigend sortiert: Binärsuche der wenigen Kandidaten statt intersect1d
+            pos = np.minimum(np.searchsorted(found, candidates), len(found) - 1)
+            candidates = candidates[found[pos] == candidates]
+        return candidates
+
+    def _word_matches(self, qb):
+        """Keys, in denen ``qb`` (UTF-8) an einem Wortanfang steht: ``(key_ids, rang_codes)``."""
+        head = qb[:8]
+        lo = np.searchsorted(self.word_code, np.uint64(_prefix_code(head)), side="left")
+        hi = np.searchsorted(self.word_code, np.uint64(int.from_bytes(head.ljust(8, b"\xff"), "big")), side="right")
+        keys, codes = self.word_key[lo:hi], np.array(self.word_rank[lo:hi])
+        if len(qb) > 8:
+            # Nur die ersten 8 Bytes stecken im Code: Rest direkt im Text-Block prüfen
+            start = self.key_off[keys] + self.word_pos[lo:hi]
+            ok = self.key_off[keys + 1] - start >= len(qb)
+            for j in range(8, len(qb)):
+                ok &= self.key_blob[np.minimum(start + j, len(self.key_blob) - 1)] == qb[j]
+            keys, codes = keys[ok], codes[ok]
+        # Exakte Treffer können nur am Anfang des Bereichs stehen (Code = Anfrage mit Nullen aufgefüllt)
+        same = np.searchsorted(self.word_code, np.uint64(_prefix_code(head)), side="right") - lo
+        head_codes = codes[:len(codes) if len(qb) > 8 else same]
+        exact = ((head_codes >> 56) == PREFIX) & (((head_codes >> 32) & 0xFFFF) == len(qb))
+        head_codes[exact] -= np.int64(PREFIX - EXACT) << 56
+        return keys, codes
+
+    def _fuzzy(self, q):
+        limit = 1 if len(q) <= 5 else 2
+        lists = [found for found in (self._postings(gram) for gram in _grams(q, GRAM)) if found is not None]
+        if not lists:
+            return {}
+        counts = np.bincount(np.concatenate(lists))
+        # Jede Editieroperation zerstört höchstens drei Trigramme der Anfrage
+        candidates = np.flatnonzero(counts >= max(len(q) - 2 - GRAM * limit, 1))
+        if len(candidates) > FUZZY_CANDIDATES:
+            candidates = candidates[np.argsort(-counts[candidates], kind="stable")[:FUZZY_CANDIDATES]]
+
+        texts = [self._key(key_id) for key_id in candidates]
+        best = {}
+        for key_id, text, distance in zip(candidates.tolist(), texts, _prefix_distances(q, texts, limit).tolist()):
+            if distance > limit:
+                continue
+            row = int(self.key_row[key_id])
+            score = (FUZZY, distance / len(q), int(self.key_field[key_id]), len(text), row)
+            if row not in best or score < best[row]:
+                best[row] = score
+        return best
+
+    def rank(self, q, fuzzy=True, limit=None):
+        """Liste ``(zeile, rang)`` der Treffer, bester Treffer zuerst (höchstens ``limit``).
+
+        Ohne exakten oder Teilstring-Treffer wird mit ``fuzzy=True``
+        tippfehlertolerant gesucht.
+        """
+        q = fold(q)
+        if not q:
+            return [(row, (SUBSTRING, 0, 0, 0, row)) for row in range(len(self))][:limit]
+
+        keys, codes = self._word_matches(q.encode("utf-8"))
+        found = _collect(codes, {}, limit)
+        if limit is None or len(found) < limit:
+            candidates = np.asarray(self._candidates(q), dtype=np.int64)
+            candidates = candidates[~np.isin(candidates, keys)]
+            size = self.key_off[candidates + 1] - self.key_off[candidates]
+            codes = _order(SUBSTRING, self.key_field[candidates], size, self.key_row[candidates])
+            # Bis GRAM Zeichen enthalten die Postings genau die Keys mit q, bei längeren nur alle Trigramme
+            accept = None if len(q) <= GRAM else (lambda i: q in self._key(candidates[i]))
+            _collect(codes, found, limit, accept)
+        if not found and fuzzy and len(q) >= FUZZY_MIN_LEN:
+            return sorted(self._fuzzy(q).items(), key=lambda item: item[1])[:limit]
+        return [(row, _score(code)) for row, code in sorted(found.items(), key=lambda item: item[1])]
+
+    def rows(self, rows):
+        """Zeilen der Datenbank als DataFrame (Name, Synonyme, YahooTicker)."""
+        rows = list(rows)
+        columns = {"Name": (self.name_blob, self.name_off), "Synonyme": (self.syn_blob, self.syn_off),
+                   "YahooTicker": (self.ticker_blob, self.ticker_off)}
+        return pd.DataFrame({column: [_unpack(blob, offsets, r) or np.nan for r in rows]
+                             for column, (blob, offsets) in columns.items()}, index=rows, columns=COLUMNS)
+
+    @property
+    def df(self):
+        return self.rows(range(len(self)))
+
+    def search(self, q, limit=SEARCH_LIMIT):
+        """Die besten ``limit`` Treffer als Zeilen der Datenbank, nach Genauigkeit sortiert."""
+        return self.rows(row for row, _ in self.rank(q, limit=limit))
+
+    def best(self, q):
+        """Bester Treffer als ``(YahooTicker, sicherheit)`` oder None."""
+        ranked = self.rank(q, limit=1)
+        if not ranked:
+            return None
+        row, score = ranked[0]
+        return _unpack(self.ticker_blob, self.ticker_off, row), confidence(score)
+
+
+def resolve(query, indexes, min_confidence=MIN_CONFIDENCE):
+    """Löst einen Namen lokal über mehrere Indizes auf (bei gleicher Sicherheit gewinnt der erste).
+
+    Gibt ``(YahooTicker, sicherheit)`` zurück oder None, wenn kein Treffer
+    sicher genug ist.
+    """
+    found = None
+    for index in indexes:
+        match = index.best(query)
+        if match and match[1] >= min_confidence and (found is None or match[1] > found[1]):
+            found = match
+    return found
+
+
+def load_index(path=UNIVERSE_PATH, csv_path="ticker_database.csv"):
+    """Gebautes Ticker-Universum per Memory-Mapping, sonst Index direkt aus der CSV."""
+    if os.path.exists(os.path.join(path, "meta.json")):
+        return TickerIndex.open(path)
+    df = pd.read_csv(csv_path)
+    return TickerIndex(df.dropna(subset=["YahooTicker"]))
@@ -0,0 +1,183 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import feedparser
+import pandas as pd
+import yfinance as yf
+
+# -------------------------------------
+# Gemeinsame Schicht für alle Yahoo-Abrufe
+# -------------------------------------
+# Alle ausgehenden Requests (yf.download, Ticker.history, Namenssuche, RSS)
+# laufen durch einen prozessweiten Token-Bucket: im Mittel höchstens RATE
+# Tokens pro Sekunde, kurzzeitig bis BURST. Ein Request kostet ein Token,
+# ein gruppierter Download eines je Symbol, weil yfinance intern ebenso viele
+# Abrufe macht.
+# Identische Anfragen, die
+# gleichzeitig laufen, werden zu einem einzigen Upstream-Request
+# zusammengelegt; alle Wartenden bekommen dessen Ergebnis. Fehler werden mit
+# exponentiellem Backoff und zufälligem Jitter wiederholt.
+#
+# stats() liefert je Art: Anfragen, Upstream-Requests, zusammengelegte
+# Anfragen, Wiederholungen, Fehler und die Wartezeit im Rate-Limit.
+RATE = float(os.environ.get("STOCKINATOR_UPSTREAM_RATE", "10"))
+BURST = int(os.environ.get("STOCKINATOR_UPSTREAM_BURST", "50"))
+RETRIES = 3
+BACKOFF = 0.5  # Sekunden, verdoppelt je Versuch
+RETRY_STATUS = {429, 500, 502, 503, 504}
+NO_RETRY = (AttributeError, KeyError, TypeError, ValueError)  # Programmfehler, kein Netzproblem
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Blockiert bis ``tokens`` frei sind; gibt die Wartezeit in Sekunden zurück."""
+        tokens = min(tokens, self.burst)  # größere Anfragen warten auf einen vollen Bucket
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RetryableResult(Exception):
+    """Upstream hat geantwortet, aber mit einem Ergebnis, das wiederholt werden soll."""
+
+    def __init__(self, result):
+        super().__init__("Upstream-Antwort wird wiederholt")
+        self.result = result
+
+
+_bucket = TokenBucket(RATE, BURST)
+_inflight = {}  # Schlüssel -> Future des laufenden Upstream-Requests
+_lock = threading.Lock()
+_stats = {}
+
+_COUNTERS = ["anfragen", "upstream", "zusammengelegt", "wiederholt", "fehler", "wartezeit_s"]
+
+
+def _count(kind, **values):
+    with _lock:
+        counters = _stats.setdefault(kind, dict.fromkeys(_COUNTERS, 0))
+        for name, value in values.items():
+            counters[name] += value
+
+
+def _upstream(kind, func, args, kwargs, retry_if, retries, cost):
+    for attempt in range(retries + 1):
+        _count(kind, upstream=1, wartezeit_s=_bucket.acquire(cost))
+        try:
+            result = func(*args, **kwargs)
+            if retry_if and retry_if(result):
+                raise RetryableResult(result)
+            return result
+        except Exception as e:
+            if attempt == retries or isinstance(e, NO_RETRY):
+                if isinstance(e, RetryableResult):
+                    return e.result
+                raise
+            _count(kind, wiederholt=1)
+            time.sleep(random.uniform(0, BACKOFF * 2 ** attempt))
+
+
+def call(kind, func, *args, retry_if=None, retries=RETRIES, cost=1, **kwargs):
+    """Führt ``func(*args, **kwargs)`` über Rate-Limit, Zusammenlegung und Retry aus.
+
+    Gleichzeitige Aufrufe mit derselben Art und denselben Argumenten teilen
+    sich einen Upstream-Request. ``retry_if`` kann ein Ergebnis als
+    wiederholbar markieren (z. B. HTTP 429 im Feed), ``cost`` ist die Anzahl
+    Tokens je Versuch.
+    """
+    key = (kind, repr(args), repr(sorted(kwargs.items())))
+    _count(kind, anfragen=1)
+    with _lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        _count(kind, zusammengelegt=1)
+        return future.result()
+
+    try:
+        result = _upstream(kind, func, args, kwargs, retry_if, retries, cost)
+    except BaseException as e:
+        _count(kind, fehler=1)
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def _own_copy(result):
+    # Zusammengelegte Aufrufer bekommen eigene DataFrames, die Seiten hängen Spalten an
+    return result.copy() if isinstance(result, pd.DataFrame) else result
+
+
+def _empty(result):
+    # yfinance fängt Rate-Limits und Netzfehler je Ticker ab und liefert dann nur leere Frames
+    return result is None or result.empty
+
+
+def download(tickers, **kwargs):
+    kwargs.setdefault("progress", False)
+    symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+    return _own_copy(call("download", yf.download, tickers, retry_if=_empty, cost=max(len(symbols), 1), **kwargs))
+
+
+def _history(symbol, **kwargs):
+    return yf.Ticker(symbol).history(**kwargs)
+
+
+def history(symbol, **kwargs):
+    return _own_copy(call("history", _history, symbol, **kwargs))
+
+
+def _search(name):
+    quotes = yf.Search(name, max_results=5, news_count=0, lists_count=0, recommended=0).quotes
+    return [quote for quote in quotes if quote.get("symbol")]
+
+
+def ticker_by_name(name):
+    """Treffer der Yahoo-Suche (Dicts mit ``symbol``, ``shortname``, ...), bester zuerst."""
+    return call("suche", _search, name)
+
+
+def _feed_failed(feed):
+    return getattr(feed, "status", None) in RETRY_STATUS
+
+
+def parse_feed(url, etag=None, modified=None):
+    return call("feed", feedparser.parse, url, etag=etag, modified=modified, retry_if=_feed_failed)
+
+
+def stats():
+    """Zähler je Art als DataFrame (eine Zeile je Art)."""
+    with _lock:
+        rows = {kind: dict(counters) for kind, counters in _stats.items()}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=_COUNTERS)
+
+
+def reset_stats():
+    with _lock:
+        _stats.clear()
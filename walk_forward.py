@@ -0,0 +1,222 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backtest import FEE_BPS, SLIPPAGE_BPS, STAKE, drawdown, simulate, summarize, trade_spans
+from bar_store import get_bars_many
+from fx import eur_price_matrix
+from param_grid import DEFAULT_GRID, IndicatorCache, combinations, positions, shared_close, shared_pool
+from screener_cli import load_universe
+
+# -------------------------------------
+# Walk-Forward-Optimierung
+# -------------------------------------
+# Rollende Fenster: auf jedem Trainingsfenster wird die beste Kombination
+# des Parameter-Rasters gewählt, bewertet wird sie auf dem direkt folgenden
+# Testfenster (out-of-sample), daneben die fest eingestellten Regeln der
+# Apps (EMA 9/20, RSI 14 mit 30/70) als Vergleich.
+#
+# Die Indikatoren sind kausal, deshalb wird jede Kombination nur einmal über
+# die ganze Historie gerechnet (Shared Memory + Prozesspool wie param_grid).
+# Die Trades liegen nach Ausstiegs-Bar sortiert vor; ein Fenster ist dann
+# ein Ausschnitt per binärer Suche statt einer Neuberechnung für jedes
+# überlappende Fenster. Gezählt werden nur Trades, die im Fenster eröffnet
+# und geschlossen wurden, damit kein Trainings-Ergebnis in die Testwertung
+# rutscht; der Drawdown bezieht sich auf die Trade-Folge. Die Fenster
+# selbst werden parallel ausgewertet. Es werden nur lokal gespeicherte Bars
+# verwendet (bar_store, offline).
+#
+#   python walk_forward.py --db ticker_database.csv --period 10y --train 504 --test 126
+TRAIN_BARS = 504  # ~2 Jahre Tagesbars
+TEST_BARS = 126  # ~6 Monate
+MIN_TRADES = 10  # Kombinationen mit weniger Trades im Training zählen nicht
+BASELINES = {"ema": {"fast": 9, "slow": 20}, "rsi": {"window": 14, "lower": 30, "upper": 70}}
+
+
+def _combo_trades(family, combos, start, stop, costs):
+    """Je Kombination: Einstiegs-Bar, Ausstiegs-Bar und PnL jedes Trades (Ticker-Block)."""
+    close = shared_close()[:, start:stop]
+    cache = IndicatorCache(close)
+    results = []
+    for params in combos:
+        pnl, _, entry, exit_bar = trade_spans(*simulate(close, positions(family, params, cache), **costs))
+        results.append((entry, exit_bar, pnl))
+    return family, results
+
+
+class ComboTrades:
+    """Trades einer Kombination über die ganze Historie, nach Ausstiegs-Bar sortiert."""
+
+    def __init__(self, entry, exit_bar, pnl):
+        order = np.argsort(exit_bar, kind="stable")
+        self.entry, self.exit_bar, self.pnl = entry[order], exit_bar[order], pnl[order]
+
+    def window(self, start, stop):
+        """Rohzähler für Trades, die ganz in [start, stop) liegen.
+
+        Trades, die vor ``start`` eröffnet wurden, zählen nicht: ihr Ergebnis
+        stammt zum Teil aus dem vorigen (Trainings-)Fenster.
+        """
+        a, b = np.searchsorted(self.exit_bar, [start, stop])
+        pnl = self.pnl[a:b][self.entry[a:b] >= start]
+        wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+        equity = np.cumsum(pnl)
+        return {"trades": len(pnl), "wins": len(wins), "losses": len(losses),
+                "win_sum": float(wins.sum()), "loss_sum": float(losses.sum()), "pnl": float(pnl.sum()),
+                "max_drawdown": float(drawdown(equity[:, None])[0])}
+
+
+def build_trades(close, grid, workers=None, block=None, stake=STAKE, fee_bps=FEE_BPS, slippage_bps=SLIPPAGE_BPS):
+    """Rechnet alle Kombinationen einmal über die ganze Historie (parallel, Shared Memory)."""
+    values = np.ascontiguousarray(close.to_numpy(dtype=np.float64))
+    tickers = values.shape[1]
+    workers = workers or os.cpu_count() or 1
+    block = block or max(1, -(-tickers // (2 * workers)))
+    combos = combinations(grid)
+    costs = {"stake": stake, "fee_bps": fee_bps, "slippage_bps": slippage_bps}
+    parts = {(family, i): [] for family, family_combos in combos.items() for i in range(len(family_combos))}
+
+    with shared_pool(values, workers) as pool:
+        jobs = [pool.submit(_combo_trades, family, family_combos, start, min(start + block, tickers), costs)
+                for family, family_combos in combos.items() if family_combos
+                for start in range(0, tickers, block)]
+        for job in jobs:
+            family, results = job.result()
+            for i, result in enumerate(results):
+                parts[(family, i)].append(result)
+
+    labels, trades = [], []
+    for (family, i), blocks in parts.items():
+        labels.append((family, combos[family][i]))
+        trades.append(ComboTrades(*(np.concatenate(column) for column in zip(*blocks))))
+    return labels, trades
+
+
+def windows(bars, train=TRAIN_BARS, test=TEST_BARS, step=None):
+    """``(train_start, test_start, test_stop)`` je Fenster, Schritt standardmäßig = Testlänge."""
+    step = step or test
+    return [(start, start + train, min(start + train + test, bars))
+            for start in range(0, bars - train - 1, step) if start + train < bars]
+
+
+_windows = {}
+
+
+def _init_windows(labels, trades, metric, min_trades):
+    _windows.update(labels=labels, trades=trades, metric=metric, min_trades=min_trades)
+
+
+def _score_window(window):
+    train_start, test_start, test_stop = window
+    labels, trades = _windows["labels"], _windows["trades"]
+    best, best_score = None, -np.inf
+    for i, combo in enumerate(trades):
+        stats = combo.window(train_start, test_start)
+        if stats["trades"] < _windows["min_trades"]:
+            continue
+        score = summarize(stats)[_windows["metric"]]
+        if score > best_score:
+            best, best_score = i, score
+    result = {"window": window, "best": best, "train_score": best_score, "test": None, "baselines": {}}
+    if best is not None:
+        result["test"] = trades[best].window(test_start, test_stop)
+    for i, (family, params) in enumerate(labels):
+        if BASELINES.get(family) == params:
+            result["baselines"][family] = trades[i].window(test_start, test_stop)
+    return result
+
+
+def walk_forward(close, dates=None, grid=DEFAULT_GRID, train=TRAIN_BARS, test=TEST_BARS, step=None,
+                 metric="erwartungswert", min_trades=MIN_TRADES, workers=None, **costs):
+    """Ergebnis je Fenster (DataFrame) und Out-of-Sample-Summe je Ansatz (DataFrame)."""
+    grid = {family: dict(axes) for family, axes in grid.items()}
+    for family, params in BASELINES.items():  # Vergleichsregeln immer mitrechnen
+        if family in grid:
+            for axis, value in params.items():
+                if value not in grid[family][axis]:
+                    grid[family][axis] = sorted([*grid[family][axis], value])
+    labels, trades = build_trades(close, grid, workers=workers, **costs)
+    plan = windows(len(close), train, test, step)
+    dates = pd.Index(dates) if dates is not None else pd.RangeIndex(len(close))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_windows,
+                             initargs=(labels, trades, metric, min_trades)) as pool:
+        scored = list(pool.map(_score_window, plan))
+
+    rows, totals = [], {}
+    for number, result in enumerate(scored, 1):
+        train_start, test_start, test_stop = result["window"]
+        row = {"Fenster": number, "Train von": dates[train_start], "Test von": dates[test_start],
+               "Test bis": dates[test_stop - 1]}
+        if result["best"] is not None:
+            family, params = labels[result["best"]]
+            row.update({"Familie": family, "Parameter": ", ".join(f"{k}={v}" for k, v in params.items()),
+                        f"Train {metric}": round(result["train_score"], 2)})
+            row.update({f"Test {k}": v for k, v in summarize(result["test"]).items()})
+            approaches = {"walk_forward": result["test"]}
+        else:
+            approaches = {}
+        approaches.update({f"fest_{family}": stats for family, stats in result["baselines"].items()})
+        for name, stats in approaches.items():
+            total = totals.setdefault(name, dict.fromkeys(stats, 0.0))
+            for key in ("trades", "wins", "losses", "win_sum", "loss_sum", "pnl"):
+                total[key] += stats[key]
+            total["max_drawdown"] = max(total["max_drawdown"], stats["max_drawdown"])
+            if name != "walk_forward":
+                row[f"{name} PnL"] = round(stats["pnl"], 2)
+        rows.append(row)
+
+    summary = pd.DataFrame([{"Ansatz": name, **summarize(stats)} for name, stats in totals.items()])
+    if not summary.empty:
+        summary = summary.rename(columns={"max_drawdown": "max_drawdown_fenster"})
+    return pd.DataFrame(rows), summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-Forward-Optimierung der Indikator-Parameter (offline).")
+    parser.add_argument("--db", default="ticker_database.csv", help="Ticker-CSV mit Spalte YahooTicker")
+    parser.add_argument("--period", default="max", help="Zeitraum aus dem lokalen Kursspeicher")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--train", type=int, default=TRAIN_BARS, help="Bars je Trainingsfenster")
+    parser.add_argument("--test", type=int, default=TEST_BARS, help="Bars je Testfenster")
+    parser.add_argument("--step", type=int, help="Verschiebung je Fenster (Standard: --test)")
+    parser.add_argument("--metric", default="erwartungswert", choices=["erwartungswert", "total_pnl", "trefferquote"])
+    parser.add_argument("--min-trades", type=int, default=MIN_TRADES)
+    parser.add_argument("--families", default=",".join(DEFAULT_GRID), help="Komma-Liste der Familien")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--fee-bps", type=float, default=FEE_BPS)
+    parser.add_argument("--slippage-bps", type=float, default=SLIPPAGE_BPS)
+    parser.add_argument("--out", default="walk_forward.csv", help="Ergebnis je Fenster")
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    symbols = load_universe(args.db)["YahooTicker"].tolist()
+    frames, errors = get_bars_many(symbols, period=args.period, interval=args.interval, offline=True)
+    if not frames:
+        print("Keine lokal gespeicherten Bars – erst z. B. screener_cli.py oder backtest.py online laufen lassen",
+              file=sys.stderr)
+        return 1
+    # Gemeinsame Datumsachse: Fenstergrenzen sind für alle Ticker derselbe Tag
+    close, fx_matrix = eur_price_matrix(frames, offline=True, by_date=True)
+
+    grid = {family: DEFAULT_GRID[family] for family in args.families.split(",")}
+    per_window, summary = walk_forward(close * fx_matrix, close.index, grid, train=args.train, test=args.test,
+                                       step=args.step, metric=args.metric, min_trades=args.min_trades,
+                                       workers=args.workers, fee_bps=args.fee_bps, slippage_bps=args.slippage_bps)
+    per_window.to_csv(args.out, index=False)
+
+    print(per_window.to_string(index=False))
+    print()
+    print(summary.to_string(index=False))
+    print(f"{len(per_window)} Fenster, {len(frames)} Ticker, {len(close)} Bars in {time.time() - started:.1f}s "
+          f"-> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())